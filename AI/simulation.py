@@ -13,6 +13,7 @@ from collections import Counter
 from pathlib import Path
 from bisect import bisect_left  # ★ 用來算 percentile
 import csv
+from tracer import Tracer, span, traced
 
 from bvtree import (
     ConservativePolicy, 
@@ -49,11 +50,14 @@ class Simulation:
     # --------------------------------------------------
     # 核心流程
     # --------------------------------------------------
+    @traced("simulation", "Simulation.run")
     def run(self) -> None:
         """執行整體模擬，產生所有 raw data。"""
         self.midterm.clear(); self.final.clear()
         self.knowledge.clear(); self.gpa.clear()
         self.player_records.clear()
+        # 每週的 span 數量很多，沒開追蹤時走不含 span 的版本，額外成本只有這一次判斷
+        play_week = self._play_week_traced if Tracer.get_instance().enabled else self._play_week
 
         for _ in range(self.n_players):
             player_class = random.choice(self.characters)
@@ -61,21 +65,17 @@ class Simulation:
             action_history = []  # 記錄該玩家的所有動作
             
             for _ in range(7):
-                action = self._choose_action(player)
-                action_history.append(action)
-                getattr(player, action)(1)
-                player.week_number += 1
+                play_week(player, action_history)
 
-            player.get_midterm()
+            with span("grading", "simulation"):
+                player.get_midterm()
 
             for _ in range(7):
-                action = self._choose_action(player)
-                action_history.append(action)
-                getattr(player, action)(1)
-                player.week_number += 1
+                play_week(player, action_history)
 
-            player.get_final()
-            player.calculate_GPA()
+            with span("grading", "simulation"):
+                player.get_final()
+                player.calculate_GPA()
 
             self.midterm.append(player.midterm)
             self.final.append(player.final)
@@ -94,6 +94,22 @@ class Simulation:
                 'action_counts': Counter(action_history)
             })
 
+    def _play_week(self, player, action_history: list[str]) -> None:
+        """一週：由策略選行動，再套用到角色身上。"""
+        action = self._choose_action(player)
+        action_history.append(action)
+        getattr(player, action)(1)
+        player.week_number += 1
+
+    def _play_week_traced(self, player, action_history: list[str]) -> None:
+        """同 _play_week，但把選行動與套用行動分別記成 span。"""
+        with span("policy.choose", "simulation"):
+            action = self._choose_action(player)
+        action_history.append(action)
+        with span("action.apply", "simulation"):
+            getattr(player, action)(1)
+        player.week_number += 1
+
     def _choose_action(self, player) -> str:
         """用行為樹或隨機策略決定下一步行動。"""
         week_index = player.week_number
@@ -117,6 +133,7 @@ class Simulation:
     # --------------------------------------------------
     # 圖表繪製
     # --------------------------------------------------
+    @traced("simulation")
     def plot_midterm_final(self, highlight_mid: float | None = None, highlight_final: float | None = None, title_add: str = "") -> Path:
         mid_cnt = Counter(self.midterm)
         fin_cnt = Counter(self.final)
@@ -176,6 +193,7 @@ class Simulation:
         plt.close(fig)
         return out_file
 
+    @traced("simulation")
     def plot_total(self, highlight: float | None = None, title_add: str = "") -> Path:
         fig, ax = plt.subplots(figsize=(12, 6))
         counts, edges, _ = ax.hist(
@@ -235,6 +253,7 @@ class Simulation:
     # --------------------------------------------
     # ❹ GPA 直方圖（可標註個人成績）
     # --------------------------------------------
+    @traced("simulation")
     def plot_gpa(self, highlight: float | None = None, bins: int = 12, title_add: str = "") -> Path:
         """
         畫 GPA 直方圖  
@@ -292,6 +311,7 @@ class Simulation:
         self.plot_total(highlight=player.total_score, title_add=" - All Characters")
         self.plot_gpa(highlight=player.GPA, title_add=" - All Characters")
 
+    @traced("simulation")
     def run_character_simulation_with_player(self, player, char_cls) -> None:
         """
         針對該角色做模擬，並在圖表上 highlight 該玩家的成績。
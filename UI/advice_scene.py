@@ -3,6 +3,12 @@ import asyncio
 from UI.components.base_scene import BaseScene, draw_wrapped_text, wrap_text
 from UI.components.character_animator import CharacterAnimator
 from UI.components.audio_manager import AudioManager
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font, get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.render_target import draw_rect
+from UI.components.text_layout import IncrementalLayout
+from services.advice_tasks import submit_final_advice
 import setting
 
 
@@ -24,10 +30,10 @@ class AdviceScene(BaseScene):
         self.background.set_alpha(80)
         
         # 字體
-        self.title_font = pygame.font.Font(setting.JFONT_PATH_BOLD, 52)
-        self.section_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.title_font = get_font(setting.JFONT_PATH_BOLD, 52)
+        self.section_font = get_font_style("small")
         # 內容字體放大以提高可讀性
-        self.content_font = pygame.font.Font(setting.JFONT_PATH_Light, 28)
+        self.content_font = get_font_style("light")
         
         # 角色動畫
         self.animator = CharacterAnimator(
@@ -35,9 +41,10 @@ class AdviceScene(BaseScene):
         )
         self.animator.frame_delay = 3
         
-        # 建議文本
+        # 建議文本：在背景產生，畫面照常更新
         self.advice_text = None
         self.is_loading = True
+        self.advice_request = None
         # 可滾動文字表面與偏移
         # 行為式滾動：將文字分行，使用行索引控制顯示範圍
         self.lines = []
@@ -48,7 +55,7 @@ class AdviceScene(BaseScene):
         self.content_padding = 20
         
         # 返回按鈕提示
-        self.prompt_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 24)
+        self.prompt_font = get_font_style("hint")
         self.prompt_text = "(按 ESC 或 Enter 返回)"
         self.prompt_surface = self.prompt_font.render(
             self.prompt_text, True, (100, 100, 100)
@@ -57,26 +64,45 @@ class AdviceScene(BaseScene):
         # 顯示位置：左上(340,122)，右下(1154,692)
         # 寬度 = 1154 - 340 = 814， 高度 = 692 - 122 = 570
         self.content_rect = pygame.Rect(340, 122, 814, 570)
+        # 串流時文字一直變長，每次只重排最後一段
+        self.layout = IncrementalLayout(self.content_font, self.content_rect.width - 2 * self.content_padding)
+
+        # 米白底、背景、黑色遮罩與建議面板底色、邊框預先合成
+        panel_rect = self.content_rect.inflate(20, 20)
+        self.backdrop = LayerCompositor(self.screen.get_size(), base_color=(245, 240, 225))
+        self.backdrop.add_layer("background", self.background)
+        self.backdrop.add_fill("overlay", (0, 0, 0, 30))
+        self.backdrop.add_fill("panel_bg", (255, 255, 255, 200), panel_rect)
+        self.backdrop.add_draw("panel_border", lambda surface: draw_rect(surface, (120, 120, 160), panel_rect, 3))
         
-        # 生成建議
-        
-        # 延遲生成建議，避免初始化時阻塞
-        if self.advice_text is None:
-            self._generate_advice()
-    
-    def _generate_advice(self):
-        """背景生成建議"""
-        try:
-            from services.feedback_generator import generate_final_advice
-            self.advice_text = generate_final_advice(self.player)
-            self.audio.play_sound(setting.SoundEffect.BLING_PATH)
-        except Exception as e:
-            self.advice_text = f"(產生建議失敗)\n\n{str(e)}"
+    def _start_advice(self):
+        """開始在背景生成建議（第一幀畫出後才開始，沒有執行緒的網頁版也看得到載入文字）"""
+        self.advice_request = submit_final_advice(self.player)
+
+    def _poll_advice(self):
+        """每幀檢查背景的建議是否完成"""
+        if not self.is_loading or self.advice_request is None:
+            return
+        text = self.advice_request.poll()
+        if text is None:
+            # 串流中：已收到的文字先顯示出來
+            partial = self.advice_request.partial
+            if partial and partial != self.advice_text:
+                self.advice_text = partial
+                self._prepare_text_lines()
+            return
+        self.advice_text = text
+        if self.advice_request.failed:
             self.audio.play_sound(setting.SoundEffect.DONG_PATH)
-        finally:
-            self.is_loading = False
-                # 準備分行資料供行滾動使用
-            self._prepare_text_lines()
+        else:
+            self.audio.play_sound(setting.SoundEffect.BLING_PATH)
+        self.is_loading = False
+        # 準備分行資料供行滾動使用
+        self._prepare_text_lines()
+
+    def _cancel_advice(self):
+        if self.advice_request is not None:
+            self.advice_request.cancel()
 
     def _prepare_text_lines(self):
         # 保存先前行滾動狀態；若先前已貼底，新的內容加入後仍保持貼底
@@ -92,9 +118,8 @@ class AdviceScene(BaseScene):
             self.max_start_line = 0
             return
 
-        inner_width = self.content_rect.width - 2 * self.content_padding
-        # 先用 wrap_text 分成多行
-        lines = wrap_text(self.advice_text, self.content_font, inner_width)
+        # 分成多行；串流時只有最後一段會重新斷行
+        lines = self.layout.set_text(self.advice_text, final=not self.is_loading)
         self.lines = lines
         self.line_height = self.content_font.get_linesize()
 
@@ -120,19 +145,15 @@ class AdviceScene(BaseScene):
     def update(self):
         """更新動畫與狀態"""
         self.animator.update()
+        self._poll_advice()
     
     def draw(self):
         """繪製場景"""
-        self.screen.fill((245, 240, 225))
-        self.screen.blit(self.background, (0, 0))
-        
-        # 半透明黑色遮罩
-        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 30))
-        self.screen.blit(overlay, (0, 0))
+        # 背景、遮罩與面板底色
+        self.backdrop.draw(self.screen)
         
         # 標題
-        title = self.title_font.render("結果分析", True, (50, 50, 70))
+        title = render_text(self.title_font, "結果分析", True, (50, 50, 70))
         # 把標題放在面板上方，與 panel 左邊對齊，並向上偏移 50px
         title_rect = title.get_rect(topleft=(self.content_rect.left, self.content_rect.top - 70))
         self.screen.blit(title, title_rect)
@@ -140,26 +161,6 @@ class AdviceScene(BaseScene):
         # 角色動畫
         self.animator.draw(self.screen)
         
-        # 建議內容面板
-        panel_bg = pygame.Surface(
-            (self.content_rect.width + 20, self.content_rect.height + 20),
-            pygame.SRCALPHA
-        )
-        panel_bg.fill((255, 255, 255, 200))
-        self.screen.blit(
-            panel_bg,
-            (self.content_rect.left - 10, self.content_rect.top - 10)
-        )
-        
-        # 面板邊框
-        border_rect = pygame.Rect(
-            self.content_rect.left - 10,
-            self.content_rect.top - 10,
-            self.content_rect.width + 20,
-            self.content_rect.height + 20
-        )
-        pygame.draw.rect(self.screen, (120, 120, 160), border_rect, 3)
-        
         # 建議文本（使用可滾動的 text_surface）
         padding = self.content_padding
         inner_x = self.content_rect.left + padding
@@ -167,11 +168,14 @@ class AdviceScene(BaseScene):
         inner_width = self.content_rect.width - 2 * padding
         inner_height = self.content_rect.height - 2 * padding
 
-        if self.is_loading:
-            loading_text = self.content_font.render("正在生成建議...", True, (100, 100, 100))
+        if self.is_loading and not self.lines:
+            dots = "." * (pygame.time.get_ticks() // 400 % 4)
+            loading_text = render_text(self.content_font, "正在生成建議" + dots, True, (100, 100, 100))
+            # 點點數會變，以三個點的寬度置中，文字才不會左右晃
+            full_width = render_text(self.content_font, "正在生成建議...", True, (100, 100, 100)).get_width()
             self.screen.blit(
                 loading_text,
-                (self.content_rect.centerx - loading_text.get_width() // 2, self.content_rect.centery - 20)
+                (self.content_rect.centerx - full_width // 2, self.content_rect.centery - 20)
             )
         else:
             # 使用行式滾動顯示：根據 self.start_line 決定顯示哪幾行
@@ -197,23 +201,22 @@ class AdviceScene(BaseScene):
                     idx = start + i
                     if idx >= total_lines:
                         break
-                    txt = lines[idx]
-                    txt_surf = self.content_font.render(txt, True, (30, 30, 30))
-                    self.screen.blit(txt_surf, (inner_x, y_start + i * lh))
+                    # 還在變動的最後一行不進文字快取
+                    self.layout.draw_line(self.screen, idx, (inner_x, y_start + i * lh), (30, 30, 30))
 
                 # 繪製基於行的捲軸（放在內側）
                 scrollbar_height = inner_height
                 bar_w = 8
                 bar_x = self.content_rect.right - padding // 2 - bar_w
                 bar_y = inner_y
-                pygame.draw.rect(self.screen, (220, 220, 220), (bar_x, bar_y, bar_w, scrollbar_height))
+                draw_rect(self.screen, (220, 220, 220), (bar_x, bar_y, bar_w, scrollbar_height))
                 if total_lines > visible_lines:
                     thumb_h = max(20, int((visible_lines / total_lines) * scrollbar_height))
                     thumb_y = bar_y + int((start / (total_lines - visible_lines)) * (scrollbar_height - thumb_h))
                 else:
                     thumb_h = scrollbar_height
                     thumb_y = bar_y
-                pygame.draw.rect(self.screen, (140, 140, 160), (bar_x, thumb_y, bar_w, thumb_h))
+                draw_rect(self.screen, (140, 140, 160), (bar_x, thumb_y, bar_w, thumb_h))
         
         # 返回提示
         prompt_rect = self.prompt_surface.get_rect(
@@ -221,37 +224,44 @@ class AdviceScene(BaseScene):
         )
         self.screen.blit(self.prompt_surface, prompt_rect)
         
-        pygame.display.flip()
+        self.present()
     
     async def run(self):
         """主循環"""
         self.running = True
-        while self.running:
-            await asyncio.sleep(0)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return "QUIT"
-                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    pos = event.pos
-                    self.audio.play_sound(setting.SoundEffect.MENU_HOVER_PATH)
-                    print ("CLICK", pos)
-                elif event.type == pygame.MOUSEWHEEL:
-                    # 滾輪：event.y >0 表示向上。以行為單位滾動
-                    lines_per_tick = 3
-                    if getattr(self, 'lines', None):
-                        total_lines = len(self.lines)
-                        lh = getattr(self, 'line_height', self.content_font.get_linesize())
-                        inner_height_local = self.content_rect.height - 2 * self.content_padding
-                        visible_lines_local = max(1, inner_height_local // lh)
-                        max_start = max(0, total_lines - visible_lines_local)
-                        # 向上滾動會減少 start_line
-                        self.start_line -= event.y * lines_per_tick
-                        self.start_line = max(0, min(self.start_line, max_start))
-                elif event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_ESCAPE, pygame.K_RETURN):
-                        self.audio.play_sound(setting.SoundEffect.DONG_PATH)
-                        return "END"
+        try:
+            while self.running:
+                await asyncio.sleep(0)
+                for event in self.poll_events():
+                    if event.type == pygame.QUIT:
+                        return "QUIT"
+                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                        pos = event.pos
+                        self.audio.play_sound(setting.SoundEffect.MENU_HOVER_PATH)
+                        print ("CLICK", pos)
+                    elif event.type == pygame.MOUSEWHEEL:
+                        # 滾輪：event.y >0 表示向上。以行為單位滾動
+                        lines_per_tick = 3
+                        if getattr(self, 'lines', None):
+                            total_lines = len(self.lines)
+                            lh = getattr(self, 'line_height', self.content_font.get_linesize())
+                            inner_height_local = self.content_rect.height - 2 * self.content_padding
+                            visible_lines_local = max(1, inner_height_local // lh)
+                            max_start = max(0, total_lines - visible_lines_local)
+                            # 向上滾動會減少 start_line
+                            self.start_line -= event.y * lines_per_tick
+                            self.start_line = max(0, min(self.start_line, max_start))
+                    elif event.type == pygame.KEYDOWN:
+                        if event.key in (pygame.K_ESCAPE, pygame.K_RETURN):
+                            self.audio.play_sound(setting.SoundEffect.DONG_PATH)
+                            return "END"
             
-            self.update()
-            self.draw()
-            self.clock.tick(self.FPS)
+                self.update()
+                self.profiler.mark("update")
+                self.draw()
+                if self.advice_request is None:
+                    self._start_advice()
+                self.tick()
+        finally:
+            # 離開場景（含按 ESC、關閉視窗）時不再等待還沒完成的建議
+            self._cancel_advice()
@@ -1,6 +1,10 @@
 import pygame
 from UI.components.base_scene import BaseScene
 from UI.components.audio_manager import AudioManager
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.render_target import draw_rect
 import setting
 import asyncio
 
@@ -18,8 +22,8 @@ class CharacterSelectScene(BaseScene):
         self.selected_character = None
 
         
-        self.font = pygame.font.Font(setting.JFONT_PATH_BOLD, 36)
-        self.font_desc = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.font = get_font_style("button")
+        self.font_desc = get_font_style("small")
 
 
         # ---------------- 音樂 ----------------
@@ -104,17 +108,22 @@ class CharacterSelectScene(BaseScene):
             },
         ]
 
+        # 白底、背景與角色框底色預先合成（背景在 update 與 draw 各疊一次）
+        self.backdrop = LayerCompositor(self.screen.get_size())
+        self.backdrop.add_layer("background", self.background)
+        self.backdrop.add_layer("background_2", self.background)
+        for i, char in enumerate(self.characters):
+            self.backdrop.add_fill(f"box_{i}", (255, 255, 255, 220), char["box"])
+
     # ------------------------------------------------------------------
     # 更新：事件處理、動畫計時、hover 狀態與音效
     # ------------------------------------------------------------------
     def update(self):
-        self.clock.tick(self.FPS)
+        self.tick()
         mouse_pos = pygame.mouse.get_pos()
-        self.screen.fill((255, 255, 255))
-        self.screen.blit(self.background, (0, 0))
 
         # ------- 事件 -------
-        for event in pygame.event.get():
+        for event in self.poll_events():
             if event.type == pygame.QUIT:
                 return "QUIT"
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -145,20 +154,15 @@ class CharacterSelectScene(BaseScene):
     # 繪製所有內容
     # ------------------------------------------------------------------
     def draw(self):
-        self.screen.blit(self.background, (0, 0))
+        self.backdrop.draw(self.screen)
 
         for char in self.characters:
             rect = char["box"]
             is_hovered = char.get("is_hovered", False)
 
-            # 角色框背景（帶透明度）
-            overlay = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-            overlay.fill((255, 255, 255, 220))
-            self.screen.blit(overlay, rect.topleft)
-
             # 邊框
             border_color = char["hover_color"] if is_hovered else char["color"]
-            pygame.draw.rect(self.screen, border_color, rect, 5)
+            draw_rect(self.screen, border_color, rect, 5)
 
             # 角色圖片（右下角對齊）
             frame = char["frames"][self.frame_index]
@@ -167,16 +171,16 @@ class CharacterSelectScene(BaseScene):
             self.screen.blit(frame, (img_x, img_y))
 
             # 名字（左下角）
-            name_surface = self.font.render(char["name"], True, (50, 50, 50))
+            name_surface = render_text(self.font, char["name"], True, (50, 50, 50))
             self.screen.blit(name_surface, (rect.left + 20, rect.bottom - 50))
 
             # 描述（左上角，自動換行）
             desc_lines = [line for line in char["description"].split('\n') if line]
             for i, line in enumerate(desc_lines):
-                line_surface = self.font_desc.render(line, True, (100, 100, 100))
+                line_surface = render_text(self.font_desc, line, True, (100, 100, 100))
                 self.screen.blit(line_surface, (rect.left + 20, rect.top + 20 + i * 40))
 
-        pygame.display.flip()
+        self.present()
 
     # ------------------------------------------------------------------
     # 主循環：update → draw
@@ -185,6 +189,7 @@ class CharacterSelectScene(BaseScene):
         while self.running:
             await asyncio.sleep(0)
             result = self.update()
+            self.profiler.mark("update")
             if result is not None:   # 取得角色名稱或 "QUIT"
                 return result
             self.draw()
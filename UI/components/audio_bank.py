@@ -0,0 +1,191 @@
+"""
+音效庫 - 開場時在背景執行緒把 setting.SoundEffect 的音效全部解碼好
+
+pygame.mixer.Sound(path) 會在建立的當下解碼整個 OGG（長的音效要十幾毫秒），
+以前 AudioManager 第一次播放才建立，主執行緒剛好在該出聲的那一幀卡住。
+preload() 在背景依序解碼，get() 拿到的是已經解碼好的 Sound；還沒輪到的音效
+由呼叫端當場解碼（跟以前一樣），不用等整批做完。
+
+聲道分配（mixer.set_reserved 保留的聲道不會被 Sound.play() 自動挑走）：
+  - setting.AUDIO_LOOP_SOUNDS 每個固定一個聲道（打字、小鼓的循環音效）
+  - setting.AUDIO_UI_SOUNDS 輪流使用 setting.AUDIO_UI_CHANNELS 個聲道
+  - 其他音效（歡呼、轉盤…）用剩下沒保留的聲道
+
+網頁版（pygbag / emscripten）沒有執行緒：preload() 直接在載入畫面同步解碼。
+"""
+
+import os
+import sys
+import threading
+import time
+import pygame
+import setting
+from tracer import span
+
+THREADS_AVAILABLE = sys.platform != "emscripten"
+
+
+def sound_effect_paths():
+    """setting.SoundEffect 裡所有音效檔的路徑；UI 音效排最前面，最早用到的最先解碼好"""
+    paths = [value for name, value in vars(setting.SoundEffect).items()
+             if name.endswith("_PATH") and name != "SOUND_PATH"]
+    first = list(setting.AUDIO_UI_SOUNDS) + list(setting.AUDIO_LOOP_SOUNDS)
+    return sorted(paths, key=lambda path: first.index(path) if path in first else len(first))
+
+
+class AudioBank:
+    _instance = None  # 單例
+
+    def __init__(self):
+        if AudioBank._instance is not None:
+            raise Exception("AudioBank 是單例，請使用 get_instance() 取得")
+        self._sounds = {}
+        self._errors = {}     # 解碼失敗的音效：路徑 -> 錯誤訊息
+        self._decode_ms = {}  # 每個音效的解碼時間
+        self._bytes = {}      # 每個音效解碼後佔用的記憶體
+        self._decoding = {}   # 正在解碼的音效：路徑 -> 解碼完成時 set 的 Event
+        self._lock = threading.Lock()
+        self._thread = None
+        self.volume = 1.0
+        self.preload_ms = None  # 整批解碼完成花的時間（從 preload() 開始算）
+        self.hits = 0
+        self.misses = 0  # 要播的時候還沒解碼好，只好當場解碼
+        self._loop_channels = {}  # 循環音效的路徑 -> 固定的聲道
+        self._ui_channels = []
+        self._next_ui = 0
+        AudioBank._instance = self
+
+    @staticmethod
+    def get_instance():
+        if AudioBank._instance is None:
+            AudioBank()
+        return AudioBank._instance
+
+    def preload(self, paths=None):
+        """保留聲道並開始解碼；重複呼叫不會重新解碼"""
+        if self._thread is not None:
+            return
+        self._setup_channels()
+        paths = list(paths) if paths is not None else sound_effect_paths()
+        if THREADS_AVAILABLE:
+            self._thread = threading.Thread(target=self._preload, args=(paths, time.perf_counter()),
+                                            name="audio-bank", daemon=True)
+            self._thread.start()
+        else:
+            self._thread = threading.current_thread()
+            self._preload(paths, time.perf_counter())
+
+    def wait(self, timeout=None):
+        """等背景解碼完成（測試與基準測試用）；完成回傳 True"""
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        return self.preload_ms is not None
+
+    def _preload(self, paths, started):
+        for path in paths:
+            self._load(path)
+        self.preload_ms = (time.perf_counter() - started) * 1000
+
+    def _setup_channels(self):
+        if not pygame.mixer.get_init():
+            return
+        loops = list(setting.AUDIO_LOOP_SOUNDS)
+        reserved = len(loops) + setting.AUDIO_UI_CHANNELS
+        pygame.mixer.set_num_channels(max(setting.AUDIO_NUM_CHANNELS, reserved + 1))
+        pygame.mixer.set_reserved(reserved)
+        self._loop_channels = {path: pygame.mixer.Channel(i) for i, path in enumerate(loops)}
+        self._ui_channels = [pygame.mixer.Channel(len(loops) + i) for i in range(setting.AUDIO_UI_CHANNELS)]
+
+    def _load(self, path):
+        # 解碼時不拿著鎖：主執行緒要的音效若不是背景正在解碼的那個，不必等背景先做完
+        with self._lock:
+            if path in self._sounds or path in self._errors:
+                return self._sounds.get(path)
+            done = self._decoding.get(path)
+            if done is None:
+                self._decoding[path] = threading.Event()
+        if done is not None:
+            done.wait()  # 別的執行緒正在解碼同一個音效
+            return self._sounds.get(path)
+
+        sound, error = None, None
+        t0 = time.perf_counter()
+        try:
+            with span("decode_sound", "asset", {"file": os.path.basename(path)}):
+                sound = pygame.mixer.Sound(path)
+        except (pygame.error, OSError) as e:
+            error = str(e)
+        with self._lock:
+            if sound is None:
+                self._errors[path] = error
+            else:
+                self._decode_ms[path] = (time.perf_counter() - t0) * 1000
+                self._bytes[path] = self._raw_bytes(sound)
+                sound.set_volume(self.volume)
+                self._sounds[path] = sound
+            self._decoding.pop(path).set()
+        return sound
+
+    @staticmethod
+    def _raw_bytes(sound):
+        # 用長度換算，不必用 get_raw() 把整段資料複製一份出來
+        frequency, size, channels = pygame.mixer.get_init()
+        return round(sound.get_length() * frequency) * channels * abs(size) // 8
+
+    def get(self, path):
+        """回傳解碼好的 Sound；還沒解碼就當場解碼，檔案不存在或無法解碼時回傳 None"""
+        sound = self._sounds.get(path)
+        if sound is not None:
+            self.hits += 1
+            return sound
+        if path in self._errors:
+            return None
+        self.misses += 1
+        return self._load(path)
+
+    def loaded(self, path):
+        """已經解碼好的 Sound，還沒解碼就回傳 None（不會觸發解碼）"""
+        return self._sounds.get(path)
+
+    def play(self, path, loops=0):
+        """在這個音效分到的聲道上播放，回傳 Sound（無法播放時回傳 None）"""
+        sound = self.get(path)
+        if sound is None:
+            return None
+        channel = self._channel_for(path)
+        if channel is None:
+            sound.play(loops=loops)
+        else:
+            channel.play(sound, loops=loops)
+        return sound
+
+    def _channel_for(self, path):
+        channel = self._loop_channels.get(path)
+        if channel is not None or path not in setting.AUDIO_UI_SOUNDS or not self._ui_channels:
+            return channel
+        # 優先用空著的 UI 聲道；全部在播時蓋掉最早開始播的那個（輪流分配，所以就是輪到的那個）
+        count = len(self._ui_channels)
+        index = next((i % count for i in range(self._next_ui, self._next_ui + count)
+                      if not self._ui_channels[i % count].get_busy()), self._next_ui)
+        self._next_ui = (index + 1) % count
+        return self._ui_channels[index]
+
+    def set_volume(self, volume):
+        self.volume = volume
+        with self._lock:
+            for sound in self._sounds.values():
+                sound.set_volume(volume)
+
+    def stats(self):
+        slowest = max(self._decode_ms, key=self._decode_ms.get, default=None)
+        return {
+            "decoded": len(self._sounds),
+            "failed": {os.path.basename(path): error for path, error in self._errors.items()},
+            "preload_ms": round(self.preload_ms, 1) if self.preload_ms is not None else None,
+            "decode_ms": round(sum(self._decode_ms.values()), 1),
+            "slowest": {os.path.basename(slowest): round(self._decode_ms[slowest], 1)} if slowest else None,
+            "memory_mb": round(sum(self._bytes.values()) / (1024 * 1024), 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reserved_channels": len(self._loop_channels) + len(self._ui_channels),
+        }
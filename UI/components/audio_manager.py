@@ -1,5 +1,8 @@
+import os
 import pygame
 from UI.components.character_animator import CharacterAnimator
+from UI.components.audio_bank import AudioBank
+from tracer import span
 
 
 class AudioManager:
@@ -14,8 +17,11 @@ class AudioManager:
         pygame.mixer.init()
         self.current_bgm = None
         self.volume = 0.5
-        self.sounds = {}
         self.sound_volume = 0.5
+        # 音效由 AudioBank 在背景預先解碼，第一次播放不用等解碼
+        self.bank = AudioBank.get_instance()
+        self.bank.set_volume(self.sound_volume)
+        self.bank.preload()
         AudioManager._instance = self
 
     @staticmethod
@@ -27,7 +33,8 @@ class AudioManager:
     # 播放背景音樂
     def play_bgm(self, filepath, loop=-1):
         if self.current_bgm != filepath:
-            pygame.mixer.music.load(filepath)
+            with span("load_bgm", "asset", {"file": os.path.basename(filepath)}):
+                pygame.mixer.music.load(filepath)
             pygame.mixer.music.set_volume(self.volume)
             pygame.mixer.music.play(loop)
             self.current_bgm = filepath
@@ -59,38 +66,23 @@ class AudioManager:
 
     # 播放音效
     def play_sound(self, filepath):
-        if filepath not in self.sounds:
-            sound = pygame.mixer.Sound(filepath)
-            sound.set_volume(self.sound_volume)
-            self.sounds[filepath] = sound
-        else:
-            sound = self.sounds[filepath]
-        sound.play()
-        return sound
+        return self.bank.play(filepath)
     
     def play_sound_loop(self, filepath):
-        if filepath not in self.sounds:
-            sound = pygame.mixer.Sound(filepath)
-            sound.set_volume(self.sound_volume)
-            self.sounds[filepath] = sound
-        else:
-            sound = self.sounds[filepath]
-        sound.play(loops=-1)
-        return sound
+        return self.bank.play(filepath, loops=-1)
 
     def stop_sound(self, filepath):
-        sound = self.sounds.get(filepath)
+        sound = self.bank.loaded(filepath)
         if sound:
             sound.stop()
 
     def is_sound_playing(self, filepath):
-        sound = self.sounds.get(filepath)
+        sound = self.bank.loaded(filepath)
         if sound:
             return sound.get_num_channels() > 0
         return False
 
     def set_sound_volume(self, volume):
         self.sound_volume = volume
-        for sound in self.sounds.values():
-            sound.set_volume(volume)
+        self.bank.set_volume(volume)
 
@@ -2,9 +2,21 @@ import pygame
 import os
 import setting
 from UI.components.audio_manager import AudioManager
+from UI.components.text_layout import TextLayout
+from UI.components.frame_profiler import FrameProfiler
+from UI.components.surface_memory import SurfaceMemory
+from UI.components.frame_scheduler import FrameScheduler
+from UI.components.render_target import RenderTarget
+from tracer import Tracer, span
 import asyncio
 
 class BaseScene:
+    # 動畫常數（每幀移動幾像素、透明度加多少）都是照 30 FPS 調的；dt_frames 換算成實際經過了幾個這樣的幀
+    ANIMATION_FPS = 30
+    # 髒矩形模式（預設關閉）：只重畫有變動的區域，並用 display.update(rects) 送出
+    dirty_rects_enabled = False
+    DIRTY_AREA_THRESHOLD = 0.4  # 髒區域超過畫面的這個比例就直接整張 flip
+
     def __init__(self, screen):
         self.screen = screen
         self.running = True
@@ -12,9 +24,37 @@ class BaseScene:
         self.SCREEN_WIDTH = 1200
         self.clock = pygame.time.Clock()
         self.FPS = 30
+        self._reset_dt()
         self.audio = AudioManager.get_instance()
+        self._dirty_rects = []
+        self._full_redraw = True  # 第一幀一定整張畫
+        self._hud_rect = None
+        self.profiler = FrameProfiler.get_instance()
+        self.profiler.restart()
+        self.scheduler = FrameScheduler.get_instance()
+        self.scheduler.wake()
+        self.render_target = RenderTarget.get_instance()
+        self._surfaces_tracked = False  # 第一次 present 時登記場景載入的圖片
+        Tracer.get_instance().instant(f"init {type(self).__name__}", "scene")
         
 
+    def reset(self, player=None):
+        """場景被 SceneManager 重複使用時呼叫：換上新的玩家資料、重設每次進場的狀態，
+        已載入的圖片、遮罩與字型都保留。參數與建構子（screen 之後）相同"""
+        if player is not None:
+            self.player = player
+
+    def enter(self):
+        """每次進入場景、開始 run 之前呼叫"""
+        self.running = True
+        self._dirty_rects = []
+        self.mark_all_dirty()
+        self._reset_dt()
+        self.profiler.restart()
+        self.scheduler.wake()
+        self._surfaces_tracked = False
+        Tracer.get_instance().instant(f"enter {type(self).__name__}", "scene")
+
     def handle_event(self, event):
         if event.type == pygame.QUIT:
             self.running = False
@@ -22,6 +62,15 @@ class BaseScene:
     def update(self):
         pass  # 由子類別實作
 
+    def is_animating(self):
+        """畫面上是否有持續變動的東西（淡入、打字、轉盤…）；為 False 且沒有輸入時 tick() 改成等事件。
+        預設 True（維持固定幀率），畫面會靜止下來的場景再覆寫"""
+        return True
+
+    def next_wakeup_ms(self):
+        """靜止時最晚幾毫秒後要醒來重畫（例如角色動畫的下一張）；None 表示等輸入就好"""
+        return None
+
     def draw(self):
         pass  # 由子類別實作
 
@@ -30,59 +79,127 @@ class BaseScene:
             await asyncio.sleep(0)  # Yield control for web compatibility
             result = None
             result = self.update()
+            self.profiler.mark("update")
             if result is not None:
                 print(f"Scene result: {result}")
                 return result
                 
                 
             self.draw()
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.present()
+            self.tick()
         return None 
 
+    def poll_events(self):
+        """取代 pygame.event.get()：記錄取事件的時間，並處理效能 HUD 的開關（F3）"""
+        events = self.scheduler.take_events(pygame.event.get())
+        for event in events:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_hud()
+                self.mark_all_dirty()
+        self.profiler.mark("events")
+        return events
+
+    def tick(self, fps=None):
+        """取代 self.clock.tick(self.FPS)：等待到下一幀，並結算這一幀的時間；fps=0 表示不限速。
+        畫面靜止時由 FrameScheduler 改成等事件（見 is_animating）。
+        之後 self.dt 是這一幀經過的毫秒數（上限 MAX_FRAME_DT_MS），動畫依它推進，掉幀時會一次跳過落後的量"""
+        # 還有沒送出的髒區域（或 HUD 開著）就不閒置
+        pending = self._full_redraw or bool(self._dirty_rects) or self.profiler.hud_visible
+        self.scheduler.wait(self, self.clock, self.FPS if fps is None else fps, pending)
+        self._update_dt()
+        self.profiler.mark("wait")
+        self.profiler.end_frame(type(self).__name__)
+        if self.profiler.hud_visible:
+            # HUD 是半透明的，下一幀要先重畫底下的畫面，否則會越疊越深
+            self.mark_dirty(self._hud_rect)
+
+    def _reset_dt(self):
+        # 進場後的第一幀當作剛好一幀，場景的載入時間不算進動畫裡
+        self.dt = 1000 / self.ANIMATION_FPS
+        self.dt_frames = 1.0
+        self._dt_pending_reset = True
+
+    def _update_dt(self):
+        if self._dt_pending_reset:
+            self._dt_pending_reset = False
+            return
+        self.dt = min(self.clock.get_time(), setting.MAX_FRAME_DT_MS)
+        self.dt_frames = self.dt * self.ANIMATION_FPS / 1000
+
+    def mark_dirty(self, rect):
+        """登記這一幀有變動的區域（None 代表沒有變動）"""
+        if rect is not None:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def mark_all_dirty(self):
+        """下一幀整張重畫"""
+        self._full_redraw = True
+
+    def _use_full_redraw(self):
+        if not self.dirty_rects_enabled or self._full_redraw:
+            return True
+        screen_rect = self.screen.get_rect()
+        area = sum(r.clip(screen_rect).width * r.clip(screen_rect).height for r in self._dirty_rects)
+        return area > screen_rect.width * screen_rect.height * self.DIRTY_AREA_THRESHOLD
+
+    def draw_dirty(self, draw_func):
+        """髒矩形模式下，把畫面裁切到每個髒區域後重畫；其他情況直接整張畫"""
+        if self._use_full_redraw():
+            self._full_redraw = True
+            draw_func()
+            return
+        for rect in self._dirty_rects:
+            self.screen.set_clip(rect)
+            draw_func()
+        self.screen.set_clip(None)
+
+    def present(self):
+        """取代 pygame.display.flip()；髒矩形模式下只更新有變動的區域（內部解析度縮小時由 RenderTarget 放大後送出）"""
+        self.profiler.mark("draw")
+        if not self._surfaces_tracked:
+            # 子類別的 __init__ / reset 跑完後才登記，才掃得到它們載入的背景與圖片。
+            # 內部解析度縮小時順便做好縮小版：場景屬性裡的 surface 之後不可以再修改內容（要換就指定新的 surface）
+            SurfaceMemory.get_instance().track_attributes(self, "scene")
+            self.render_target.prescale_attributes(self)
+            self._surfaces_tracked = True
+        if self.profiler.hud_visible:
+            self._hud_rect = self.profiler.draw_hud(self.screen, type(self).__name__)
+            self.mark_dirty(self._hud_rect)
+        if self._use_full_redraw():
+            self.render_target.flip()
+        elif self._dirty_rects:
+            self.render_target.update(self._dirty_rects)
+        self._dirty_rects = []
+        self._full_redraw = False
+        self.profiler.mark("flip")
+
 
     def load_frames(self, folder_path):
         frames = []
-        for filename in sorted(os.listdir(folder_path)):
-            if filename.endswith(".png"):
-                img = pygame.image.load(os.path.join(folder_path, filename)).convert_alpha()
-                img = pygame.transform.scale(img, self.char_size)
-                frames.append(img)
-        return frames
+        with span("load_frames", "asset", {"folder": os.path.basename(folder_path)}):
+            for filename in sorted(os.listdir(folder_path)):
+                if filename.endswith(".png"):
+                    img = pygame.image.load(os.path.join(folder_path, filename)).convert_alpha()
+                    img = pygame.transform.scale(img, self.char_size)
+                    frames.append(img)
+        SurfaceMemory.get_instance().track_all(frames, "animation", type(self).__name__)
+        return self.render_target.prescale_all(frames)
     
 
     
 def wrap_text(text, font, max_width):
-    
-    lines = []
-    paragraphs = text.split('\n')  # 支援多段落
-
-    for para in paragraphs:
-        current_line = ""
-        for char in para:
-            test_line = current_line + char
-            if font.size(test_line)[0] <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = char
-        if current_line:
-            lines.append(current_line)
-
-    return lines
+    # 斷行結果由 TextLayout 快取，同一段文字不會重複計算
+    return list(TextLayout.get_instance().wrap(text, font, max_width))
 
 def draw_wrapped_text(surface, text, font, rect, text_color=(0,0,0), line_height=None):
-    lines = wrap_text(text, font, rect.width-20)
+    layout = TextLayout.get_instance()
     if line_height is None:
         line_height = font.get_height()
+    lines = layout.wrap(text, font, rect.width-20)
     total_height = line_height * len(lines)
     start_y = rect.top + (rect.height - total_height) // 2
 
-    for i, line in enumerate(lines):
-        txt_surf = font.render(line, True, text_color)
-        txt_rect = txt_surf.get_rect()
-        txt_rect.left = rect.left + 20
-        txt_rect.top = start_y + i * line_height
-        surface.blit(txt_surf, txt_rect)
-
+    # 整段文字預先畫好一張 surface，每幀只需一次 blit
+    block = layout.render_block(text, font, rect.width-20, text_color, line_height)
+    surface.blit(block, (rect.left + 20, start_y))
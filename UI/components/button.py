@@ -1,5 +1,7 @@
 import pygame
 from UI.components.base_scene import  wrap_text, draw_wrapped_text
+from UI.components.audio_manager import AudioManager
+from UI.components.render_target import draw_rect
 import setting
 
 class Button:
@@ -21,11 +23,13 @@ class Button:
         self.font_size = font_size
         self.width = width
         self.height = height
+        self._drawn_hover = None  # 上次回報髒區域時的 hover 狀態
         
+        # 和其他按鈕共用 AudioBank 預先解碼好的音效，不再每個按鈕各解碼一次
         try:
-            self.hover_sound = pygame.mixer.Sound(setting.SoundEffect.MENU_HOVER_PATH)
-        except Exception:
-            self.hover_sound = None
+            self.audio = AudioManager.get_instance()
+        except pygame.error:
+            self.audio = None
 
     def draw(self, surface):
          
@@ -38,9 +42,9 @@ class Button:
         scaled_rect.center = self.rect.center
         color = self.hover_color if self.is_hovered else self.bg_color
         
-        pygame.draw.rect(surface, color, self.rect, border_radius=self.border_radius)
+        draw_rect(surface, color, self.rect, border_radius=self.border_radius)
         if self.border_color != None :
-            pygame.draw.rect(surface, self.border_color, self.rect, 3, border_radius=self.border_radius)
+            draw_rect(surface, self.border_color, self.rect, 3, border_radius=self.border_radius)
         
         draw_wrapped_text(surface, self.text, self.font, self.rect)
         
@@ -50,13 +54,20 @@ class Button:
         was_hovered = self.is_hovered
         self.is_hovered = self.rect.collidepoint(mouse_pos)
 
-        if self.is_hovered and not was_hovered and self.hover_sound:
-            self.hover_sound.play()
+        if self.is_hovered and not was_hovered and self.audio:
+            self.audio.play_sound(setting.SoundEffect.MENU_HOVER_PATH)
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.is_hovered:
             return True
         return False
 
+    def get_dirty_rect(self):
+        """hover 狀態改變時回傳按鈕範圍；沒有變動時回傳 None"""
+        if self._drawn_hover == self.is_hovered:
+            return None
+        self._drawn_hover = self.is_hovered
+        return self.rect.copy()
+
     def set_text(self, new_text):
         self.text = new_text
 
@@ -1,34 +1,77 @@
+from collections import OrderedDict
+import math
 import pygame
 import os
+from UI.components.surface_memory import SurfaceMemory
+from UI.components.render_target import RenderTarget
+from tracer import span
 
 class CharacterAnimator:
-    
+    # frame_delay 以 30 FPS 的幀數計；實際換圖依經過的時間，閒置降速或掉幀時動畫速度不變
+    BASE_FRAME_MS = 1000 / 30
+    # 各實例共用的影格快取：(資料夾, 尺寸) -> 縮放好的影格，同一段動畫只從磁碟讀一次
+    MAX_CACHED_ANIMATIONS = 12  # 一段 300x300 的動畫約 5MB，只保留最近用到的幾段
+    _frame_cache = OrderedDict()
+    frame_loads = 0  # 實際從磁碟載入的次數（量測用）
+
     def __init__(self, folder_path, position, size):
         self.folder_path = folder_path
         self.position = position  # (x, y)
         self.size = size          # (width, height)
-        self.frames = []
-
-        for filename in sorted(os.listdir(folder_path), key=lambda x: int(x.split('_')[1].split('.')[0])):
-            if filename.endswith(".png"):
-                #print('Loading frame:', filename)  # Debugging line to see which frames are loaded
-                img = pygame.image.load(os.path.join(folder_path, filename)).convert_alpha()
-                img = pygame.transform.scale(img, self.size)
-                self.frames.append(img)
+        self.frames = self.load_frames(folder_path, size)
 
         self.current_frame = 0
         self.frame_count = len(self.frames)
-        self.frame_delay = 5  # 每幾幀換一張圖
-        self.frame_timer = 0
+        self.frame_delay = 5  # 每幾幀（30 FPS）換一張圖
+        self._frame_started = None  # 目前這張圖開始顯示的時間（第一次 update 才開始計時）
+        self.changed = True      # 畫面是否有變動（髒矩形用）
+        self._last_rect = None   # 上一次回報的位置
+
+    @classmethod
+    def load_frames(cls, folder_path, size):
+        """讀取資料夾中的影格並縮放；回傳的 list 是共用的，請勿修改"""
+        key = (folder_path, tuple(size))
+        frames = cls._frame_cache.get(key)
+        if frames is not None:
+            cls._frame_cache.move_to_end(key)
+            return frames
+
+        frames = []
+        with span("load_frames", "asset", {"folder": os.path.basename(folder_path)}):
+            for filename in sorted(os.listdir(folder_path), key=lambda x: int(x.split('_')[1].split('.')[0])):
+                if filename.endswith(".png"):
+                    #print('Loading frame:', filename)  # Debugging line to see which frames are loaded
+                    img = pygame.image.load(os.path.join(folder_path, filename)).convert_alpha()
+                    img = pygame.transform.scale(img, size)
+                    frames.append(img)
+        CharacterAnimator.frame_loads += 1
+        SurfaceMemory.get_instance().track_all(frames, "animation", os.path.basename(folder_path))
+        RenderTarget.get_instance().prescale_all(frames)
+        cls._frame_cache[key] = frames
+        if len(cls._frame_cache) > cls.MAX_CACHED_ANIMATIONS:
+            cls._frame_cache.popitem(last=False)
+        return frames
+
+    def _frame_ms(self):
+        return self.frame_delay * self.BASE_FRAME_MS
 
     def update(self):
-        mouse_pos = pygame.mouse.get_pos()
-        #print("滑鼠位置：", mouse_pos)
+        now = pygame.time.get_ticks()
+        if self._frame_started is None:
+            self._frame_started = now
+            return
+        # 落後好幾張時直接跳到該顯示的那張
+        steps = int((now - self._frame_started) // self._frame_ms())
+        if steps and self.frame_count:
+            self.current_frame = (self.current_frame + steps) % self.frame_count
+            self._frame_started += steps * self._frame_ms()
+            self.changed = True
 
-        self.frame_timer += 1
-        if self.frame_timer >= self.frame_delay:
-            self.frame_timer = 0
-            self.current_frame = (self.current_frame + 1) % self.frame_count
+    def ms_until_next_frame(self):
+        """還要幾毫秒才換下一張圖（閒置降速時決定何時醒來）"""
+        if self._frame_started is None:
+            return 0
+        return max(0, math.ceil(self._frame_started + self._frame_ms() - pygame.time.get_ticks()))
 
     def draw(self, screen):
         if self.frames:
@@ -37,22 +80,29 @@ class CharacterAnimator:
     def get_rect(self):
         return pygame.Rect(self.position, self.size)
 
+    def get_dirty_rect(self):
+        """回傳自上次查詢後需要重畫的區域（含移動前的位置）；沒有變動時回傳 None"""
+        rect = self.get_rect()
+        if not self.changed and rect == self._last_rect:
+            return None
+        dirty = rect if self._last_rect is None else rect.union(self._last_rect)
+        self._last_rect = rect
+        self.changed = False
+        return dirty
+
 
     def reset(self):
         self.current_frame = 0
-        self.frame_timer = 0
+        self._frame_started = None
         self.frame_count = len(self.frames)
+        self.changed = True
 
     def switch_animation(self, new_folder_path):
         self.folder_path = new_folder_path
-        self.frames = []
-        for filename in sorted(os.listdir(new_folder_path), key=lambda x: int(x.split('_')[1].split('.')[0])):
-            if filename.endswith(".png"):
-                img = pygame.image.load(os.path.join(new_folder_path, filename)).convert_alpha()
-                img = pygame.transform.scale(img, self.size)
-                self.frames.append(img)
+        self.frames = self.load_frames(new_folder_path, self.size)
 
         self.current_frame = 0
         self.frame_count = len(self.frames)
-        self.frame_timer = 0
+        self._frame_started = None
+        self.changed = True
         self.position = (self.position[0], self.position[1])
\ No newline at end of file
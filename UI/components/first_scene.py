@@ -1,5 +1,7 @@
 import pygame
 import setting
+from UI.components.font_registry import get_font
+from UI.components.render_target import RenderTarget
 import asyncio
 
 class FirstScene:
@@ -34,7 +36,7 @@ class FirstScene:
                 # 純色背景 + 提示文字
                 self.screen.fill((25, 25, 28))
                 try:
-                    font = pygame.font.SysFont(None, 42)
+                    font = get_font(None, 42)
                     txt = font.render("Lazy Me Today Too", True, (240, 240, 240))
                     sub = font.render("點一下畫面開始", True, (200, 200, 200))
                     rect = txt.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 - 20))
@@ -46,6 +48,6 @@ class FirstScene:
             
             
             
-            pygame.display.flip()
+            RenderTarget.get_instance().flip()
             
             clock.tick(60)
\ No newline at end of file
@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+from UI.components.transform_cache import cached_rotozoom
 
 class FloatingEmoji:
     def __init__(self, image, start_pos, duration=  5000):
@@ -25,12 +26,13 @@ class FloatingEmoji:
         # 初始縮放
         self.scale = 1.0
 
-    def update(self):
+    def update(self, dt_frames=1.0):
+        """dt_frames：經過了幾個 30 FPS 的幀（BaseScene.dt_frames），速度與旋轉照實際經過的時間推進"""
         elapsed = pygame.time.get_ticks() - self.start_time
         t = elapsed / self.duration  # 0 ~ 1
 
-        self.pos += self.velocity
-        self.angle += self.angular_speed
+        self.pos += self.velocity * dt_frames
+        self.angle += self.angular_speed * dt_frames
         self.scale = max(0.6, 1.0 - t * 0.4)  # 逐漸縮小
 
     def draw(self, screen):
@@ -38,15 +40,14 @@ class FloatingEmoji:
         t = elapsed / self.duration
         alpha = max(0, 255 * (1 - t))  # 逐漸透明
 
-        # 旋轉 & 縮放圖片
-        size = self.original_image.get_size()
-        new_size = (int(size[0] * self.scale), int(size[1] * self.scale))
-        image = pygame.transform.rotozoom(self.original_image, self.angle, self.scale)
-        image.set_alpha(int(alpha))
+        # 旋轉 & 縮放圖片（角度與倍率量化後共用快取）
+        image = cached_rotozoom(self.original_image, self.angle, self.scale)
 
-        # 中心對齊
+        # 中心對齊；快取的圖是共用的，設定透明度畫完後就還原
         rect = image.get_rect(center=self.pos)
+        image.set_alpha(int(alpha))
         screen.blit(image, rect)
+        image.set_alpha(None)
 
     def is_expired(self):
         return pygame.time.get_ticks() - self.start_time > self.duration
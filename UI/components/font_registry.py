@@ -0,0 +1,79 @@
+import pygame
+import setting
+
+
+class FontRegistry:
+    """每個 (字型路徑, 字級) 在整個程式中只載入一次的字型註冊表"""
+    _instance = None  # 單例
+
+    # 具名樣式：各場景重複使用的字型與字級組合
+    STYLES = {
+        "title": (setting.JFONT_PATH_BOLD, 54),
+        "heading": (setting.JFONT_PATH_BOLD, 48),
+        "button": (setting.JFONT_PATH_BOLD, 36),
+        "subtitle": (setting.JFONT_PATH_REGULAR, 48),
+        "body": (setting.JFONT_PATH_REGULAR, 36),
+        "small": (setting.JFONT_PATH_REGULAR, 28),
+        "hint": (setting.JFONT_PATH_REGULAR, 24),
+        "light": (setting.JFONT_PATH_Light, 28),
+        "light_small": (setting.JFONT_PATH_Light, 22),
+        "event_title": (setting.HFONT_PATH, 36),
+    }
+
+    def __init__(self):
+        if FontRegistry._instance is not None:
+            raise Exception("FontRegistry 是單例，請使用 get_instance() 取得")
+        self._fonts = {}
+        self._keys = {}  # 反查表：font -> (path, size)
+        self.requests = 0
+        self.loads = 0
+        FontRegistry._instance = self
+
+    @staticmethod
+    def get_instance():
+        if FontRegistry._instance is None:
+            FontRegistry()
+        return FontRegistry._instance
+
+    def get(self, path, size):
+        # path 為 None 時使用 pygame 內建字型
+        self.requests += 1
+        key = (path, int(size))
+        font = self._fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(path, int(size))
+            self._fonts[key] = font
+            self._keys[font] = key
+            self.loads += 1
+        return font
+
+    def key_of(self, font):
+        # 回傳字型對應的 (path, size)；不是由註冊表載入的字型回傳 None
+        return self._keys.get(font)
+
+    def style(self, name):
+        """依具名樣式取得字型，例如 style("title")"""
+        path, size = self.STYLES[name]
+        return self.get(path, size)
+
+    def live_count(self):
+        return len(self._fonts)
+
+    def stats(self):
+        return {
+            "live_fonts": self.live_count(),
+            "requests": self.requests,
+            "loads": self.loads,
+        }
+
+
+def get_font(path, size):
+    """取代 pygame.font.Font(path, size)，同一組參數回傳同一個字型物件"""
+    return FontRegistry.get_instance().get(path, size)
+
+
+def get_font_style(name):
+    """取代重複的 get_font(setting.JFONT_PATH_…, 字級)，見 FontRegistry.STYLES"""
+    return FontRegistry.get_instance().style(name)
@@ -0,0 +1,173 @@
+import csv
+import json
+import math
+import os
+import time
+from collections import deque
+import pygame
+import setting
+from UI.components.font_registry import get_font
+from UI.components.surface_memory import SurfaceMemory
+from tracer import Tracer
+
+
+def percentile(values, p):
+    """最近秩法的百分位數（values 不需排序）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class _SceneStats:
+    def __init__(self, window):
+        self.frames = 0
+        self.dropped = 0
+        self.work_ms = deque(maxlen=window)   # 每幀實際工作時間（不含 tick 等待）
+        self.phase_ms = deque(maxlen=window)  # 每幀各階段的時間 {phase: ms}
+
+    def summary(self):
+        work = list(self.work_ms)
+        phases = {}
+        for phase in FrameProfiler.PHASES:
+            values = [frame.get(phase, 0.0) for frame in self.phase_ms]
+            phases[phase] = {
+                "p50": round(percentile(values, 50), 3),
+                "p95": round(percentile(values, 95), 3),
+                "p99": round(percentile(values, 99), 3),
+            }
+        return {
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "work_p50": round(percentile(work, 50), 3),
+            "work_p95": round(percentile(work, 95), 3),
+            "work_p99": round(percentile(work, 99), 3),
+            "phases": phases,
+        }
+
+
+class FrameProfiler:
+    """各場景的幀時間統計
+
+    場景在每個階段結束時呼叫 mark(phase)，上一個 mark 到這次之間的時間就記在該階段；
+    tick 之後呼叫 end_frame(scene) 結算一幀。工作時間（不含 wait）超過一幀的預算就算掉幀。
+    F3 開關畫面左上角的 HUD；環境變數 FRAME_PROFILE=1 時，結束遊戲會把統計寫到
+    setting.FRAME_PROFILE_DIR（每個場景一份 CSV，加上一份 JSON 摘要）。
+    """
+    _instance = None  # 單例
+
+    PHASES = ("events", "update", "draw", "flip", "wait")
+    FRAME_BUDGET_MS = 1000 / 30
+    WINDOW = 300          # 滾動統計保留的幀數
+    HUD_REFRESH = 10      # HUD 每幾幀更新一次文字
+    HUD_MIN_WIDTH = 420   # 固定寬度，數字變動時 HUD 範圍不會忽大忽小
+
+    def __init__(self):
+        if FrameProfiler._instance is not None:
+            raise Exception("FrameProfiler 是單例，請使用 get_instance() 取得")
+        self.dump_on_exit = bool(os.environ.get("FRAME_PROFILE"))
+        self.hud_visible = False
+        self._scenes = {}
+        self._phase_ms = {}
+        self._last_mark = None
+        self._frame_start = None
+        self.tracer = Tracer.get_instance()
+        self._hud_surface = None
+        self._hud_scene = None
+        self._hud_age = 0
+        FrameProfiler._instance = self
+
+    @staticmethod
+    def get_instance():
+        if FrameProfiler._instance is None:
+            FrameProfiler()
+        return FrameProfiler._instance
+
+    def restart(self):
+        """切換場景時呼叫：之後的第一個 mark 只當作起點，避免把載入時間算進新場景的第一幀"""
+        self._phase_ms = {}
+        self._last_mark = None
+        self._frame_start = None
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        if self._last_mark is not None:
+            self._phase_ms[phase] = self._phase_ms.get(phase, 0.0) + (now - self._last_mark) * 1000
+            if self.tracer.enabled:
+                self.tracer.complete(phase, "frame", self._last_mark, now)
+        elif self._frame_start is None:
+            self._frame_start = now
+        self._last_mark = now
+
+    def end_frame(self, scene_name):
+        phases, self._phase_ms = self._phase_ms, {}
+        stats = self._scenes.get(scene_name)
+        if stats is None:
+            stats = self._scenes[scene_name] = _SceneStats(self.WINDOW)
+        work = sum(ms for phase, ms in phases.items() if phase != "wait")
+        stats.frames += 1
+        if work > self.FRAME_BUDGET_MS:
+            stats.dropped += 1
+        stats.work_ms.append(work)
+        stats.phase_ms.append(phases)
+        if self.tracer.enabled and self._frame_start is not None:
+            # 整幀的 span 以場景命名，各階段的 span 會疊在它底下
+            self.tracer.complete(scene_name, "frame", self._frame_start, self._last_mark, {"work_ms": round(work, 3)})
+        self._frame_start = self._last_mark
+
+    def summary(self):
+        return {name: stats.summary() for name, stats in self._scenes.items()}
+
+    # ---------- HUD ----------
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+        self._hud_surface = None
+
+    def draw_hud(self, screen, scene_name):
+        """把 HUD 畫在左上角，回傳畫到的區域（髒矩形用）"""
+        self._hud_age += 1
+        if self._hud_surface is None or self._hud_scene != scene_name or self._hud_age >= self.HUD_REFRESH:
+            self._hud_surface = self._render_hud(scene_name)
+            self._hud_scene = scene_name
+            self._hud_age = 0
+        return screen.blit(self._hud_surface, (5, 5))
+
+    def _render_hud(self, scene_name):
+        # 數字每次都不同，直接 font.render，不經過 TextCache
+        font = get_font(None, 20)
+        stats = self._scenes.get(scene_name)
+        lines = [scene_name]
+        if stats is not None:
+            s = stats.summary()
+            lines.append(f"work p50 {s['work_p50']:.1f} p95 {s['work_p95']:.1f} p99 {s['work_p99']:.1f} ms")
+            lines.append(f"dropped {s['dropped']}/{s['frames']} (budget {self.FRAME_BUDGET_MS:.1f} ms)")
+            lines.append("  ".join(f"{phase} {s['phases'][phase]['p95']:.1f}" for phase in self.PHASES))
+        memory = SurfaceMemory.get_instance().stats()
+        lines.append(f"surfaces {memory['total_mb']:.1f}/{memory['budget_mb']:.0f} MB ({memory['live_surfaces']})")
+        texts = [font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max([self.HUD_MIN_WIDTH] + [t.get_width() + 12 for t in texts])
+        height = sum(t.get_height() for t in texts) + 8
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 170))
+        y = 4
+        for t in texts:
+            surface.blit(t, (6, y))
+            y += t.get_height()
+        return surface
+
+    # ---------- 輸出 ----------
+    def dump(self, out_dir=None):
+        """每個場景一份 CSV（最近 WINDOW 幀的各階段時間）與一份 summary.json"""
+        out_dir = out_dir or setting.FRAME_PROFILE_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        for name, stats in self._scenes.items():
+            with open(os.path.join(out_dir, f"{name}.csv"), "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame", "work_ms") + self.PHASES)
+                first = stats.frames - len(stats.work_ms)
+                for i, (work, phases) in enumerate(zip(stats.work_ms, stats.phase_ms)):
+                    writer.writerow([first + i, round(work, 3)] + [round(phases.get(p, 0.0), 3) for p in self.PHASES])
+        with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": round(self.FRAME_BUDGET_MS, 3), "scenes": self.summary()}, f, ensure_ascii=False, indent=2)
+        return out_dir
@@ -0,0 +1,99 @@
+"""
+幀率排程 - 畫面沒有在動的時候改成等事件，不再固定每秒重畫 FPS 次
+
+靜態畫面（打完字的故事、日記的某一頁、設定頁、回饋頁）以前照樣每秒重畫 30 次，
+閒置時一整顆 CPU 核心都在空轉。BaseScene.tick() 每幀交給 FrameScheduler 決定怎麼等：
+  - 場景的 is_animating() 為 True、還有標記了但沒畫出來的髒區域（mark_dirty / mark_all_dirty），
+    或 IDLE_GRACE_MS 內有過輸入 → 照原本的幀率（clock.tick）
+  - 否則用 pygame.event.wait(timeout) 等下一個事件，最晚在場景的 next_wakeup_ms()
+    （例如角色動畫換下一張）或 IDLE_MAX_WAIT_MS 時醒來；等到的事件留給下一次 poll_events()
+
+網頁版（pygbag / emscripten）不能阻塞瀏覽器：閒置時改用較低的幀率 IDLE_WEB_FPS。
+"""
+
+import sys
+import time
+import pygame
+import setting
+
+BLOCKING_WAIT_AVAILABLE = sys.platform != "emscripten"
+
+
+class FrameScheduler:
+    _instance = None  # 單例
+
+    def __init__(self):
+        if FrameScheduler._instance is not None:
+            raise Exception("FrameScheduler 是單例，請使用 get_instance() 取得")
+        self.enabled = setting.IDLE_THROTTLE
+        self._held_events = []  # event.wait 等到、還沒交給場景的事件
+        self._last_input = pygame.time.get_ticks()
+        self.active_frames = 0
+        self.idle_frames = 0
+        self.idle_wait_ms = 0.0  # 閒置時等待的總時間
+        self.event_wakeups = 0
+        self.timeout_wakeups = 0
+        FrameScheduler._instance = self
+
+    @staticmethod
+    def get_instance():
+        if FrameScheduler._instance is None:
+            FrameScheduler()
+        return FrameScheduler._instance
+
+    def take_events(self, events):
+        """poll_events 取得的事件前面接上閒置時等到的事件；有事件就回到全速"""
+        if self._held_events:
+            events = self._held_events + events
+            self._held_events = []
+        if events:
+            self._last_input = pygame.time.get_ticks()
+        return events
+
+    def wake(self):
+        """場景切換等情況：接下來 IDLE_GRACE_MS 維持全速"""
+        self._last_input = pygame.time.get_ticks()
+
+    def is_idle(self, scene, pending):
+        if not self.enabled or pending or scene.is_animating():
+            return False
+        return pygame.time.get_ticks() - self._last_input >= setting.IDLE_GRACE_MS
+
+    def wait(self, scene, clock, fps, pending):
+        """等到下一幀；pending 表示場景還有沒畫出來的變動。回傳 True 表示這一幀是閒置等待"""
+        if not fps or not self.is_idle(scene, pending):
+            clock.tick(fps)
+            self.active_frames += 1
+            return False
+
+        start = time.perf_counter()
+        if BLOCKING_WAIT_AVAILABLE:
+            timeout = setting.IDLE_MAX_WAIT_MS
+            wakeup = scene.next_wakeup_ms()
+            if wakeup is not None:
+                timeout = min(timeout, wakeup)
+            # 最快也只到原本的幀率
+            event = pygame.event.wait(max(int(timeout), int(1000 / fps)))
+            if event.type == pygame.NOEVENT:
+                self.timeout_wakeups += 1
+            else:
+                self._held_events.append(event)
+                self.event_wakeups += 1
+            clock.tick()  # 只更新 clock 的計時，不再等待
+        else:
+            clock.tick(setting.IDLE_WEB_FPS)
+        self.idle_frames += 1
+        self.idle_wait_ms += (time.perf_counter() - start) * 1000
+        return True
+
+    def stats(self):
+        frames = self.active_frames + self.idle_frames
+        return {
+            "enabled": self.enabled,
+            "active_frames": self.active_frames,
+            "idle_frames": self.idle_frames,
+            "idle_ratio": round(self.idle_frames / frames, 3) if frames else 0.0,
+            "idle_wait_s": round(self.idle_wait_ms / 1000, 1),
+            "event_wakeups": self.event_wakeups,
+            "timeout_wakeups": self.timeout_wakeups,
+        }
@@ -0,0 +1,106 @@
+import json
+import os
+import pygame
+import setting
+from UI.components.font_registry import FontRegistry
+
+
+class GlyphAtlas:
+    """單一 (字型, 字級) 的字形圖集；圖集裡沒有的字第一次用到時才用 font.render 補上"""
+
+    def __init__(self, font, png_path, json_path):
+        self.font = font
+        self.png_path = png_path
+        with open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.height = data["height"]
+        self.rects = data["glyphs"]
+        self.image = None   # 第一次使用時才載入圖片
+        self.glyphs = {}    # 字 -> 白色字形 surface
+        self.fallbacks = 0
+
+    def glyph(self, ch):
+        surf = self.glyphs.get(ch)
+        if surf is not None:
+            return surf
+        rect = self.rects.get(ch)
+        if rect is not None:
+            if self.image is None:
+                self.image = pygame.image.load(self.png_path).convert_alpha()
+            surf = self.image.subsurface(pygame.Rect(rect))
+        else:
+            # 圖集外的字（例如 LLM 產生的內容）
+            try:
+                surf = self.font.render(ch, True, (255, 255, 255))
+            except pygame.error:
+                surf = pygame.Surface((0, self.height), pygame.SRCALPHA)  # 零寬度字元
+            self.fallbacks += 1
+        self.glyphs[ch] = surf
+        return surf
+
+
+class GlyphAtlasRenderer:
+    """用字形圖集拼出整行文字，取代 font.render 中昂貴的字形點陣化"""
+    _instance = None  # 單例
+
+    def __init__(self, atlas_dir=setting.GLYPH_ATLAS_DIR):
+        if GlyphAtlasRenderer._instance is not None:
+            raise Exception("GlyphAtlasRenderer 是單例，請使用 get_instance() 取得")
+        self.atlas_dir = atlas_dir
+        self._atlases = {}  # font -> GlyphAtlas 或 None（沒有對應圖集）
+        GlyphAtlasRenderer._instance = self
+
+    @staticmethod
+    def get_instance():
+        if GlyphAtlasRenderer._instance is None:
+            GlyphAtlasRenderer()
+        return GlyphAtlasRenderer._instance
+
+    def atlas_for(self, font):
+        if font in self._atlases:
+            return self._atlases[font]
+        atlas = None
+        key = FontRegistry.get_instance().key_of(font)
+        if key is not None and key[0] is not None:
+            path, size = key
+            name = f"{os.path.splitext(os.path.basename(path))[0]}_{size}"
+            png_path = os.path.join(self.atlas_dir, name + ".png")
+            json_path = os.path.join(self.atlas_dir, name + ".json")
+            if os.path.exists(png_path) and os.path.exists(json_path):
+                atlas = GlyphAtlas(font, png_path, json_path)
+        self._atlases[font] = atlas
+        return atlas
+
+    def render(self, font, text, antialias=True, color=(0, 0, 0), background=None):
+        atlas = self.atlas_for(font) if antialias and background is None and text else None
+        if atlas is None:
+            if background is None:
+                return font.render(text, antialias, color)
+            return font.render(text, antialias, color, background)
+
+        glyph = atlas.glyph
+        blits = []
+        x = 0
+        for ch in text:
+            g = glyph(ch)
+            # 取最大值，字形互相重疊時不會互相蓋掉
+            blits.append((g, (x, 0), None, pygame.BLEND_RGBA_MAX))
+            x += g.get_width()
+        surface = pygame.Surface((x, atlas.height), pygame.SRCALPHA)
+        surface.blits(blits, doreturn=False)
+        # 白色字形乘上文字顏色
+        surface.fill(tuple(color)[:3] + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+        return surface
+
+    def stats(self):
+        loaded = [a for a in self._atlases.values() if a is not None]
+        return {
+            "atlases": len(loaded),
+            "glyphs": sum(len(a.glyphs) for a in loaded),
+            "fallbacks": sum(a.fallbacks for a in loaded),
+        }
+
+
+def render_glyphs(font, text, antialias=True, color=(0, 0, 0), background=None):
+    """取代 font.render：有對應圖集時以圖集拼字，否則直接交給 font.render"""
+    return GlyphAtlasRenderer.get_instance().render(font, text, antialias, color, background)
@@ -1,5 +1,7 @@
 import pygame
 from UI.components.audio_manager import AudioManager
+from UI.components.transform_cache import cached_scale
+from UI.components.render_target import RenderTarget
 import setting
 
 class ImageButton:
@@ -8,6 +10,7 @@ class ImageButton:
         self.image_original = pygame.image.load(image_path).convert_alpha()
         if size:
             self.image_original = pygame.transform.smoothscale(self.image_original, size)
+        RenderTarget.get_instance().prescale(self.image_original)
         self.image = self.image_original.copy()
         self.rect = self.image.get_rect(topleft=pos)
         self.center = self.rect.center  # 記錄中心點，縮放時用
@@ -18,10 +21,12 @@ class ImageButton:
         self.hover_scale = hover_scale
         self.hover_sound_played = False
         self.mask = pygame.mask.from_surface(self.image_original)
+        self._masks = {self.image_original: self.mask}  # 每張圖的 mask 只建一次
+        self.dirty_rect = None  # hover 改變時需要重畫的區域
 
         # 若有文字，預先渲染
         if self.text and self.font:
-            self.text_surface = self.font.render(self.text, True, self.text_color)
+            self.text_surface = RenderTarget.get_instance().prescale(self.font.render(self.text, True, self.text_color))
             self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         else:
             self.text_surface = None
@@ -47,7 +52,16 @@ class ImageButton:
         if self.is_hover and not prev_hover:
             self.audio.play_sound(setting.SoundEffect.MENU_HOVER_PATH)
 
+        old_rect = self.rect
         self.update_hover()
+        if self.is_hover != prev_hover:
+            # 縮放前後的範圍都要重畫
+            self.dirty_rect = old_rect.union(self.rect)
+
+    def get_dirty_rect(self):
+        """回傳並清除 hover 改變造成的髒區域；沒有變動時回傳 None"""
+        rect, self.dirty_rect = self.dirty_rect, None
+        return rect
 
     def update_hover(self):
         if self.is_hover:
@@ -55,19 +69,26 @@ class ImageButton:
                 int(self.image_original.get_width() * self.hover_scale),
                 int(self.image_original.get_height() * self.hover_scale)
             )
-            self.image = pygame.transform.smoothscale(self.image_original, scaled_size)
+            self.image = cached_scale(self.image_original, scaled_size)
             self.rect = self.image.get_rect(center=self.center)
-            self.mask = pygame.mask.from_surface(self.image)  # <--- 這裡重建 mask
+            self.mask = self._mask_for(self.image)
             if self.text_surface:
                 self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         else:
             self.image = self.image_original
             self.rect = self.image.get_rect(center=self.center)
-            self.mask = pygame.mask.from_surface(self.image)  # <--- 這裡重建 mask
+            self.mask = self._mask_for(self.image)
             if self.text_surface:
                 self.text_rect = self.text_surface.get_rect(center=self.rect.center)
 
 
+    def _mask_for(self, image):
+        mask = self._masks.get(image)
+        if mask is None:
+            mask = pygame.mask.from_surface(image)
+            self._masks[image] = mask
+        return mask
+
     def draw(self, screen):
         screen.blit(self.image, self.rect)
         if self.text_surface:
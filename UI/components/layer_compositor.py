@@ -0,0 +1,98 @@
+import pygame
+from UI.components.surface_memory import SurfaceMemory
+from UI.components.render_target import RenderTarget, ScaledCanvas, fill_alpha
+
+
+class LayerCompositor:
+    """把靜態圖層（背景、半透明遮罩、面板底色等）預先合成為一張不透明 surface，
+    只有圖層的內容或透明度改變時才重新合成，場景每幀只需 blit 一次。
+    內部解析度縮小時直接合成在畫布的解析度上（圖層的圖會預先做好縮小版），圖層的內容請勿再修改"""
+
+    def __init__(self, size, base_color=(255, 255, 255)):
+        self.size = size
+        self.base_color = base_color
+        self._layers = []   # [name, kind, data, pos/rect, alpha]
+        self._surface = None
+        self._target = None  # 用邏輯座標畫到 _surface 上（內部解析度縮小時是 ScaledCanvas）
+        self._dirty = True
+        self.rebuilds = 0
+
+    def add_layer(self, name, surface, pos=(0, 0), alpha=None):
+        """一般圖片圖層；alpha 為 None 時沿用 surface 本身的透明度"""
+        self._layers.append([name, "surface", RenderTarget.get_instance().prescale(surface), pos, alpha])
+        self._dirty = True
+
+    def add_fill(self, name, color, rect=None):
+        """純色圖層（RGBA），rect 為 None 時填滿整張"""
+        color = tuple(color)
+        alpha = color[3] if len(color) == 4 else 255
+        self._layers.append([name, "fill", color[:3], rect, alpha])
+        self._dirty = True
+
+    def add_draw(self, name, draw_func):
+        """自訂繪製圖層：draw_func(surface) 直接畫在合成結果上"""
+        self._layers.append([name, "draw", draw_func, None, None])
+        self._dirty = True
+
+    def _find(self, name):
+        for layer in self._layers:
+            if layer[0] == name:
+                return layer
+        raise KeyError(name)
+
+    def set_alpha(self, name, alpha):
+        layer = self._find(name)
+        if layer[4] != alpha:
+            layer[4] = alpha
+            self._dirty = True
+
+    def set_surface(self, name, surface, pos=None):
+        layer = self._find(name)
+        if layer[2] is not surface or (pos is not None and layer[3] != pos):
+            layer[2] = RenderTarget.get_instance().prescale(surface)
+            if pos is not None:
+                layer[3] = pos
+            self._dirty = True
+
+    def invalidate(self):
+        self._dirty = True
+
+    def _rebuild(self):
+        if self._surface is None:
+            self._surface, self._target = RenderTarget.get_instance().new_surface(self.size)
+            SurfaceMemory.get_instance().track(self._surface, "compositor", "LayerCompositor")
+        target = self._target
+        target.fill(self.base_color)
+
+        for name, kind, data, pos, alpha in self._layers:
+            if kind == "surface":
+                if alpha is None:
+                    target.blit(data, pos)
+                elif alpha > 0:
+                    # 暫時調整透明度，畫完還原，避免改到共用的 surface
+                    old_alpha = data.get_alpha()
+                    data.set_alpha(alpha)
+                    target.blit(data, pos)
+                    data.set_alpha(old_alpha)
+            elif kind == "fill":
+                if alpha >= 255:
+                    target.fill(data, pos)
+                elif alpha > 0:
+                    fill_alpha(target, data + (alpha,), pos)
+            else:
+                data(target)
+
+        self._dirty = False
+        self.rebuilds += 1
+
+    def get_surface(self):
+        """合成結果（內部解析度縮小時是畫布解析度的 surface）"""
+        if self._dirty or self._surface is None:
+            self._rebuild()
+        return self._surface
+
+    def draw(self, screen, pos=(0, 0)):
+        if isinstance(screen, ScaledCanvas):
+            screen.blit_native(self.get_surface(), pos)
+        else:
+            screen.blit(self.get_surface(), pos)
@@ -0,0 +1,248 @@
+"""
+內部解析度 - 低階電腦與網頁版可以把場景畫在較小的畫布上，每幀放大一次送到視窗
+
+setting.RENDER_SCALE 小於 1（例如 0.5、0.75）時：
+  - 視窗維持 1200×800，場景拿到的 screen 是 ScaledCanvas：介面和 Surface 一樣用 1200×800 的座標，
+    實際畫在 SCREEN_* × RENDER_SCALE 的畫布上，半透明圖層的混色只需處理縮小後的像素
+  - 圖片在建立時就準備好縮小版（prescale）：文字與縮放 / 旋轉快取、動畫影格、預先合成的底圖、
+    場景載入的背景與圖片；沒有縮小版的 surface 在 blit 時才即時縮小（例如每幀重畫的文字）
+  - 送出時畫布一次放大到視窗（flip / update）；視窗大小不變，滑鼠座標不用換算
+  - 畫在 screen 上的圖形改用本模組的 draw_rect / draw_circle（座標與線寬一起縮放）
+
+RENDER_SCALE 為 1（預設）時畫布就是視窗本身，prescale 什麼都不做，完全沒有額外的成本。
+"""
+
+import time
+import weakref
+import pygame
+import setting
+from UI.components.surface_memory import SurfaceMemory, attribute_surfaces
+
+
+class ScaledCanvas:
+    """用邏輯座標（size）畫在縮小的 surface 上；只實作場景用到的 Surface 方法"""
+
+    def __init__(self, surface, size, scale):
+        self.surface = surface  # 實際的像素（size × scale）
+        self.size = tuple(size)
+        self.scale = scale
+        self._clip = None
+
+    def _point(self, pos):
+        return (round(pos[0] * self.scale), round(pos[1] * self.scale))
+
+    def _rect(self, rect):
+        # 四個邊各自取整，相鄰的矩形縮小後仍然剛好接在一起
+        rect = pygame.Rect(rect)
+        left, top = self._point(rect.topleft)
+        right, bottom = self._point(rect.bottomright)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def _length(self, value):
+        return max(1, round(value * self.scale)) if value > 0 else 0
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        """與 Surface.blit 相同，回傳邏輯座標的範圍"""
+        pos = dest.topleft if isinstance(dest, pygame.Rect) else (dest[0], dest[1])
+        image = RenderTarget.get_instance().scaled_surface(source)
+        scaled_area = None if area is None else self._rect(area)
+        self.surface.blit(image, self._point(pos), scaled_area, special_flags)
+        size = source.get_size() if area is None else pygame.Rect(area).size
+        return pygame.Rect(pos, size)
+
+    def blit_native(self, surface, dest=(0, 0)):
+        """surface 已經是畫布的解析度（例如 LayerCompositor 合成的底圖），只換算位置"""
+        pos = dest.topleft if isinstance(dest, pygame.Rect) else dest
+        self.surface.blit(surface, self._point(pos))
+
+    def fill(self, color, rect=None, special_flags=0):
+        self.surface.fill(color, None if rect is None else self._rect(rect), special_flags)
+        return pygame.Rect(rect) if rect is not None else self.get_rect()
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        pygame.draw.rect(self.surface, color, self._rect(rect), self._length(width),
+                         border_radius=self._length(border_radius))
+        return pygame.Rect(rect)
+
+    def draw_circle(self, color, center, radius, width=0):
+        pygame.draw.circle(self.surface, color, self._point(center), self._length(radius), self._length(width))
+        return pygame.Rect(center[0] - radius, center[1] - radius, radius * 2, radius * 2)
+
+    def get_size(self):
+        return self.size
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def set_clip(self, rect=None):
+        self._clip = None if rect is None else pygame.Rect(rect)
+        self.surface.set_clip(None if rect is None else self._rect(rect))
+
+    def get_clip(self):
+        return self._clip if self._clip is not None else self.get_rect()
+
+    def copy(self):
+        """放大回邏輯大小的一般 Surface（例如給 fast_blur 當模糊背景）"""
+        return pygame.transform.scale(self.surface, self.size)
+
+
+def fill_alpha(surface, color, rect=None):
+    """半透明的純色（RGBA）疊在 rect 上（None 表示整張）；surface 可以是 ScaledCanvas"""
+    if isinstance(surface, ScaledCanvas):
+        rect = surface.get_rect() if rect is None else pygame.Rect(rect)
+        surface, rect = surface.surface, surface._rect(rect)
+    rect = surface.get_rect() if rect is None else pygame.Rect(rect)
+    layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+    layer.fill(color)
+    surface.blit(layer, rect.topleft)
+
+
+def draw_rect(surface, color, rect, width=0, border_radius=0):
+    """取代 pygame.draw.rect；surface 可以是 ScaledCanvas"""
+    if isinstance(surface, ScaledCanvas):
+        return surface.draw_rect(color, rect, width, border_radius)
+    return pygame.draw.rect(surface, color, rect, width, border_radius=border_radius)
+
+
+def draw_circle(surface, color, center, radius, width=0):
+    """取代 pygame.draw.circle；surface 可以是 ScaledCanvas"""
+    if isinstance(surface, ScaledCanvas):
+        return surface.draw_circle(color, center, radius, width)
+    return pygame.draw.circle(surface, color, center, radius, width)
+
+
+class RenderTarget:
+    _instance = None  # 單例
+
+    def __init__(self):
+        if RenderTarget._instance is not None:
+            raise Exception("RenderTarget 是單例，請使用 get_instance() 取得")
+        self.scale = min(1.0, max(0.25, setting.RENDER_SCALE))
+        self.logical_size = (setting.SCREEN_WIDTH, setting.SCREEN_HEIGHT)
+        self.canvas_size = self.scaled_size(self.logical_size)
+        # create_display 建立了縮小的畫布才算數；視窗由別處建立時（例如測試直接 set_mode）場景就畫在視窗上
+        self.scaled = False
+        self.display = None
+        self.canvas = None
+        self._prescaled = weakref.WeakKeyDictionary()  # 原圖 -> 縮小版；原圖被回收時一起丟掉
+        self.frames = 0
+        self.upscale_ms = 0.0   # 放大畫布花的總時間
+        self.prescales = 0      # 建立了幾張縮小版
+        self.scaled_blits = 0   # 沒有縮小版、blit 時才即時縮小的次數
+        RenderTarget._instance = self
+
+    @staticmethod
+    def get_instance():
+        if RenderTarget._instance is None:
+            RenderTarget()
+        return RenderTarget._instance
+
+    def scaled_size(self, size):
+        return (max(1, round(size[0] * self.scale)), max(1, round(size[1] * self.scale)))
+
+    def create_display(self):
+        """建立視窗，回傳場景要畫的 screen（縮放模式下是 ScaledCanvas）"""
+        self.display = pygame.display.set_mode(self.logical_size)
+        self.scaled = self.canvas_size != self.logical_size
+        if not self.scaled:
+            self.canvas = self.display
+            return self.canvas
+        # 和視窗同樣的像素格式，放大時不必再轉換
+        self.canvas = ScaledCanvas(pygame.Surface(self.canvas_size).convert(), self.logical_size, self.scale)
+        return self.canvas
+
+    def new_surface(self, size):
+        """LayerCompositor 等預先合成的不透明底圖：回傳 (實際的 surface, 用邏輯座標畫上去的目標)"""
+        surface = pygame.Surface(self.scaled_size(size) if self.scaled else size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        if not self.scaled:
+            return surface, surface
+        return surface, ScaledCanvas(surface, size, self.scale)
+
+    def prescale(self, surface):
+        """登記一張內容不會再改變的圖，預先做好縮小版；回傳原 surface。
+        已登記過的圖不再重做，內容改了要呼叫 refresh()"""
+        if not self.scaled or surface in self._prescaled:
+            return surface
+        size = self.scaled_size(surface.get_size())
+        if surface.get_colorkey() is not None or surface.get_bitsize() < 24:
+            # colorkey 的圖平滑縮放會把透明色混進邊緣；8 位元的圖（未反鋸齒的文字）不能平滑縮放
+            image = pygame.transform.scale(surface, size)
+        else:
+            image = pygame.transform.smoothscale(surface, size)
+        self._prescaled[surface] = image
+        self.prescales += 1
+        SurfaceMemory.get_instance().track(image, "prescaled", "RenderTarget")
+        return surface
+
+    def prescale_all(self, surfaces):
+        for surface in surfaces:
+            self.prescale(surface)
+        return surfaces
+
+    def prescale_attributes(self, obj):
+        """登記物件屬性中的 surface（含 list / tuple / dict 裡的一層），例如場景載入的背景與圖片"""
+        if self.scaled:
+            self.prescale_all(attribute_surfaces(obj))
+
+    def refresh(self, surface):
+        """已登記的圖內容改變了（例如 StatPanel 重畫數值），重做縮小版"""
+        if self.scaled:
+            self._prescaled.pop(surface, None)
+            self.prescale(surface)
+        return surface
+
+    def scaled_surface(self, surface):
+        """blit 到 ScaledCanvas 時實際用的圖：有縮小版就用（透明度跟著原圖），否則即時縮小"""
+        image = self._prescaled.get(surface)
+        if image is None:
+            self.scaled_blits += 1
+            return pygame.transform.scale(surface, self.scaled_size(surface.get_size()))
+        alpha = surface.get_alpha()
+        if image.get_alpha() != alpha:
+            image.set_alpha(alpha)
+        return image
+
+    def _upscale_canvas(self):
+        start = time.perf_counter()
+        if setting.RENDER_SMOOTH:
+            pygame.transform.smoothscale(self.canvas.surface, self.logical_size, self.display)
+        else:
+            pygame.transform.scale(self.canvas.surface, self.logical_size, self.display)
+        self.upscale_ms += (time.perf_counter() - start) * 1000
+        self.frames += 1
+
+    def flip(self):
+        """取代 pygame.display.flip()"""
+        if self.scaled:
+            self._upscale_canvas()
+        pygame.display.flip()
+
+    def update(self, rects):
+        """取代 pygame.display.update(rects)；縮放模式下整張放大（不會在髒區域的邊界出現取樣不一致的接縫），
+        但只送出髒區域"""
+        if self.scaled:
+            self._upscale_canvas()
+        pygame.display.update(rects)
+
+    def stats(self):
+        return {
+            "scale": self.scale,
+            "canvas_size": list(self.canvas_size),
+            "smooth": setting.RENDER_SMOOTH,
+            "frames": self.frames,
+            "upscale_ms_avg": round(self.upscale_ms / self.frames, 3) if self.frames else 0.0,
+            "prescaled": len(self._prescaled),
+            "prescales": self.prescales,
+            "scaled_blits": self.scaled_blits,
+        }
@@ -1,5 +1,7 @@
 import pygame
 import random
+from UI.components.text_cache import render_text
+from UI.components.render_target import draw_rect
 
 class SpeechBubble:
     def __init__(self, player, pos, font, duration=1500):
@@ -12,14 +14,14 @@ class SpeechBubble:
 
 
     def draw(self, screen):
-        text_surf = self.font.render(self.text, True, (0, 0, 0))
+        text_surf = render_text(self.font, self.text, True, (0, 0, 0))
         padding = 20
         bubble_w = text_surf.get_width() + padding
         bubble_h = text_surf.get_height() + padding
         bubble_rect = pygame.Rect(0, 0, bubble_w, bubble_h)
         bubble_rect.topleft= self.pos
-        pygame.draw.rect(screen, (255, 255, 255), bubble_rect, border_radius=15)
-        pygame.draw.rect(screen, (0, 0, 0), bubble_rect, 2, border_radius=15)
+        draw_rect(screen, (255, 255, 255), bubble_rect, border_radius=15)
+        draw_rect(screen, (0, 0, 0), bubble_rect, 2, border_radius=15)
         screen.blit(text_surf, text_surf.get_rect(center=bubble_rect.center))
 
     def is_expired(self):
@@ -0,0 +1,152 @@
+import pygame
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
+from UI.components.render_target import RenderTarget, draw_rect, fill_alpha
+
+
+def stats_change(list):
+    # 將數字轉換為帶符號的字串
+    # 正數前加 "+"，負數前加 "-"，零則顯示 "-"
+    result = []
+    for change in list:
+        change = int(change)
+        if change > 0:
+            result.append( "+" + str(change))
+        if change == 0:
+            result.append("-")
+        elif change < 0:
+            result.append(str(change))
+    return result
+
+
+class StatPanel:
+    """MainScene / EndScene 共用的玩家數值面板
+
+    面板內容畫在一張快取的 surface 上，只有玩家數值改變時才重畫，
+    平常每幀只需要一次 blit。final=True 時顯示期末結算（GPA 與考試成績）。
+    """
+
+    def __init__(self, player, pos=(20, 50), size=(480, 250), final=False):
+        self.player = player
+        self.rect = pygame.Rect(pos, size)
+        self.final = final
+
+        self.stats_font = get_font_style("small")
+        self.change_font = get_font_style("light_small")
+        self.bar_width = 150
+        self.bar_height = 20
+        self.bar_gap = 10
+        self.bar_colors = {
+            "intelligence": (135, 206, 250),  # 淺藍
+            "mood":         (255, 182, 193),  # 粉紅
+            "energy":       (144, 238, 144),  # 淺綠
+            "social":       (255, 165, 0),    # 橘色
+            "knowledge":    (221, 160, 221)    # 紫色
+        }
+
+        self._header_path = None
+        self._header_image = None
+        self._surface = pygame.Surface(size, pygame.SRCALPHA)
+        self._state = None
+        self.renders = 0
+
+    def draw_background(self, surface):
+        """面板底色與邊框（靜態，交給場景的 LayerCompositor 預先合成）"""
+        fill_alpha(surface, (255, 255, 255, 180), self.rect)  # 180 可調整透明度，0~255
+        draw_rect(surface, (100, 100, 100), self.rect, 2)
+
+    def _current_state(self):
+        p = self.player
+        state = (
+            p.header, p.chname, p.name, p.week_number,
+            p.intelligence, p.mood, p.energy, p.social, p.knowledge,
+        )
+        if self.final:
+            return state + (p.GPA, p.total_score, p.midterm, p.final)
+        return state + (tuple(p.last_week_change),)
+
+    def _header(self):
+        # 頭像只在路徑改變時載入一次
+        if self._header_path != self.player.header:
+            img = pygame.image.load(self.player.header).convert_alpha()
+            self._header_image = pygame.transform.smoothscale(img, (100, 100))
+            self._header_path = self.player.header
+        return self._header_image
+
+    def _render(self):
+        surface = self._surface
+        surface.fill((0, 0, 0, 0))
+        ox, oy = self.rect.topleft  # 以下座標沿用畫面座標，畫到面板上時扣掉面板位置
+
+        def blit(img, pos):
+            surface.blit(img, (pos[0] - ox, pos[1] - oy))
+
+        def bar(color, rect, width=0):
+            pygame.draw.rect(surface, color, (rect[0] - ox, rect[1] - oy, rect[2], rect[3]), width)
+
+        p = self.player
+        font = self.stats_font
+        x_left = 30
+        x_right = x_left + self.bar_width + 80
+        y_start = 180
+        bar_height = self.bar_height
+        bar_width = self.bar_width
+        gap_y = self.bar_gap
+        label_offset = -5  # 調整文字與條的對齊
+
+        # 玩家的頭像、名字與週數
+        blit(self._header(), (40, 60))
+        blit(render_text(font, p.chname + " " + p.name, True, (0, 0, 0)), (160, 80))
+        week_text = "Final Result" if self.final else f"第 {p.week_number} 週"
+        blit(render_text(font, week_text, True, (0, 0, 0)), (160, 120))
+
+        stats = {
+            "intelligence": (p.intelligence, f"智力 {p.intelligence}"),
+            "mood": (p.mood, f"心情 {p.mood}"),
+            "energy": (p.energy, f"體力 {p.energy}"),
+            "social": (p.social, f"社交 {p.social}"),
+        }
+
+        # 第一排：intelligence / mood；第二排：energy / social
+        for row, keys in enumerate((["intelligence", "mood"], ["energy", "social"])):
+            y = y_start if row == 0 else y_start + bar_height + gap_y + 10
+            for i, key in enumerate(keys):
+                x = x_left if i == 0 else x_right
+                value, text = stats[key]
+                fill = max(0, min(1, value / 100))
+                bar((200, 200, 200), (x + 65, y, bar_width, bar_height), 2)
+                bar(self.bar_colors[key], (x + 65, y, int(bar_width * fill), bar_height))
+                blit(render_text(font, text, True, (0, 0, 0)), (x, y + label_offset))
+
+        # 第三排：knowledge（橫跨兩個 bar）
+        y = y_start + 2 * (bar_height + gap_y) + 20
+        x = x_left
+        total_width = (x_right - x_left) + 130 + bar_width  # 橫跨兩欄
+        fill = max(0, min(1, p.knowledge / 100))
+        bar((200, 200, 200), (x + 65, y, total_width - 130, bar_height), 2)
+        bar(self.bar_colors["knowledge"], (x + 65, y, int((total_width - 130) * fill), bar_height))
+        blit(render_text(font, f"知識 {p.knowledge:.0f}/100", True, (0, 0, 0)), (x, y + label_offset))
+
+        font2 = self.change_font
+        if self.final:
+            # 總成績與期中、期末考成績
+            blit(render_text(font2, f"GPA: {p.GPA}", True, (0, 0, 0)), (x_right + 60, 65))
+            blit(render_text(font2, f"Total Score: {p.total_score}", True, (0, 0, 0)), (x_right + 60, 90))
+            blit(render_text(font2, f"Midterm: {p.midterm}", True, (0, 0, 0)), (x_right + 60, 115))
+            blit(render_text(font2, f"Final: {p.final}", True, (0, 0, 0)), (x_right + 60, 140))
+        elif p.week_number > 0:
+            # 玩家本週選擇造成的改變
+            last_week_change = stats_change(p.last_week_change)
+            blit(render_text(font2, "本週選擇改變：", True, (0, 0, 0)), (x_right + 60, 90))
+            blit(render_text(font2, f"心情 {last_week_change[0]} 知識 {last_week_change[3]}", True, (0, 0, 0)), (x_right + 60, 115))
+            blit(render_text(font2, f"體力 {last_week_change[1]} 社交 {last_week_change[2]}", True, (0, 0, 0)), (x_right + 60, 140))
+
+        RenderTarget.get_instance().refresh(surface)  # 內部解析度縮小時重做縮小版
+        self.renders += 1
+
+    def draw(self, screen):
+        state = self._current_state()
+        if state != self._state:
+            self._render()
+            self._state = state
+        screen.blit(self._surface, self.rect.topleft)
@@ -0,0 +1,132 @@
+import weakref
+import pygame
+import setting
+
+
+def surface_bytes(surface):
+    """surface 實際佔用的像素記憶體（含每列的對齊填充）"""
+    return surface.get_pitch() * surface.get_height()
+
+
+def attribute_surfaces(obj):
+    """物件屬性中的 surface（含 list / tuple / dict 裡的一層）"""
+    surfaces = []
+    for value in vars(obj).values():
+        if isinstance(value, pygame.Surface):
+            surfaces.append(value)
+            continue
+        if isinstance(value, (list, tuple)):
+            items = value
+        elif isinstance(value, dict):
+            items = value.values()
+        else:
+            continue
+        surfaces.extend(item for item in items if isinstance(item, pygame.Surface))
+    return surfaces
+
+
+class SurfaceMemory:
+    """依類別與擁有者統計還活著的 pygame surface 佔用多少記憶體，超過預算時印出警告
+
+    只持有弱參照：surface 被回收後自動從統計中扣掉，不會因為記帳而延長 surface 的壽命。
+    類別："animation"（動畫影格）、"scene"（場景的背景與圖片）、"chart"（排行圖表）、
+    "compositor"（預先合成的底圖）、"cache"（文字與縮放 / 旋轉快取）、
+    "prescaled"（內部解析度縮小時的縮小版，見 render_target.py）。
+    """
+    _instance = None  # 單例
+
+    def __init__(self, budget_mb=None):
+        if SurfaceMemory._instance is not None:
+            raise Exception("SurfaceMemory 是單例，請使用 get_instance() 取得")
+        self.budget_bytes = int((budget_mb or setting.SURFACE_MEMORY_BUDGET_MB) * 2**20)
+        self._entries = {}  # id(surface) -> (弱參照, 類別, 擁有者, bytes)
+        self._bytes = {}    # (類別, 擁有者) -> [surface 數, bytes]
+        self.total_bytes = 0
+        self.peak_bytes = 0
+        self.over_budget = False
+        self.warnings = 0
+        SurfaceMemory._instance = self
+
+    @staticmethod
+    def get_instance():
+        if SurfaceMemory._instance is None:
+            SurfaceMemory()
+        return SurfaceMemory._instance
+
+    def track(self, surface, category, owner):
+        """登記一個 surface；同一個 surface 只算一次（以第一次登記的類別為準）。回傳原 surface"""
+        key = id(surface)
+        if key in self._entries:
+            return surface
+        size = surface_bytes(surface)
+        ref = weakref.ref(surface, lambda _, key=key: self._release(key))
+        self._entries[key] = (ref, category, owner, size)
+        counts = self._bytes.setdefault((category, owner), [0, 0])
+        counts[0] += 1
+        counts[1] += size
+        self.total_bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.total_bytes)
+        self._check_budget()
+        return surface
+
+    def track_all(self, surfaces, category, owner):
+        for surface in surfaces:
+            self.track(surface, category, owner)
+        return surfaces
+
+    def track_attributes(self, obj, category, owner=None):
+        """登記物件屬性中的 surface（含 list / tuple / dict 裡的一層），例如場景載入的背景與圖片"""
+        self.track_all(attribute_surfaces(obj), category, owner or type(obj).__name__)
+
+    def _release(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, category, owner, size = entry
+        counts = self._bytes[(category, owner)]
+        counts[0] -= 1
+        counts[1] -= size
+        if counts[0] == 0:
+            del self._bytes[(category, owner)]
+        self.total_bytes -= size
+        if self.over_budget and self.total_bytes <= self.budget_bytes:
+            self.over_budget = False  # 降回預算內，下次超過時再警告一次
+
+    def _check_budget(self):
+        if self.over_budget or self.total_bytes <= self.budget_bytes:
+            return
+        self.over_budget = True
+        self.warnings += 1
+        top = sorted(self._bytes.items(), key=lambda item: item[1][1], reverse=True)[:3]
+        biggest = "、".join(f"{category}/{owner} {size / 2**20:.1f}MB" for (category, owner), (_, size) in top)
+        print(f"警告：surface 記憶體 {self.total_bytes / 2**20:.1f}MB 超過預算 "
+              f"{self.budget_bytes / 2**20:.0f}MB（最大：{biggest}）")
+
+    def by_category(self):
+        categories = {}
+        for (category, _), (count, size) in self._bytes.items():
+            entry = categories.setdefault(category, {"surfaces": 0, "mb": 0.0})
+            entry["surfaces"] += count
+            entry["mb"] += size / 2**20
+        return {category: {"surfaces": e["surfaces"], "mb": round(e["mb"], 2)} for category, e in categories.items()}
+
+    def by_owner(self, limit=10):
+        top = sorted(self._bytes.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {"category": category, "owner": owner, "surfaces": count, "mb": round(size / 2**20, 2)}
+            for (category, owner), (count, size) in top
+        ]
+
+    def stats(self):
+        return {
+            "live_surfaces": len(self._entries),
+            "total_mb": round(self.total_bytes / 2**20, 2),
+            "peak_mb": round(self.peak_bytes / 2**20, 2),
+            "budget_mb": round(self.budget_bytes / 2**20, 2),
+            "budget_warnings": self.warnings,
+            "categories": self.by_category(),
+        }
+
+
+def track_surface(surface, category, owner):
+    return SurfaceMemory.get_instance().track(surface, category, owner)
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from UI.components.glyph_atlas import render_glyphs
+from UI.components.surface_memory import SurfaceMemory
+from UI.components.render_target import RenderTarget
+
+
+class TextCache:
+    """共用的文字 surface 快取，以 (font, text, antialias, color, background) 為 key，LRU 淘汰"""
+    _instance = None  # 單例
+
+    def __init__(self, max_entries=512):
+        if TextCache._instance is not None:
+            raise Exception("TextCache 是單例，請使用 get_instance() 取得")
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self.reset_stats()
+        TextCache._instance = self
+
+    @staticmethod
+    def get_instance():
+        if TextCache._instance is None:
+            TextCache()
+        return TextCache._instance
+
+    def render(self, font, text, antialias=True, color=(0, 0, 0), background=None):
+        # pygame.Color 不能當 dict key，統一轉成 tuple
+        key = (
+            font,
+            text,
+            bool(antialias),
+            tuple(color),
+            tuple(background) if background is not None else None,
+        )
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = render_glyphs(font, text, antialias, color, background)
+        SurfaceMemory.get_instance().track(surface, "cache", "TextCache")
+        RenderTarget.get_instance().prescale(surface)
+        self._cache[key] = surface
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """清空快取，命中率也從頭算"""
+        self._cache.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+
+def render_text(font, text, antialias=True, color=(0, 0, 0), background=None):
+    """取代 font.render：回傳共用快取中的 surface（請勿直接修改回傳的 surface）"""
+    return TextCache.get_instance().render(font, text, antialias, color, background)
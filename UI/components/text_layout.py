@@ -0,0 +1,157 @@
+from collections import OrderedDict
+import pygame
+from UI.components.text_cache import render_text
+from UI.components.render_target import RenderTarget
+
+
+class TextLayout:
+    """文字排版引擎：快取每個字的寬度，並記住 (text, font, width) 的斷行結果與整段預先繪製的 surface"""
+    _instance = None  # 單例
+
+    def __init__(self, max_layouts=256, max_blocks=32):
+        if TextLayout._instance is not None:
+            raise Exception("TextLayout 是單例，請使用 get_instance() 取得")
+        self.max_layouts = max_layouts
+        self.max_blocks = max_blocks
+        self._advances = {}           # font -> {字: 寬度}
+        self._layouts = OrderedDict()  # (font, text, max_width) -> tuple(lines)
+        self._blocks = OrderedDict()   # (font, text, max_width, color, line_height) -> Surface
+        self.hits = 0
+        self.misses = 0
+        TextLayout._instance = self
+
+    @staticmethod
+    def get_instance():
+        if TextLayout._instance is None:
+            TextLayout()
+        return TextLayout._instance
+
+    def _glyph_advances(self, font, text):
+        advances = self._advances.setdefault(font, {})
+        missing = "".join({ch for ch in text if ch not in advances and ch != "\n"})
+        if missing:
+            # 一次取得所有新字的 metrics，第 5 欄即為 advance
+            for ch, metric in zip(missing, font.metrics(missing)):
+                advances[ch] = metric[4] if metric is not None else font.size(ch)[0]
+        return advances
+
+    def wrap(self, text, font, max_width):
+        key = (font, text, max_width)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            self.hits += 1
+            return lines
+
+        self.misses += 1
+        result = []
+        for para in text.split('\n'):  # 支援多段落
+            result.extend(self.wrap_paragraph(para, font, max_width))
+
+        lines = tuple(result)
+        self._layouts[key] = lines
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return lines
+
+    def wrap_paragraph(self, para, font, max_width):
+        """把單一段落（不含換行）斷成多行；空段落不產生任何行"""
+        advances = self._glyph_advances(font, para)
+        result = []
+        start = 0
+        width = 0
+        for i, ch in enumerate(para):
+            w = advances[ch]
+            if width + w <= max_width or i == start:
+                width += w
+            else:
+                result.append(para[start:i])
+                start = i
+                width = w
+        if start < len(para):
+            result.append(para[start:])
+        return result
+
+    def render_block(self, text, font, max_width, color=(0, 0, 0), line_height=None):
+        """把整段文字畫成一張透明 surface；同樣的輸入直接回傳快取（請勿修改回傳的 surface）"""
+        if line_height is None:
+            line_height = font.get_height()
+        key = (font, text, max_width, tuple(color), line_height)
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            return block
+
+        lines = self.wrap(text, font, max_width)
+        width = max((font.size(line)[0] for line in lines), default=0)
+        height = max(line_height * len(lines), line_height * (len(lines) - 1) + font.get_height()) if lines else 0
+        block = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        for i, line in enumerate(lines):
+            block.blit(render_text(font, line, True, color), (0, i * line_height))
+        RenderTarget.get_instance().prescale(block)
+
+        self._blocks[key] = block
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+    def clear(self):
+        self._advances.clear()
+        self._layouts.clear()
+        self._blocks.clear()
+
+    def stats(self):
+        return {
+            "layouts": len(self._layouts),
+            "blocks": len(self._blocks),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class IncrementalLayout:
+    """給逐字出現（串流）的文字用的斷行：已經結束的段落不再重排，每次只重新斷最後一段
+
+    斷行結果與 TextLayout.wrap 相同；新文字不是舊文字的延續時（例如改成錯誤訊息）才整段重排。
+    最後一行還在變動，draw_line() 不經過 TextCache，避免快取被大量一次性的半行文字塞滿。
+    """
+
+    def __init__(self, font, max_width):
+        self.font = font
+        self.max_width = max_width
+        self.text = ""
+        self._done_lines = []  # 已結束段落的斷行
+        self._done_len = 0     # 已結束段落（含最後的換行）佔的字數
+        self._tail_lines = []  # 最後一段（可能還在增加）的斷行
+        self.final = False
+
+    def set_text(self, text, final=False):
+        """更新文字並回傳全部的行；final=True 表示文字不會再變"""
+        if not text.startswith(self.text):
+            self.text = ""
+            self._done_lines = []
+            self._done_len = 0
+        layout = TextLayout.get_instance()
+        paras = text[self._done_len:].split('\n')
+        for para in paras[:-1]:
+            self._done_lines.extend(layout.wrap_paragraph(para, self.font, self.max_width))
+            self._done_len += len(para) + 1
+        self._tail_lines = layout.wrap_paragraph(paras[-1], self.font, self.max_width)
+        self.text = text
+        self.final = final
+        return self.lines
+
+    @property
+    def lines(self):
+        return self._done_lines + self._tail_lines
+
+    def is_settled(self, index):
+        """第 index 行之後還會不會變（只有最後一行會隨新文字變動）"""
+        return self.final or index < len(self._done_lines) + len(self._tail_lines) - 1
+
+    def draw_line(self, surface, index, pos, color):
+        line = self.lines[index]
+        if self.is_settled(index):
+            surface.blit(render_text(self.font, line, True, color), pos)
+        else:
+            surface.blit(self.font.render(line, True, color), pos)
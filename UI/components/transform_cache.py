@@ -0,0 +1,107 @@
+from collections import OrderedDict
+import pygame
+from UI.components.surface_memory import SurfaceMemory
+from UI.components.render_target import RenderTarget
+
+
+class TransformCache:
+    """縮放 / 旋轉結果的快取，以 (來源 surface, 量化後的角度與倍率) 為 key，LRU 淘汰
+
+    回傳的 surface 是共用的，請勿在上面繪圖；需要透明度時 set_alpha 後立即 blit 即可。
+    """
+    _instance = None  # 共用的預設快取
+
+    def __init__(self, max_entries=1024, angle_step=5, scale_step=0.05):
+        self.max_entries = max_entries
+        self.angle_step = angle_step
+        self.scale_step = scale_step
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_instance():
+        if TransformCache._instance is None:
+            TransformCache._instance = TransformCache()
+        return TransformCache._instance
+
+    def quantize_angle(self, angle):
+        step = self.angle_step
+        return (round(angle / step) * step) % 360
+
+    def quantize_scale(self, scale):
+        step = self.scale_step
+        return round(round(scale / step) * step, 4)
+
+    def _get(self, key, make):
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = make()
+        SurfaceMemory.get_instance().track(surface, "cache", "TransformCache")
+        RenderTarget.get_instance().prescale(surface)
+        self._cache[key] = surface
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def scale(self, surface, size, smooth=True):
+        """取代 pygame.transform.smoothscale / scale"""
+        size = (int(size[0]), int(size[1]))
+        if smooth:
+            return self._get((surface, "smoothscale", size), lambda: pygame.transform.smoothscale(surface, size))
+        return self._get((surface, "scale", size), lambda: pygame.transform.scale(surface, size))
+
+    def scale_by(self, surface, factor, smooth=True):
+        """依倍率縮放，倍率會先量化"""
+        factor = self.quantize_scale(factor)
+        w, h = surface.get_size()
+        return self.scale(surface, (w * factor, h * factor), smooth)
+
+    def rotate(self, surface, angle):
+        """取代 pygame.transform.rotate，角度會先量化"""
+        angle = self.quantize_angle(angle)
+        return self._get((surface, "rotate", angle), lambda: pygame.transform.rotate(surface, angle))
+
+    def rotozoom(self, surface, angle, scale):
+        """取代 pygame.transform.rotozoom，角度與倍率都會先量化"""
+        angle = self.quantize_angle(angle)
+        scale = self.quantize_scale(scale)
+        return self._get((surface, "rotozoom", angle, scale), lambda: pygame.transform.rotozoom(surface, angle, scale))
+
+    def pregenerate_rotations(self, surface, scales=(1.0,)):
+        """場景載入時預先產生一整組旋轉圖（每個量化角度一張），避免第一次播放時掉幀"""
+        for scale in scales:
+            for i in range(int(360 // self.angle_step)):
+                self.rotozoom(surface, i * self.angle_step, scale)
+
+    def clear(self):
+        self._cache.clear()
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
+
+
+def cached_scale(surface, size, smooth=True):
+    return TransformCache.get_instance().scale(surface, size, smooth)
+
+
+def cached_rotozoom(surface, angle, scale):
+    return TransformCache.get_instance().rotozoom(surface, angle, scale)
@@ -5,6 +5,8 @@ from UI.components.base_scene import BaseScene
 from UI.components.image_button import ImageButton
 import setting
 from UI.components.character_animator import CharacterAnimator
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font
 
 
 class ConfirmScene(BaseScene):
@@ -12,13 +14,13 @@ class ConfirmScene(BaseScene):
         super().__init__(screen)
         self.blurred_bg = pygame.transform.scale(blurred_bg, screen.get_size())
         self.player = player
-        self.message_font = pygame.font.Font(setting.CFONT_PATH, 32)
+        self.message_font = get_font(setting.CFONT_PATH, 32)
         self.message = "人生無法重來"
         self.message2 = "但可以重新投胎"
         self.message3 = "你確定要放棄我了嗎？"
 
 
-        font = pygame.font.Font(setting.CFONT_PATH, 28)
+        font = get_font(setting.CFONT_PATH, 28)
 
         # 小確認框尺寸與位置
         self.box_width, self.box_height = 500, 700
@@ -79,13 +81,13 @@ class ConfirmScene(BaseScene):
             self.screen.blit(self.window_img, self.box_rect.topleft)
 
             # 顯示訊息文字
-            msg_surface = self.message_font.render(self.message, True, (80, 60, 50))
+            msg_surface = render_text(self.message_font, self.message, True, (80, 60, 50))
             msg_rect = msg_surface.get_rect(center=(self.box_rect.left + self.box_width // 2, self.box_rect.top + 180))
             self.screen.blit(msg_surface, msg_rect)
-            msg_surface2 = self.message_font.render(self.message2, True, (80, 60, 50))
+            msg_surface2 = render_text(self.message_font, self.message2, True, (80, 60, 50))
             msg_rect2 = msg_surface2.get_rect(center=(self.box_rect.left + self.box_width // 2, self.box_rect.top + 240))
             self.screen.blit(msg_surface2, msg_rect2)
-            msg_surface3 = self.message_font.render(self.message3, True, (80, 60, 50))
+            msg_surface3 = render_text(self.message_font, self.message3, True, (80, 60, 50))
             msg_rect3 = msg_surface3.get_rect(center=(self.box_rect.left + self.box_width // 2, self.box_rect.top + 300))
             self.screen.blit(msg_surface3, msg_rect3)
 
@@ -99,7 +101,7 @@ class ConfirmScene(BaseScene):
             self.animator.update()
             self.animator.draw(self.screen)
 
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == pygame.QUIT:
                     return "QUIT"
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -109,5 +111,5 @@ class ConfirmScene(BaseScene):
                     elif self.button_no.is_clicked(event):
                         return "BACK"
 
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
\ No newline at end of file
+            self.present()
+            self.tick()
\ No newline at end of file
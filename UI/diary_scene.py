@@ -3,30 +3,49 @@ import asyncio
 from UI.components.base_scene import BaseScene, draw_wrapped_text
 from UI.components.image_button import ImageButton
 import setting
+from UI.components.font_registry import get_font, get_font_style
+from UI.components.text_layout import IncrementalLayout
+from services.advice_tasks import submit_weekly_advice
+from services.advice_scheduler import AdviceScheduler
 
 class DiaryScene(BaseScene):
+    dirty_rects_enabled = True  # 日記內容是靜態的，平常只有角色動畫與按鈕 hover 會變動
+
     def __init__(self, screen, player):
         super().__init__(screen)
-        self.player = player
         self.diary_img = pygame.image.load(setting.ImagePath.DIARY_IMG_PATH).convert_alpha()
         self.diary_img = pygame.transform.smoothscale(self.diary_img, (1200, 1100))
         self.diary_rect = self.diary_img.get_rect(center=(610, 450))
         self.text_rect = pygame.Rect(150, 60, 900, 600)
-        self.font = pygame.font.Font(setting.JFONT_PATH_REGULAR,32)
+        self.font = get_font(setting.JFONT_PATH_REGULAR,32)
         
-        self.week_index = self.player.week_number - 1
-        self.animator = self.player.gif_choose(self.week_index+1,(850, 450), (200, 200))
-        self.total_weeks = len(self.player.event_history)
         self.btn_left = ImageButton(setting.ImagePath.LEFT_PATH, (100, 700), size=(80, 80))
         self.btn_right = ImageButton(setting.ImagePath.RIGHT_PATH, (980, 700), size=(80, 80))
         self.btn_back = ImageButton(setting.ImagePath.BACK_PATH, (90, 20), size=(100, 100))
+        self.advice_font = get_font_style("light")
+        self.advice_hint = get_font_style("hint").render("按 A 生成本週建議", True, (60, 60, 60))
+        self.advice_hint_rect = self.advice_hint.get_rect(topleft=(160, 680))
+        self.advice_rect = pygame.Rect(150, 420, 900, 300)
+        # 串流中的建議：與 draw_wrapped_text 相同的寬度與行高，完成後換回一般繪製時位置不會跳
+        self.advice_layout = IncrementalLayout(self.advice_font, self.advice_rect.width - 20)
+        self.advice_line_height = 36
+
+        self.reset(player)
+
+    def reset(self, player):
+        """每次打開日記都從目前的週數開始，圖片與按鈕沿用"""
+        super().reset(player)
+        self.week_index = self.player.week_number - 1
+        self.animator = self.player.gif_choose(self.week_index+1,(850, 450), (200, 200))
+        self.total_weeks = len(self.player.event_history)
         # Advice toggle
         self.advice_text = None
+        # 背景產生中的建議（同時只會有一個），完成後存到 advice_by_week
+        self._cancel_advice()
+        self.advice_request = None
+        self.advice_week = None
         # reference player's persisted weekly advice
         self.advice_by_week = self.player.weekly_advice
-        self.advice_font = pygame.font.Font(setting.JFONT_PATH_Light, 28)
-        self.advice_hint = pygame.font.Font(setting.JFONT_PATH_REGULAR, 24).render("按 A 生成本週建議", True, (60, 60, 60))
-        self.advice_hint_rect = self.advice_hint.get_rect(topleft=(160, 680))
 
         # if there is prior advice for the current week, display it immediately
         if self.player.event_history:
@@ -34,6 +53,64 @@ class DiaryScene(BaseScene):
             if 0 <= self.week_index < len(sorted_weeks):
                 cur_week = sorted_weeks[self.week_index]
                 self.advice_text = self.advice_by_week.get(cur_week)
+        self._attach_prefetch()
+
+    def _current_week(self):
+        sorted_weeks = sorted(self.player.event_history.keys())
+        if 0 <= self.week_index < len(sorted_weeks):
+            return sorted_weeks[self.week_index]
+        return None
+
+    def _start_advice(self):
+        week = self._current_week()
+        if week is None or self.advice_request is not None:
+            return
+        self.advice_request = submit_weekly_advice(self.player, week)
+        self.advice_week = week
+
+    def _attach_prefetch(self):
+        """這週建議還在背景預先產生中：直接顯示「正在生成」，完成後自動出現"""
+        week = self._current_week()
+        if self.advice_text is None and week is not None and AdviceScheduler.get_instance().pending(self.player, week):
+            self._start_advice()
+
+    def is_animating(self):
+        # 建議產生中（載入動畫、串流文字）才需要全速；否則只有角色動畫與 hover 會變
+        return self.advice_request is not None
+
+    def next_wakeup_ms(self):
+        return self.animator.ms_until_next_frame()
+
+    def _poll_advice(self):
+        if self.advice_request is None:
+            return
+        text = self.advice_request.poll()
+        if text is None:
+            partial = self.advice_request.partial
+            if partial and "AI 建議：\n" + partial != self.advice_layout.text:
+                self.advice_layout.set_text("AI 建議：\n" + partial)
+                self.mark_all_dirty()
+            return
+        if not self.advice_request.failed:
+            # stored in player by generator, keep local view in sync
+            self.advice_by_week[self.advice_week] = text
+        if self._current_week() == self.advice_week:
+            self.advice_text = text
+            self.mark_all_dirty()
+        self.advice_request = None
+        self.advice_week = None
+
+    def _cancel_advice(self):
+        if getattr(self, "advice_request", None) is not None:
+            self.advice_request.cancel()
+
+    def _draw_streaming_advice(self):
+        """畫出串流中已收到的建議，排版與 draw_wrapped_text 相同"""
+        lines = self.advice_layout.lines
+        lh = self.advice_line_height
+        start_y = self.advice_rect.top + (self.advice_rect.height - lh * len(lines)) // 2
+        for i in range(len(lines)):
+            self.advice_layout.draw_line(self.screen, i, (self.advice_rect.left + 20, start_y + i * lh), (20, 20, 70))
 
     def draw(self):
         
@@ -67,9 +144,13 @@ class DiaryScene(BaseScene):
                     )
                 draw_wrapped_text(self.screen, content, self.font, self.text_rect, (50,30,30),48)
         # Advice block
-        if self.advice_text:
-            advice_rect = pygame.Rect(150, 420, 900, 300)
-            draw_wrapped_text(self.screen, "AI 建議：\n" + self.advice_text, self.advice_font, advice_rect, (20,20,70), 36)
+        if self.advice_request is not None and self._current_week() == self.advice_week:
+            if self.advice_request.partial:
+                self._draw_streaming_advice()
+            else:
+                draw_wrapped_text(self.screen, "AI 建議：\n正在生成建議...", self.advice_font, self.advice_rect, (20,20,70), self.advice_line_height)
+        elif self.advice_text:
+            draw_wrapped_text(self.screen, "AI 建議：\n" + self.advice_text, self.advice_font, self.advice_rect, (20,20,70), self.advice_line_height)
         else:
             self.screen.blit(self.advice_hint, self.advice_hint_rect)
         self.animator.draw(self.screen)
@@ -78,20 +159,35 @@ class DiaryScene(BaseScene):
         self.btn_back.draw(self.screen)
 
     async def run(self):
+        try:
+            return await self._run_loop()
+        finally:
+            # 離開日記時不再等待還沒完成的建議
+            self._cancel_advice()
+            self.advice_request = None
+
+    async def _run_loop(self):
         while self.running:
             await asyncio.sleep(0)
+            self._poll_advice()
             self.animator.update()
             self.btn_left.update()
             self.btn_right.update()
             self.btn_back.update()
 
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.mark_dirty(self.animator.get_dirty_rect())
+            for btn in (self.btn_left, self.btn_right, self.btn_back):
+                self.mark_dirty(btn.get_dirty_rect())
+            self.draw_dirty(self.draw)
+            self.present()
+            self.tick()
 
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == pygame.QUIT:
                     self.running = False
+                if event.type == pygame.MOUSEBUTTONDOWN or (event.type == pygame.KEYDOWN and event.key == pygame.K_a):
+                    # 換週或產生建議都會改變整頁內容
+                    self.mark_all_dirty()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     if self.btn_left.rect.collidepoint(event.pos):
                         self.week_index = max(0, self.week_index - 1)
@@ -99,25 +195,17 @@ class DiaryScene(BaseScene):
                         prev_week = sorted_weeks[self.week_index] if sorted_weeks else None
                         self.advice_text = self.advice_by_week.get(prev_week)
                         self.animator = self.player.gif_choose(self.week_index+1, (850, 450), (200, 200))
+                        self._attach_prefetch()
                     elif self.btn_right.rect.collidepoint(event.pos):
                         self.week_index = min(self.total_weeks - 1, self.week_index + 1)
                         sorted_weeks = sorted(self.player.event_history.keys())
                         next_week = sorted_weeks[self.week_index] if sorted_weeks else None
                         self.advice_text = self.advice_by_week.get(next_week)
                         self.animator = self.player.gif_choose(self.week_index+1, (850, 450), (200, 200))
+                        self._attach_prefetch()
                     elif self.btn_back.rect.collidepoint(event.pos):
                         return "BACK"
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_a:
-                    # Lazy import to avoid overhead in gameplay loop
-                    try:
-                        from services.feedback_generator import generate_weekly_advice
-                        sorted_weeks = sorted(self.player.event_history.keys())
-                        if 0 <= self.week_index < len(sorted_weeks):
-                            week = sorted_weeks[self.week_index]
-                            advice = generate_weekly_advice(self.player, week)
-                            # stored in player by generator, keep local view in sync
-                            self.advice_by_week[week] = advice
-                            self.advice_text = advice
-                    except Exception as _:
-                        self.advice_text = "(產生建議失敗，請稍後再試或檢查網路/API 設定)"
+                    # 在背景產生，等待期間動畫與翻頁照常
+                    self._start_advice()
         return None
\ No newline at end of file
@@ -3,7 +3,10 @@ import asyncio
 import sys
 from UI.components.base_scene import BaseScene, wrap_text
 from UI.components.button import Button
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
 import setting
+from services.advice_scheduler import AdviceScheduler
 
 class EventScene(BaseScene):
     def __init__(self, screen, player):
@@ -20,9 +23,9 @@ class EventScene(BaseScene):
         self.title_alpha = 0  # 標題淡入透明度
         self.title_alpha_speed = 20  # 每幀增加多少
 
-        self.font = pygame.font.Font(setting.JFONT_PATH_BOLD, 36)
-        self.title_font = pygame.font.Font(setting.HFONT_PATH,36)
-        self.font_small = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.font = get_font_style("button")
+        self.title_font = get_font_style("event_title")
+        self.font_small = get_font_style("small")
         self.BUTTON_COLOR = (200, 180, 150)
         self.BUTTON_HOVER_COLOR = (255, 220, 180)
         self.BUTTON_TEXT_COLOR = (50, 30, 10)
@@ -61,17 +64,17 @@ class EventScene(BaseScene):
 
     def update(self):
         if self.animating_in:
-            # 緩動滑入
+            # 緩動滑入：每幀（30 FPS）移動 40 像素，依經過的時間換算
             speed = 40
             if self.note_anim_x < self.note_target_x:
-                self.note_anim_x += speed
+                self.note_anim_x += speed * self.dt_frames
                 if self.note_anim_x >= self.note_target_x:
                     self.note_anim_x = self.note_target_x
                     self.animating_in = False
             return  # 動畫時不處理事件
         if len(self.player.week_data["events"]) == 0 :
             return "finished"
-        for event in pygame.event.get():
+        for event in self.poll_events():
             if event.type == pygame.QUIT:
                 self.running = False
             for button in self.buttons:
@@ -99,17 +102,18 @@ class EventScene(BaseScene):
                     event_text = self.event_text.replace('\n', '')
                     # ✅ 新增 event_history 記錄（使用 dict，key 為 week_number）
                     if self.player.week_number != 8 and self.player.week_number != 16 :
-                            
                         self.player.event_history[self.player.week_number] = {
-                        "event_text": event_text,
-                        "option_text": self.player.week_data["events"]["options"][button[1]]["text"],
-                        "changes": {
-                            "mood": self.player.last_week_change[0],
-                            "energy": self.player.last_week_change[1],
-                            "social": self.player.last_week_change[2],
-                            "knowledge": self.player.last_week_change[3]
+                            "event_text": event_text,
+                            "option_text": self.player.week_data["events"]["options"][button[1]]["text"],
+                            "changes": {
+                                "mood": self.player.last_week_change[0],
+                                "energy": self.player.last_week_change[1],
+                                "social": self.player.last_week_change[2],
+                                "knowledge": self.player.last_week_change[3]
+                            }
                         }
-                }
+                        # 這週的資料都齊了，先在背景產生建議，打開日記時就不用等
+                        AdviceScheduler.get_instance().prefetch_weekly(self.player, self.player.week_number)
                     return "finished"
 
 
@@ -134,7 +138,7 @@ class EventScene(BaseScene):
         
         
         # 畫標題
-        title_surface = self.title_font.render(self.title, True, (60, 179, 133))
+        title_surface = render_text(self.title_font, self.title, True, (60, 179, 133))
         # 建立一個有 alpha 的 surface
         title_alpha_surface = pygame.Surface(title_surface.get_size(), pygame.SRCALPHA)
         title_alpha_surface.blit(title_surface, (0, 0))
@@ -142,7 +146,7 @@ class EventScene(BaseScene):
         title_rect = title_surface.get_rect()
         title_rect.topleft = (350 + text_offset_x, 160)
         self.screen.blit(title_alpha_surface, title_rect)
-        self.screen.blit(self.title_font.render(self.title, True, (60, 179, 133)), (350 + text_offset_x, 140))
+        self.screen.blit(title_surface, (350 + text_offset_x, 140))
         
         # 按鈕滑入
         for i, button in enumerate(self.buttons):
@@ -159,7 +163,7 @@ class EventScene(BaseScene):
         line_spacing = 10
         line_height = font.get_linesize()
         for line in lines:
-            txt_surf = font.render(line, True, color)
+            txt_surf = render_text(font, line, True, color)
             surface.blit(txt_surf, (x, y))
             y += line_height + line_spacing
 
@@ -168,11 +172,12 @@ class EventScene(BaseScene):
             await asyncio.sleep(0)
             result = None
             result = self.update()
+            self.profiler.mark("update")
             if result is not None:
                 print(f"Scene result: {result}")
                 return result
                 
             self.draw()
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.present()
+            self.tick()
         return None
\ No newline at end of file
@@ -1,11 +1,15 @@
 from UI.components.base_scene import BaseScene
 import asyncio
 import setting
+from UI.components.font_registry import get_font, get_font_style
+from UI.components.layer_compositor import LayerCompositor
 from UI.components.character_animator import CharacterAnimator
 import pygame
 from UI.components.audio_manager import AudioManager
 
 class FeedbackScene(BaseScene):
+    dirty_rects_enabled = True  # 遮罩淡入後只有兩隻角色動畫會變動
+
     def __init__(self, screen, player):
         super().__init__(screen)
         self.player = player
@@ -14,9 +18,11 @@ class FeedbackScene(BaseScene):
         self.background = pygame.transform.scale(self.background, self.screen.get_size())
         self.background.set_alpha(100)
 
-        # 背景黑色遮罩
-        self.overlay_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        # 背景黑色遮罩：與背景預先合成（原本直接疊在上一幀畫面上，這裡以黑底近似）
         self.overlay_alpha = 0
+        self.backdrop = LayerCompositor(screen.get_size(), base_color=(0, 0, 0))
+        self.backdrop.add_layer("background", self.background)
+        self.backdrop.add_fill("overlay", (0, 0, 0, self.overlay_alpha))
 
         # QRcode圖片
         self.qrcode_image = pygame.image.load(setting.ImagePath.FEEDBACK_PATH).convert_alpha()
@@ -33,11 +39,11 @@ class FeedbackScene(BaseScene):
 
         # 提示詞
         self.prompt_text = "(按下 Enter 鍵返回)"
-        self.prompt_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.prompt_font = get_font_style("small")
         self.prompt_surface = self.prompt_font.render(self.prompt_text, True, (255, 255, 255))
         self.prompt_rect = self.prompt_surface.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() - 50))
 
-        self.title_font = pygame.font.Font(setting.CFONT_PATH,  72)
+        self.title_font = get_font(setting.CFONT_PATH,  72)
         self.title_text = "Give Us Your Feedback!"
         self.title_surface = self.title_font.render(self.title_text, True, (255, 255, 255))
         self.title_rect = self.title_surface.get_rect(topleft = (100, 40))
@@ -46,18 +52,24 @@ class FeedbackScene(BaseScene):
         self.animator.update()
         self.animator2.update()
 
-        # 透明遮罩淡入
+        # 透明遮罩淡入：淡入期間整張重畫
         if self.overlay_alpha < 140:
-            self.overlay_alpha = min(255, self.overlay_alpha + 5)
-        self.overlay_surface.fill((0, 0, 0, self.overlay_alpha))
+            self.overlay_alpha = min(255, self.overlay_alpha + 5 * self.dt_frames)
+            self.backdrop.set_alpha("overlay", int(self.overlay_alpha))
+            self.mark_all_dirty()
+        self.mark_dirty(self.animator.get_dirty_rect())
+        self.mark_dirty(self.animator2.get_dirty_rect())
+
+    def is_animating(self):
+        return self.overlay_alpha < 140  # 遮罩淡入完成後只剩兩隻角色動畫
+
+    def next_wakeup_ms(self):
+        return min(self.animator.ms_until_next_frame(), self.animator2.ms_until_next_frame())
 
     def draw(self, screen):
-        # 1. 畫背景
-        screen.blit(self.background, (0, 0))
-        # 2. 畫半透明黑幕
-        self.overlay_surface.fill((0, 0, 0, self.overlay_alpha))  # 這行很重要
-        screen.blit(self.overlay_surface, (0, 0))
-        # 3. 畫其他內容
+        # 1. 畫背景與半透明黑幕
+        self.backdrop.draw(screen)
+        # 2. 畫其他內容
         screen.blit(self.qrcode_image, self.qrcode_rect)
         self.animator.draw(screen)
         self.animator2.draw(screen)
@@ -68,7 +80,7 @@ class FeedbackScene(BaseScene):
         self.running = True
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == pygame.QUIT:
                     self.running = False
                 elif event.type == pygame.KEYDOWN:
@@ -77,5 +89,7 @@ class FeedbackScene(BaseScene):
                         return
 
             self.update()
-            self.draw(self.screen)
-            pygame.display.flip()
\ No newline at end of file
+            self.profiler.mark("update")
+            self.draw_dirty(lambda: self.draw(self.screen))
+            self.present()
+            self.tick()
\ No newline at end of file
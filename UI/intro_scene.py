@@ -2,6 +2,8 @@ import pygame
 from UI.components.character_animator import CharacterAnimator
 from UI.components.base_scene import BaseScene
 from UI.components.audio_manager import AudioManager
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
 import setting
 import asyncio
 
@@ -13,12 +15,14 @@ class IntroScene(BaseScene):
         self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
         self.background = pygame.transform.scale(self.background, self.screen.get_size())
         self.background.set_alpha(100)
-        self.overlay_surface = pygame.Surface(screen.get_size()).convert_alpha()
+        # 黑色遮罩只填一次，淡入時改 set_alpha（內容不變，內部解析度縮小時可以沿用縮小版）
+        self.overlay_surface = pygame.Surface(screen.get_size()).convert()
+        self.overlay_surface.fill((0, 0, 0))
         self.overlay_alpha = 0
 
         # 字型設定
-        self.font = pygame.font.Font(setting.JFONT_PATH_BOLD, 36)
-        self.font_desc = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.font = get_font_style("button")
+        self.font_desc = get_font_style("small")
 
         self.text_lines = [
             "歡迎來到模擬人生大學版",
@@ -32,8 +36,8 @@ class IntroScene(BaseScene):
         self.line_index = 0            # 目前正在顯示哪一行
         self.char_index = 0            # 該行目前顯示到第幾個字
         self.reveal_lines = []         # 每一行目前顯示的內容
-        self.frame_count = 0             # 用於控制打字速度
-        self.type_speed = 3             # 控制打字速度，數字越小越快
+        self.char_interval = 100         # 每個字出現的間隔（毫秒），數字越小越快
+        self.type_elapsed = 0            # 還沒用掉的打字時間（毫秒）
         for _ in self.text_lines:
             self.reveal_lines.append("")
 
@@ -47,13 +51,14 @@ class IntroScene(BaseScene):
         self.running = True
         while self.running:
             await asyncio.sleep(0)
-            self.clock.tick(self.FPS)
-            for event in pygame.event.get():
+            self.tick()
+            for event in self.poll_events():
                 self.handle_event(event)
 
             self.update()
+            self.profiler.mark("update")
             self.draw(self.screen)
-            pygame.display.update()
+            self.present()
 
         self.audio.stop_sound(setting.SoundEffect.TYPING_PATH)  # 保險：離開場景時也停止打字音效
 
@@ -76,19 +81,22 @@ class IntroScene(BaseScene):
                     self.animator.reset()
 
     def update(self):
-        self.frame_count += 1
-
         if self.overlay_alpha < 200:
-            self.overlay_alpha += 4
-            
-        if self.line_index < len(self.text_lines) and self.frame_count % self.type_speed == 0:
+            self.overlay_alpha = min(200, self.overlay_alpha + 4 * self.dt_frames)
+
+        if self.line_index < len(self.text_lines):
+            self.type_elapsed += self.dt
+        if self.line_index < len(self.text_lines) and self.type_elapsed >= self.char_interval:
             # 重複播放音效
             if self.line_index == 0 and self.char_index == 0:
                 self.audio.play_sound(setting.SoundEffect.TYPING_PATH)
             
             if self.audio.is_sound_playing(setting.SoundEffect.TYPING_PATH) is False:
                 self.audio.play_sound(setting.SoundEffect.TYPING_PATH)
-                
+
+        # 依經過的時間打字，掉幀時一次補上落後的字
+        while self.line_index < len(self.text_lines) and self.type_elapsed >= self.char_interval:
+            self.type_elapsed -= self.char_interval
             current_line = self.text_lines[self.line_index]
             if self.char_index < len(current_line):
                 self.reveal_lines[self.line_index] += current_line[self.char_index]
@@ -107,17 +115,17 @@ class IntroScene(BaseScene):
 
     def draw(self, screen):
         screen.blit(self.background, (0, 0))
-        self.overlay_surface.fill((0, 0, 0, self.overlay_alpha))
+        self.overlay_surface.set_alpha(int(self.overlay_alpha))
         screen.blit(self.overlay_surface, (0, 0))
 
         y = 150
         for line in self.reveal_lines:
-            rendered = self.font.render(line, True, (255, 255, 255))
+            rendered = render_text(self.font, line, True, (255, 255, 255))
             screen.blit(rendered, (100, y))
             y += 75
 
         if self.line_index >= len(self.text_lines):
-            hint = self.font.render("按 Enter 返回", True, (200, 200, 200))
+            hint = render_text(self.font, "按 Enter 返回", True, (200, 200, 200))
             screen.blit(hint, (self.SCREEN_WIDTH - 300, self.SCREEN_HEIGHT - 60))
 
         self.animator.draw(screen)
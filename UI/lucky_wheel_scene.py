@@ -4,18 +4,38 @@ import math
 import random
 from UI.components.base_scene import BaseScene
 import setting
+from UI.components.font_registry import get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.render_target import draw_circle
+from UI.components.text_cache import render_text
 
 '''Example usage:
     
     options1 = ["超可愛學姐\n帥潮學長", "看起來是系邊\n有點宅宅的學長", "超搞笑的系核\n第一次見面\n就表演倒立走路", "卷哥卷姐", "被放生了"]
 
     wheel = LuckyWheelScene(screen, options1)
-    result = wheel.run()
+    result = await wheel.run()
     print(f"轉盤結果: {result}")
 
 '''
 
 class LuckyWheelScene(BaseScene):
+    # 馬卡龍色系
+    PASTEL_COLORS = [
+        (255, 179, 186),  # 粉紅
+        (255, 223, 186),  # 淡橙
+        (255, 255, 186),  # 淡黃
+        (186, 255, 201),  # 淡綠
+        (186, 225, 255),  # 淡藍
+        (218, 198, 255),  # 淡紫
+        (255, 198, 255),  # 淡粉紫
+        (255, 246, 196),  # 淡米
+    ]
+    FACE_COLORKEY = (255, 0, 255)  # 轉盤面外圍的透明色
+    ANGLE_STEP = 10                # 預先旋轉的角度解析度（度）：一整圈 36 張，每張裁成轉盤面大小約 1.4MB
+    SPIN_DECAY = 0.98              # 每幀（30 FPS）轉速剩下的比例
+    MIN_SPIN_SPEED = 0.5           # 轉速（度 / 幀）低於這個值就停下
+
     def __init__(self, screen, options):
         super().__init__(screen)
         self.options = options
@@ -24,8 +44,8 @@ class LuckyWheelScene(BaseScene):
         self.angle = 0
         self.spin_speed = 0
         self.is_spinning = False
-        self.font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 48)
-        self.font_desc = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.font = get_font_style("subtitle")
+        self.font_desc = get_font_style("small")
         self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
         self.background = pygame.transform.scale(self.background, self.screen.get_size())
         self.background.set_alpha(100)
@@ -34,6 +54,24 @@ class LuckyWheelScene(BaseScene):
         self.result_text = None
         self.glow_phase = 0
 
+        # Glow effect：glow_phase 固定，光暈只需畫一次，與白底、背景一起預先合成
+        glow_color = (255, 255, 100, int(128 + 127 * math.sin(self.glow_phase)))
+        glow_surface = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
+        pygame.draw.circle(glow_surface, glow_color, self.center, self.wheel_radius + 10)
+        self.backdrop = LayerCompositor(self.screen.get_size())
+        self.backdrop.add_layer("background", self.background)
+        self.backdrop.add_layer("glow", glow_surface)
+
+        # 指針（三角形）也只建立一次
+        pointer_alpha = 255  # 固定不閃爍
+        self.pointer_surface = pygame.Surface((30, 40), pygame.SRCALPHA)
+        pygame.draw.polygon(self.pointer_surface, (250, 100, 100, pointer_alpha), [(15, 0), (0, 40), (30, 40)])
+        self.pointer_pos = (self.center[0] - 15, self.center[1] - self.button_radius - 30)
+
+        # 轉盤面只畫一次，載入時就依固定角度解析度轉好一整圈；轉動時只挑一張 blit，不再旋轉
+        self.wheel_face = self._render_wheel_face()
+        self.wheel_frames = self._render_wheel_frames()
+
     def handle_event(self, event):
         if event.type == pygame.QUIT:
             self.running = False
@@ -56,106 +94,105 @@ class LuckyWheelScene(BaseScene):
 
     def update(self):
         if self.is_spinning:
-            self.angle += self.spin_speed
-            
-            self.spin_speed *= 0.98
-            if self.spin_speed < 0.5:
+            # 依經過的時間推進：n 幀的轉動量是等比級數 speed * (1 - r^n) / (1 - r)；
+            # 最多推進到轉速降到 MIN_SPIN_SPEED 的那一刻，不論實際幀率多少，同樣的初速停在同樣的角度
+            frames_left = math.log(self.MIN_SPIN_SPEED / self.spin_speed) / math.log(self.SPIN_DECAY)
+            frames = min(self.dt_frames, frames_left)
+            decay = self.SPIN_DECAY ** frames
+            self.angle += self.spin_speed * (1 - decay) / (1 - self.SPIN_DECAY)
+            self.spin_speed *= decay
+            if frames >= frames_left:
                 self.spin_speed = 0
                 self.is_spinning = False
                 self.calculate_result()
 
 
     def calculate_result(self):
+        # 指針在正上方：直接由（與畫面相同量化後的）角度算出指到哪一格
         n = len(self.options)
         degrees_per_segment = 360 / n
-        start_angle = [((i+1) * degrees_per_segment+self.angle) for i in range(n)]
-        end_angle = [(i * degrees_per_segment+self.angle) for i in range(n)]
-        for i in range(n):
-            start_angle[i] = start_angle[i] % 360
-            end_angle[i] = end_angle[i] % 360
-            if end_angle[i] - start_angle[i] > degrees_per_segment+5:
-                index = i
+        rotation = self._frame_index() * self.ANGLE_STEP
+        index = int(rotation // degrees_per_segment) % n
         self.result_text = self.options[index]
 
-    def draw(self):
-        
-        self.screen.fill((255, 255, 255))
-        self.screen.blit(self.background, (0, 0))
+    def _render_wheel_face(self):
+        """把扇形、選項文字與外框畫在一張 surface 上（角度 0），之後只需旋轉"""
+        r = self.wheel_radius
+        size = 2 * r + 2
+        c = (r + 1, r + 1)
+        face = pygame.Surface((size, size)).convert()
+        face.fill(self.FACE_COLORKEY)
+        face.set_colorkey(self.FACE_COLORKEY)
 
         n = len(self.options)
         degrees_per_segment = 360 / n
-
-        # Glow effect
-        glow_color = (255, 255, 100, int(128 + 127 * math.sin(self.glow_phase)))
-        glow_surface = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, glow_color, self.center, self.wheel_radius + 10)
-        self.screen.blit(glow_surface, (0, 0))
-
-         # 馬卡龍色系
-        pastel_colors = [
-            (255, 179, 186),  # 粉紅
-            (255, 223, 186),  # 淡橙
-            (255, 255, 186),  # 淡黃
-            (186, 255, 201),  # 淡綠
-            (186, 225, 255),  # 淡藍
-            (218, 198, 255),  # 淡紫
-            (255, 198, 255),  # 淡粉紫
-            (255, 246, 196),  # 淡米
-        ]
-
-
         for i in range(n):
-            start_angle_deg = self.angle + i * degrees_per_segment-90
-            end_angle_deg = self.angle + (i + 1) * degrees_per_segment-90
+            start_angle_deg = i * degrees_per_segment-90
+            end_angle_deg = (i + 1) * degrees_per_segment-90
 
             start_angle = math.radians(start_angle_deg)
             end_angle = math.radians(end_angle_deg)
             mid_angle = math.radians((start_angle_deg + end_angle_deg) / 2)
 
-            color = pastel_colors[i % len(pastel_colors)]  # 使用馬卡龍色
+            color = self.PASTEL_COLORS[i % len(self.PASTEL_COLORS)]  # 使用馬卡龍色
 
             # Use filled arc via polygon method
-            points = [self.center]
+            points = [c]
             for step in range(10):
                 angle = start_angle + (end_angle - start_angle) * (step / 9)
-                x = self.center[0] + self.wheel_radius * math.cos(angle)
-                y = self.center[1] + self.wheel_radius * math.sin(angle)
+                x = c[0] + r * math.cos(angle)
+                y = c[1] + r * math.sin(angle)
                 points.append((x, y))
 
-            pygame.draw.polygon(self.screen, color, points)
+            pygame.draw.polygon(face, color, points)
 
             # Draw text (support multi-line)
-            tx = self.center[0] + (self.wheel_radius * 0.6) * math.cos(mid_angle)
-            ty = self.center[1] + (self.wheel_radius * 0.6) * math.sin(mid_angle)
+            tx = c[0] + (r * 0.6) * math.cos(mid_angle)
+            ty = c[1] + (r * 0.6) * math.sin(mid_angle)
             lines = self.options[i].splitlines() if self.options[i] else []
             for j, line in enumerate(lines):
-                text_surface = self.font_desc.render(line, True, (0, 0, 0))
+                text_surface = render_text(self.font_desc, line, True, (0, 0, 0))
                 text_rect = text_surface.get_rect(center=(tx, ty + j * 30))
-                self.screen.blit(text_surface, text_rect)
+                face.blit(text_surface, text_rect)
 
         # Draw wheel outline
-        pygame.draw.circle(self.screen, (110, 110, 110), self.center, self.wheel_radius, 4)
+        pygame.draw.circle(face, (110, 110, 110), c, r, 4)
+        return face
+
+    def _render_wheel_frames(self):
+        """每 ANGLE_STEP 度一張旋轉後的轉盤面（pygame 的 rotate 是逆時針）"""
+        frames = []
+        for i in range(360 // self.ANGLE_STEP):
+            rotated = pygame.transform.rotate(self.wheel_face, i * self.ANGLE_STEP)
+            # 圓形轉盤轉完仍在原本的正方形內，裁掉四角多出來的透明色
+            crop = self.wheel_face.get_rect(center=rotated.get_rect().center)
+            frames.append(rotated.subsurface(crop).copy())
+        return frames
+
+    def _frame_index(self):
+        """目前角度對應的影格；畫面上的角度越大越順時針，所以取負號"""
+        return round(-self.angle / self.ANGLE_STEP) % len(self.wheel_frames)
+
+    def draw(self):
+        
+        self.backdrop.draw(self.screen)
+
+        # 轉盤：挑最接近目前角度的預先旋轉影格
+        wheel = self.wheel_frames[self._frame_index()]
+        self.screen.blit(wheel, wheel.get_rect(center=self.center))
 
         # Draw center button as circle
-        pygame.draw.circle(self.screen, (250, 100, 100), self.center, self.button_radius)
-        button_text = self.font.render("抽獎", True, (255, 255, 255))
+        draw_circle(self.screen, (250, 100, 100), self.center, self.button_radius)
+        button_text = render_text(self.font, "抽獎", True, (255, 255, 255))
         text_rect = button_text.get_rect(center=self.center)
         self.screen.blit(button_text, text_rect)
 
         # Draw blinking pointer (triangle)
-        pointer_alpha = 255  # 固定不閃爍
-        pointer_surface = pygame.Surface((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.SRCALPHA)
-        pointer = [
-            (self.center[0], self.center[1] - self.button_radius  - 30),
-            (self.center[0] - 15, self.center[1] - self.button_radius +10),
-            (self.center[0] + 15, self.center[1] - self.button_radius +10)
-        ]
-        pygame.draw.polygon(pointer_surface, (250, 100, 100, pointer_alpha), pointer)
-        self.screen.blit(pointer_surface, (0, 0))
+        self.screen.blit(self.pointer_surface, self.pointer_pos)
 
 
         if self.result_text:
-            tip = self.font.render("（點擊以結束）", True, (150, 150, 150))
+            tip = render_text(self.font, "（點擊以結束）", True, (150, 150, 150))
             self.screen.blit(tip, (self.screen.get_width() // 2 - tip.get_width() // 2, 730))
             
             result_lines = ["抽中"] + self.result_text.splitlines()
@@ -163,7 +200,7 @@ class LuckyWheelScene(BaseScene):
             base_x = 950
             base_y = 600
             for j, line in enumerate(result_lines):
-                result_surface = self.font_desc.render(line, True, (0, 0, 0))
+                result_surface = render_text(self.font_desc, line, True, (0, 0, 0))
                 result_rect = result_surface.get_rect(center=(base_x, base_y + j * 32))
                 self.screen.blit(result_surface, result_rect)
                 
@@ -172,10 +209,9 @@ class LuckyWheelScene(BaseScene):
     
     async def run(self):
         self.running = True
-        clock = pygame.time.Clock()
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == pygame.QUIT:
                     self.running = False
                 else:
@@ -184,9 +220,10 @@ class LuckyWheelScene(BaseScene):
                 if self.result_text and (event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.KEYDOWN):
                     self.running = False
             self.update()
+            self.profiler.mark("update")
             self.draw()
-            pygame.display.flip()
-            clock.tick(self.FPS)
+            self.present()
+            self.tick()
           
             
         return self.result_text
\ No newline at end of file
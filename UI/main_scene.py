@@ -9,6 +9,11 @@ from UI.components.audio_manager import AudioManager
 from UI.components.base_scene import BaseScene
 from UI.components.floating_emoji import FloatingEmoji
 from UI.components.speech_bubble import SpeechBubble
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.transform_cache import cached_scale
+from UI.components.stat_panel import StatPanel, stats_change
 import setting
 #Json,attribute : ["rest", "play_game", "social", "study"]
 
@@ -16,12 +21,9 @@ class MainScene(BaseScene):
     def __init__(self, screen, player):
         super().__init__(screen)
         self.player = player
-        self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
-        self.background = pygame.transform.scale(self.background, self.screen.get_size())
-        self.player = player
-        self.animator = self.player.gif_choose(self.player.week_number)
-            
-        font = pygame.font.Font(setting.JFONT_PATH_BOLD, 36)
+        self._build_backdrop()
+
+        font = get_font_style("button")
         self.next_week_button = Button(
             self.SCREEN_WIDTH - 200, self.SCREEN_HEIGHT - 100,
             180, 60," 下一週", font, (200, 200, 250),(50, 50, 50) ,(180, 180, 180))
@@ -32,29 +34,13 @@ class MainScene(BaseScene):
         self.excl_img = pygame.transform.smoothscale(excl_img, (175, 175))
         self.excl_rect = self.excl_img.get_rect(center=(400, 400))
         self.excl_mask = pygame.mask.from_surface(self.excl_img)
-        self.is_hover = False
         self.hover_scale = 1.1
-        self.speech_bubble = None  # 用於顯示事件說明的氣泡
         
 
 
-        self.stats_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
-        self.bar_width = 150
-        self.bar_height = 20
-        self.bar_gap = 10
-        self.bar_colors = {
-            "intelligence": (135, 206, 250),  # 淺藍
-            "mood":         (255, 182, 193),  # 粉紅
-            "energy":       (144, 238, 144),  # 淺綠
-            "social":       (255, 165, 0),    # 橘色
-            "knowledge":    (221, 160, 221)    # 紫色
-        }
-
-
         self.set_icon = pygame.image.load(setting.ImagePath.SET_PATH).convert_alpha()
         self.set_icon = pygame.transform.smoothscale(self.set_icon, (80, 80))
         self.set_rect = self.set_icon.get_rect(topleft=(1100, 20))
-        self.set_hover = False
 
         # 表情圖初始化
         self.emoji_paths = [
@@ -81,9 +67,7 @@ class MainScene(BaseScene):
         self.emoji_surfaces = [pygame.image.load(p).convert_alpha() for p in self.emoji_paths]
         self.emoji_surfaces = [pygame.transform.smoothscale(img, (90, 90)) for img in self.emoji_surfaces]
         self.emoji_rects = []
-        self.emoji_clicked_frames = [0] * len(self.emoji_surfaces)  # 點擊動畫持續幀數
         self.emoji_frame_max = 3  # 點擊放大的持續幀數
-        self.floating_emojis = []
         self.emoji_mask = [pygame.mask.from_surface(img) for img in self.emoji_surfaces]
         self.floating_emoji_surfaces = [pygame.image.load(p).convert_alpha() for p in self.floating_emoji_paths]
 
@@ -91,7 +75,34 @@ class MainScene(BaseScene):
         self.diary_icon = pygame.image.load(setting.ImagePath.NOTEBOOK_PATH).convert_alpha()
         self.diary_icon = pygame.transform.smoothscale(self.diary_icon, (90, 90))
         self.diary_rect = self.diary_icon.get_rect(topleft=(980, 15))
+        self.anim_click_timeout = 2000  # 2秒後回到基礎動畫
+
+        self._bind_player(player)
+
+    def _build_backdrop(self):
+        """背景 + 數值面板底色預先合成；EndScene 覆寫成結算用的版本，兩邊都只建一次"""
+        self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
+        self.background = pygame.transform.scale(self.background, self.screen.get_size())
+        self.stat_panel = StatPanel(self.player)
+        self.backdrop = LayerCompositor(self.screen.get_size())
+        self.backdrop.add_layer("background", self.background)
+        self.backdrop.add_draw("stat_panel_bg", self.stat_panel.draw_background)
+
+    def reset(self, player):
+        """換週或重新開始時重複使用同一個場景：素材保留，只重設與玩家、週數有關的狀態"""
+        super().reset(player)
+        self._bind_player(player)
+
+    def _bind_player(self, player):
+        self.player = player
+        self.stat_panel.player = player
+        self.animator = self.player.gif_choose(self.player.week_number)
+        self.is_hover = False
+        self.speech_bubble = None  # 用於顯示事件說明的氣泡
+        self.set_hover = False
         self.diary_hover = False
+        self.emoji_clicked_frames = [0] * len(self.emoji_surfaces)  # 點擊動畫持續幀數
+        self.floating_emojis = []
 
         # 角色動畫互動
         self.character_rect = self.animator.get_rect()
@@ -103,7 +114,6 @@ class MainScene(BaseScene):
         ]
         self.current_anim_level = 0
         self.last_anim_click_time = 0
-        self.anim_click_timeout = 2000  # 2秒後回到基礎動畫
 
     def draw_emoji(self):
         self.emoji_rects = []
@@ -134,7 +144,7 @@ class MainScene(BaseScene):
                 scale = 1.0
 
             new_size = int(90 * scale)
-            scaled_img = pygame.transform.smoothscale(self.emoji_surfaces[i], (new_size, new_size))
+            scaled_img = cached_scale(self.emoji_surfaces[i], (new_size, new_size))
             new_rect = scaled_img.get_rect(center=rect.center)
             self.screen.blit(scaled_img, new_rect.topleft)
         
@@ -144,96 +154,10 @@ class MainScene(BaseScene):
 
 
     def draw_player_stats(self):
-
-        stats_bg = pygame.Surface((480, 250), pygame.SRCALPHA)
-        stats_bg.fill((255, 255, 255, 180))  # 180 可調整透明度，0~255
-
-        # 貼到主畫面
-        self.screen.blit(stats_bg, (20, 50))
-
-        # 畫邊框
-        pygame.draw.rect(self.screen, (100, 100, 100), (20, 50, 480, 250), 2)
-
-        stats = {
-            "intelligence": self.player.intelligence,
-            "mood": self.player.mood,
-            "energy": self.player.energy,
-            "social": self.player.social,
-            "knowledge": self.player.knowledge
-        }
-
-        font = self.stats_font
-        x_left = 30
-        x_right = x_left + self.bar_width + 80
-        y_start = 180
-        bar_height = self.bar_height
-        bar_width = self.bar_width
-        gap_y = self.bar_gap
-        label_offset = -5  # 調整文字與條的對齊
-
-        # 印出玩家的頭像
-        player_imaage = pygame.image.load(self.player.header).convert_alpha()
-        player_image = pygame.transform.smoothscale(player_imaage, (100, 100))
-        player_rect = player_image.get_rect(topleft=(40, 60))
-        self.screen.blit(player_image, player_rect)
-        # 印出玩家的名字
-        name_label = font.render(self.player.chname + " " + self.player.name, True, (0, 0, 0))
-        name_rect = name_label.get_rect(topleft=(160, 80))
-        self.screen.blit(name_label, name_rect)
-        # 印出玩家的週數
-        week_label = font.render(f"第 {self.player.week_number} 週", True, (0, 0, 0))
-        week_rect = week_label.get_rect(topleft=(160, 120))
-        self.screen.blit(week_label, week_rect)
-
-        # 第一排：intelligence / mood
-        for i, key in enumerate(["intelligence", "mood"]):
-            x = x_left if i == 0 else x_right
-            y = y_start
-            fill = max(0, min(1, stats[key] / 100))
-            pygame.draw.rect(self.screen, (200, 200, 200), (x + 65, y, bar_width, bar_height), 2)
-            pygame.draw.rect(self.screen, self.bar_colors[key], (x + 65, y, int(bar_width * fill), bar_height))
-            label = font.render(f"智力 {self.player.intelligence}" if key == "intelligence" else f"心情 {self.player.mood}", True, (0, 0, 0))
-            self.screen.blit(label, (x, y + label_offset))
-
-        # 第二排：energy / social
-        for i, key in enumerate(["energy", "social"]):
-            x = x_left if i == 0 else x_right
-            y = y_start + bar_height + gap_y +10
-            fill = max(0, min(1, stats[key] / 100))
-            pygame.draw.rect(self.screen, (200, 200, 200), (x + 65, y, bar_width, bar_height), 2)
-            pygame.draw.rect(self.screen, self.bar_colors[key], (x + 65, y, int(bar_width * fill), bar_height))
-            label = font.render(f"體力 {self.player.energy}" if key == "energy" else f"社交 {self.player.social}", True, (0, 0, 0))
-            self.screen.blit(label, (x, y + label_offset))
-        
-        # 第三排：knowledge（橫跨兩個 bar）
-        y = y_start + 2 * (bar_height + gap_y) + 20
-        x = x_left
-        total_width = (x_right - x_left) + 130 + bar_width  # 橫跨兩欄
-        fill = max(0, min(1, stats["knowledge"] / 100))
-        pygame.draw.rect(self.screen, (200, 200, 200), (x + 65, y, total_width - 130, bar_height), 2)
-        pygame.draw.rect(self.screen, self.bar_colors["knowledge"], (x + 65, y, int((total_width - 130) * fill), bar_height))
-        label = font.render(f"知識 {self.player.knowledge:.0f}/100", True, (0, 0, 0))
-        self.screen.blit(label, (x, y + label_offset))
-
+        # 面板底色與邊框已預先合成在 self.backdrop 中，內容只在數值改變時重畫
         if self.player.week_number == 8 or self.player.week_number == 16:
-            self.player.last_week_change = [0, 0, 0, 0]  
-
-
-        if self.player.week_number > 0:
-            # 印出玩家選擇改變
-            last_week_change = stats_change(self.player.last_week_change)
-            font2 = pygame.font.Font(setting.JFONT_PATH_Light, 22)
-            text0 = font2.render("本週選擇改變：", True, (0, 0, 0))
-            text0_rect = text0.get_rect(topleft=(x_right + 60, 90))
-            self.screen.blit(text0, text0_rect)
-            # 心情，知識
-            text1 = font2.render(f"心情 {last_week_change[0]} 知識 {last_week_change[3]}", True, (0, 0, 0))
-            text1_rect = text1.get_rect(topleft=(x_right + 60, 115))
-            self.screen.blit(text1, text1_rect)
-            # 體力，社交
-            text2 = font2.render(f"體力 {last_week_change[1]} 社交 {last_week_change[2]}", True, (0, 0, 0))
-            text2_rect = text2.get_rect(topleft=(x_right + 60, 140))
-            self.screen.blit(text2, text2_rect)
+            self.player.last_week_change = [0, 0, 0, 0]
+        self.stat_panel.draw(self.screen)
 
     def _switch_anim_level(self, level):
         if level == self.current_anim_level:
@@ -267,7 +191,7 @@ class MainScene(BaseScene):
 
         
     def draw(self):
-        self.screen.blit(self.background, (0, 0))
+        self.backdrop.draw(self.screen)
         self.animator.draw(self.screen)
         self.next_week_button.draw(self.screen)
         self.draw_player_stats()
@@ -275,7 +199,7 @@ class MainScene(BaseScene):
 
         # 畫設定按鈕
         if self.set_hover:
-            scaled = pygame.transform.scale(self.set_icon, (96, 96))
+            scaled = cached_scale(self.set_icon, (96, 96), smooth=False)
             rect = scaled.get_rect(center=self.set_rect.center)
             self.screen.blit(scaled, rect.topleft)
         else:
@@ -283,7 +207,7 @@ class MainScene(BaseScene):
             
         # 畫事件泡泡
         if self.is_hover:
-            scaled_img = pygame.transform.smoothscale(
+            scaled_img = cached_scale(
                 self.excl_img,
                 (int(self.excl_img.get_width() * self.hover_scale),
                     int(self.excl_img.get_height() * self.hover_scale))
@@ -307,9 +231,11 @@ class MainScene(BaseScene):
             scale = base_scale
 
         # ====== 計算縮放後的位置並繪製 ======
+        # 倍率取到小數第二位，快取中最多只會有幾十種尺寸
+        scale = round(scale, 2)
         new_width = int(self.excl_img.get_width() * scale)
         new_height = int(self.excl_img.get_height() * scale)
-        scaled_img = pygame.transform.smoothscale(self.excl_img, (new_width, new_height))
+        scaled_img = cached_scale(self.excl_img, (new_width, new_height))
         scaled_rect = scaled_img.get_rect(center=self.excl_rect.center)
         
         self.screen.blit(scaled_img, scaled_rect)
@@ -317,7 +243,7 @@ class MainScene(BaseScene):
         # diary icon hover 放大
         if self.player.week_number != 0:
             if self.diary_hover:
-                scaled = pygame.transform.scale(self.diary_icon, (100, 100))
+                scaled = cached_scale(self.diary_icon, (100, 100), smooth=False)
                 rect = scaled.get_rect(center=self.diary_rect.center)
                 self.screen.blit(scaled, rect.topleft)
             else:
@@ -336,7 +262,7 @@ class MainScene(BaseScene):
         self._reset_animation_if_idle(now)
 
         for emoji in self.floating_emojis:
-            emoji.update()
+            emoji.update(self.dt_frames)
         # 清掉過期的
         self.floating_emojis = [e for e in self.floating_emojis if not e.is_expired()]
 
@@ -381,7 +307,7 @@ class MainScene(BaseScene):
     async def run(self):
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == pygame.QUIT:
                     self.running = False
                     return "Quit"
@@ -397,7 +323,7 @@ class MainScene(BaseScene):
                         from UI.components.blur import fast_blur
                         blurred_bg = fast_blur(self.screen.copy())
                         set_scene = SetScene(self.screen, blurred_bg,  self.player)
-                        setting_result = set_scene.run()
+                        setting_result = await set_scene.run()
                         # print(f"設定場景回傳：{setting_result}")
                         if setting_result == "BACK":
                             break
@@ -418,7 +344,7 @@ class MainScene(BaseScene):
                     if (0 <= relative_pos[0] < self.excl_rect.width and
                         0 <= relative_pos[1] < self.excl_rect.height and
                         self.excl_mask.get_at(relative_pos)):
-                        bubble_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+                        bubble_font = get_font_style("small")
                         self.speech_bubble = SpeechBubble(self.player, (470, 330), bubble_font)
 
                     # 點擊表情按鈕
@@ -430,7 +356,7 @@ class MainScene(BaseScene):
                                 if self.emoji_mask[i].get_at((rel_x, rel_y)):
                                     self.audio.play_sound(setting.SoundEffect.MENU_HOVER_PATH)
                                     self.emoji_clicked_frames[i] = self.emoji_frame_max
-                                    float_img = pygame.transform.smoothscale(self.floating_emoji_surfaces[i], (90, 90))
+                                    float_img = cached_scale(self.floating_emoji_surfaces[i], (90, 90))
                                     float_start = rect.center
                                     floating = FloatingEmoji(float_img, float_start)
                                     self.floating_emojis.append(floating)
@@ -440,23 +366,9 @@ class MainScene(BaseScene):
                     return "Next Story"
 
             self.update()
+            self.profiler.mark("update")
             self.draw()
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.present()
+            self.tick()
 
         return None
-                      
-
-def stats_change(list):
-    # 將數字轉換為帶符號的字串
-    # 正數前加 "+"，負數前加 "-"，零則顯示 "-"
-    result = []
-    for change in list:
-        change = int(change)
-        if change > 0:
-            result.append( "+" + str(change))
-        if change == 0:
-            result.append("-")
-        elif change < 0:
-            result.append(str(change))
-    return result
\ No newline at end of file
@@ -3,6 +3,11 @@ import asyncio
 from UI.components.character_animator import CharacterAnimator
 from UI.components.base_scene import BaseScene
 from UI.components.audio_manager import AudioManager
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font, get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.render_target import draw_rect
+from UI.components.surface_memory import SurfaceMemory
 from AI.simulation import Simulation
 from character import Bubu, Yier, Mitao, Huihui
 import setting
@@ -18,11 +23,15 @@ class RankScene(BaseScene):
         self.background.set_alpha(100)
         self.transition_direction = 1 
 
-        self.overlay_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
         self.overlay_alpha = 0 
+        # 背景 + 淡入的黑色遮罩預先合成；遮罩淡入完成後就不再重新合成
+        # （原本直接疊在上一幀畫面上，這裡以黑底近似）
+        self.backdrop = LayerCompositor(screen.get_size(), base_color=(0, 0, 0))
+        self.backdrop.add_layer("background", self.background)
+        self.backdrop.add_fill("overlay", (0, 0, 0, self.overlay_alpha))
 
         # 字型
-        self.font_desc = pygame.font.Font(setting.JFONT_PATH_REGULAR, 36)
+        self.font_desc = get_font_style("body")
 
         # 動畫角色
         self.animator = CharacterAnimator(self.player.ending, (900, 30), (240, 220))
@@ -78,9 +87,12 @@ class RankScene(BaseScene):
                 blank = pygame.Surface((800, 600))
                 blank.fill((50, 50, 50))
                 self.character_images.append(blank)
+        SurfaceMemory.get_instance().track_all(self.all_images + self.character_images, "chart", "RankScene")
 
         # 小號字體供按鈕使用
-        self.font_button = pygame.font.Font(setting.JFONT_PATH_REGULAR, 28)
+        self.font_button = get_font_style("small")
+        self.page_font = get_font_style("hint")
+        self.hint_font = get_font(setting.JFONT_PATH_REGULAR, 22)
         
         self.current_page = 0
         self.next_page = None
@@ -89,7 +101,7 @@ class RankScene(BaseScene):
         # 滑動動畫參數
         self.transitioning = False
         self.slide_offset = 0
-        self.slide_speed = 40  # 每 frame 移動速度
+        self.slide_speed = 40  # 每幀（30 FPS）移動速度，依經過的時間換算
 
         # 自動換頁計時器
         self.page_timer = 0
@@ -97,17 +109,17 @@ class RankScene(BaseScene):
 
     def update(self):
         if self.overlay_alpha < 140:
-            self.overlay_alpha += 5
-        self.overlay_surface.fill((0, 0, 0, self.overlay_alpha))
+            self.overlay_alpha = min(140, self.overlay_alpha + 5 * self.dt_frames)
+        self.backdrop.set_alpha("overlay", int(self.overlay_alpha))
 
         self.animator.update()
-        self.page_timer += self.clock.get_time()
+        self.page_timer += self.dt
 
         if self.page_timer >= self.auto_page_delay and not self.transitioning:
             self.start_transition()
 
         if self.transitioning:
-            self.slide_offset += self.slide_speed
+            self.slide_offset += self.slide_speed * self.dt_frames
             current_images = self.all_images if self.mode == "all" else self.character_images
             if self.slide_offset >= current_images[0].get_height():
                 self.current_page = self.next_page
@@ -125,8 +137,7 @@ class RankScene(BaseScene):
         self.audio.play_sound(setting.SoundEffect.NEXT_PAGE_PATH)
 
     def draw(self, screen):
-        screen.blit(self.background, (0, 0))
-        screen.blit(self.overlay_surface, (0, 0))
+        self.backdrop.draw(screen)
 
         current_images = self.all_images if self.mode == "all" else self.character_images
         
@@ -158,38 +169,36 @@ class RankScene(BaseScene):
         panel_height = 420
         
         # 背景面板
-        pygame.draw.rect(screen, (170, 170, 170), (panel_x, panel_y, panel_width, panel_height), border_radius=10)
-        pygame.draw.rect(screen, (100, 100, 100), (panel_x, panel_y, panel_width, panel_height), 2, border_radius=10)
+        draw_rect(screen, (170, 170, 170), (panel_x, panel_y, panel_width, panel_height), border_radius=10)
+        draw_rect(screen, (100, 100, 100), (panel_x, panel_y, panel_width, panel_height), 2, border_radius=10)
         
         # 按鈕 1: 全角色
         button1_rect = pygame.Rect(panel_x + 15, panel_y + 40, panel_width - 30, 100)
         button1_color = (100, 150, 200) if self.mode == "all" else (60, 80, 100)
-        pygame.draw.rect(screen, button1_color, button1_rect, border_radius=8)
-        pygame.draw.rect(screen, (150, 200, 255) if self.mode == "all" else (80, 100, 120), button1_rect, 2, border_radius=8)
+        draw_rect(screen, button1_color, button1_rect, border_radius=8)
+        draw_rect(screen, (150, 200, 255) if self.mode == "all" else (80, 100, 120), button1_rect, 2, border_radius=8)
         
-        all_text = self.font_button.render("全角色排名", True, (230, 230, 230))
+        all_text = render_text(self.font_button, "全角色排名", True, (230, 230, 230))
         screen.blit(all_text, (button1_rect.centerx - all_text.get_width()//2, button1_rect.centery - all_text.get_height()//2))
         
         # 按鈕 2: 該角色專用
         button2_rect = pygame.Rect(panel_x + 15, panel_y + 165, panel_width - 30, 100)
         button2_color = (100, 150, 200) if self.mode == "character" else (60, 80, 100)
-        pygame.draw.rect(screen, button2_color, button2_rect, border_radius=8)
-        pygame.draw.rect(screen, (150, 200, 255) if self.mode == "character" else (80, 100, 120), button2_rect, 2, border_radius=8)
+        draw_rect(screen, button2_color, button2_rect, border_radius=8)
+        draw_rect(screen, (150, 200, 255) if self.mode == "character" else (80, 100, 120), button2_rect, 2, border_radius=8)
         
-        char_text = self.font_button.render(f"{self.player.name}專屬排名", True, (230, 230, 230))
+        char_text = render_text(self.font_button, f"{self.player.name}專屬排名", True, (230, 230, 230))
     
         screen.blit(char_text, (button2_rect.centerx - char_text.get_width()//2, button2_rect.centery - char_text.get_height()//2))
         
         # 頁碼指示
-        page_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 24)
-        page_text = page_font.render(f"{self.current_page + 1}/3", True, (40, 40, 40))
+        page_text = render_text(self.page_font, f"{self.current_page + 1}/3", True, (40, 40, 40))
         screen.blit(page_text, (panel_x + panel_width//2 - page_text.get_width()//2, panel_y + 290))
         
         # 提示文字
-        hint_font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 22)
-        hint1 = hint_font.render("↓ 下一頁", True, (40,40,40))
-        hint2 = hint_font.render("↑ 上一頁", True, (40, 40, 40))
-        hint3 = hint_font.render("Esc 退出", True, (40, 40, 40))
+        hint1 = render_text(self.hint_font, "↓ 下一頁", True, (40,40,40))
+        hint2 = render_text(self.hint_font, "↑ 上一頁", True, (40, 40, 40))
+        hint3 = render_text(self.hint_font, "Esc 退出", True, (40, 40, 40))
         screen.blit(hint1, (panel_x + 100, panel_y + 330))
         screen.blit(hint2, (panel_x + 100, panel_y + 360))
         screen.blit(hint3, (panel_x + 115, panel_y + 390))
@@ -232,12 +241,13 @@ class RankScene(BaseScene):
     async def run(self):
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 self.handle_event(event)
 
             self.update()
+            self.profiler.mark("update")
             self.draw(self.screen)
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.present()
+            self.tick()
 
         self.running = False
@@ -3,14 +3,18 @@ import asyncio
 from UI.components.base_scene import BaseScene
 from UI.components.audio_manager import AudioManager
 from UI.components.character_animator import CharacterAnimator
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font, get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.render_target import draw_circle, draw_rect
 import setting
 
 class SoundControlScene(BaseScene):
     def __init__(self, screen):
         super().__init__(screen)
         self.audio = AudioManager.get_instance()
-        self.titlefont = pygame.font.Font(setting.JFONT_PATH_BOLD, 70)
-        self.font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 48)
+        self.titlefont = get_font(setting.JFONT_PATH_BOLD, 70)
+        self.font = get_font_style("subtitle")
 
         self.background = pygame.image.load(
             setting.ImagePath.BACKGROUND_PATH
@@ -19,6 +23,9 @@ class SoundControlScene(BaseScene):
             self.background, self.screen.get_size()
         )
         self.background.set_alpha(100)
+        # 黑底 + 半透明背景預先合成
+        self.backdrop = LayerCompositor(self.screen.get_size(), base_color=(0, 0, 0))
+        self.backdrop.add_layer("background", self.background)
 
         # 滑桿參數
         self.slider_width = 300
@@ -73,17 +80,14 @@ class SoundControlScene(BaseScene):
         return pygame.Rect(x - self.knob_radius, y - self.knob_radius, self.knob_radius * 2, self.knob_radius * 2)
 
     def update(self):
-        self.screen.fill((255, 255, 255))
-        self.screen.blit(self.background, (0, 0))
         self.animator.update()
         self.animator2.update()
 
     def draw(self, screen):
-        screen.fill((0, 0, 0))
-        self.screen.blit(self.background, (0, 0))
+        self.backdrop.draw(screen)
         
         # 標題
-        title = self.titlefont.render("音量設定", True, (255, 255, 255))
+        title = render_text(self.titlefont, "音量設定", True, (255, 255, 255))
         screen.blit(title, (self.SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
 
         # BGM 音量滑桿
@@ -93,32 +97,33 @@ class SoundControlScene(BaseScene):
         self._draw_slider(screen, self.sfx_slider_rect, self.sfx_volume, "音效")
 
         # 提示
-        hint = self.font.render("按 Esc 返回", True, (200, 200, 200))
+        hint = render_text(self.font, "按 Esc 返回", True, (200, 200, 200))
         screen.blit(hint, (self.SCREEN_WIDTH - 300, self.SCREEN_HEIGHT - 60))
         self.animator.draw(screen)
         self.animator2.draw(screen)
 
     def _draw_slider(self, screen, rect, volume, label):
         # 標籤
-        label_surface = self.font.render(f"{label}: {int(volume * 100)}%", True, (255, 255, 255))
+        label_surface = render_text(self.font, f"{label}: {int(volume * 100)}%", True, (255, 255, 255))
         screen.blit(label_surface, (rect.left, rect.top - 60))
 
         # 滑桿底座
-        pygame.draw.rect(screen, (180, 180, 180), rect)
+        draw_rect(screen, (180, 180, 180), rect)
         # 滑桿前景
         filled_rect = pygame.Rect(rect.left, rect.top, int(rect.width * volume), rect.height)
-        pygame.draw.rect(screen, (120, 200, 250), filled_rect)
+        draw_rect(screen, (120, 200, 250), filled_rect)
         # 圓形 knob
         knob_x = rect.left + int(volume * rect.width)
-        pygame.draw.circle(screen, (250, 250, 250), (knob_x, rect.centery), self.knob_radius)
+        draw_circle(screen, (250, 250, 250), (knob_x, rect.centery), self.knob_radius)
 
     async def run(self):
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 self.handle_event(event)
 
             self.update()
+            self.profiler.mark("update")
             self.draw(self.screen)
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.present()
+            self.tick()
@@ -2,6 +2,10 @@ import pygame
 from UI.components.base_scene import BaseScene
 from UI.components.character_animator import CharacterAnimator
 from UI.components.audio_manager import AudioManager
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font, get_font_style
+from UI.components.layer_compositor import LayerCompositor
+from UI.components.render_target import draw_rect
 import setting
 import asyncio
 
@@ -15,13 +19,14 @@ class StartScene(BaseScene):
             self.background, self.screen.get_size()
         )
         self.background.set_alpha(100)
+        # 白底 + 半透明背景預先合成
+        self.backdrop = LayerCompositor(self.screen.get_size())
+        self.backdrop.add_layer("background", self.background)
 
-        self.title_font = pygame.font.Font(
+        self.title_font = get_font(
             setting.MFONT_PATH, 72
         )
-        self.subtitle_font = pygame.font.Font(
-            setting.JFONT_PATH_REGULAR, 48
-        )
+        self.subtitle_font = get_font_style("subtitle")
 
         # ---------- 音樂 ----------    
         self.audio = AudioManager.get_instance()
@@ -70,13 +75,13 @@ class StartScene(BaseScene):
     # 更新邏輯 & 事件處理
     # -------------------------------------------------------------
     def update(self):
-        self.clock.tick(self.FPS)
+        self.tick()
         self.animator1.update()
         self.animator2.update()
         mouse_pos = pygame.mouse.get_pos()
 
         # 事件處理
-        for event in pygame.event.get():
+        for event in self.poll_events():
             if event.type == pygame.QUIT:
                 return "QUIT"
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -102,16 +107,15 @@ class StartScene(BaseScene):
     # 畫面渲染
     # -------------------------------------------------------------
     def draw(self):
-        self.screen.fill((255, 255, 255))
-        self.screen.blit(self.background, (0, 0))
+        self.backdrop.draw(self.screen)
 
         # 裝飾動畫
         self.animator1.draw(self.screen)
         self.animator2.draw(self.screen)
 
         # 標題
-        title_surf = self.title_font.render(
-            "Lazy Me Today Too", True, (142, 88, 51)
+        title_surf = render_text(
+            self.title_font, "Lazy Me Today Too", True, (142, 88, 51)
         )
         title_rect = title_surf.get_rect(center=(self.SCREEN_WIDTH // 2, 150))
         self.screen.blit(title_surf, title_rect)
@@ -129,14 +133,14 @@ class StartScene(BaseScene):
 
             base_color = (200, 200, 250) if btn["hover"] else (180, 180, 180)
             border_color = (120, 120, 160)
-            pygame.draw.rect(self.screen, base_color, scaled_rect, border_radius=15)
-            pygame.draw.rect(self.screen, border_color, scaled_rect, 3, border_radius=15)
+            draw_rect(self.screen, base_color, scaled_rect, border_radius=15)
+            draw_rect(self.screen, border_color, scaled_rect, 3, border_radius=15)
 
-            text_surf = self.subtitle_font.render(btn["text"], True, (50, 50, 50))
+            text_surf = render_text(self.subtitle_font, btn["text"], True, (50, 50, 50))
             text_rect = text_surf.get_rect(center=scaled_rect.center)
             self.screen.blit(text_surf, text_rect)
 
-        pygame.display.flip()
+        self.present()
 
     # -------------------------------------------------------------
     # 主循環
@@ -145,6 +149,7 @@ class StartScene(BaseScene):
         while self.running:
             await asyncio.sleep(0)
             result = self.update()
+            self.profiler.mark("update")
             if result is not None:
                 return result
             self.draw()
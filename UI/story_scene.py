@@ -7,6 +7,9 @@ from UI.lucky_wheel_scene import LuckyWheelScene
 from UI.components.character_animator import CharacterAnimator
 from UI.taketest_scene import TakeTestScene
 from UI.end_scene import EndScene
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
+from UI.components.layer_compositor import LayerCompositor
 import setting
 
 class StoryScene(BaseScene):
@@ -15,13 +18,13 @@ class StoryScene(BaseScene):
 
         self.player = player
 
-        self.title_font = pygame.font.Font(setting.JFONT_PATH_BOLD, 48)
-        self.font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 36)
+        self.title_font = get_font_style("heading")
+        self.font = get_font_style("body")
         
         self.animator = CharacterAnimator(player.storytyping, (900, 50), (220, 200))
 
         self.title_alpha = 0  # 標題淡入透明度
-        self.title_alpha_speed = 20  # 每幀增加多少
+        self.title_alpha_speed = 20  # 每幀（30 FPS）增加多少
 
         self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
         self.background = pygame.transform.scale(self.background, screen.get_size())
@@ -36,10 +39,22 @@ class StoryScene(BaseScene):
         self.lines = intro_text.splitlines() if intro_text else []
         self.title = self.player.week_data.get("title", "")
 
+        # 白底、背景、標題與分隔線預先合成；只有標題淡入期間才需要重新合成
+        left_margin = 100
+        line_width = self.screen.get_width() - left_margin - left_margin - 200
+        line_surface = pygame.Surface((line_width, 2), pygame.SRCALPHA)
+        pygame.draw.line(line_surface, (100, 100, 100), (0, 1), (line_width, 1), 2)
+        self.backdrop = LayerCompositor(self.screen.get_size())
+        self.backdrop.add_layer("background", self.background)
+        if self.title:
+            title_surface = render_text(self.title_font, self.title, True, (50, 50, 50))
+            self.backdrop.add_layer("title", title_surface, (left_margin - 30, 120), alpha=self.title_alpha)
+        self.backdrop.add_layer("line", line_surface, (left_margin - 50, 180), alpha=self.title_alpha)
+
         self.current_line = 0
         self.current_char = 0
         self.displayed_lines = []
-        self.last_char_time = pygame.time.get_ticks()
+        self.type_elapsed = 0  # 還沒用掉的打字時間（毫秒）
         self.all_finished = False
         self.running = True
 
@@ -53,9 +68,9 @@ class StoryScene(BaseScene):
     def update(self):
         #print(pygame.mouse.get_pos())
         if self.title_alpha < 255:
-            self.title_alpha = min(255, self.title_alpha + self.title_alpha_speed)
+            self.title_alpha = min(255, self.title_alpha + self.title_alpha_speed * self.dt_frames)
 
-        for event in pygame.event.get():
+        for event in self.poll_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -73,10 +88,12 @@ class StoryScene(BaseScene):
                 
             
         self.animator.update()  # 更新動畫
-        now = pygame.time.get_ticks()
 
-        if not self.all_finished and now - self.last_char_time > self.char_interval:
-            self.last_char_time = now
+        # 依經過的時間打字，掉幀時一次補上落後的字
+        if not self.all_finished:
+            self.type_elapsed += self.dt
+        while not self.all_finished and self.type_elapsed >= self.char_interval:
+            self.type_elapsed -= self.char_interval
             self.current_char += 1
             if self.current_char > len(self.lines[self.current_line]):
                 self.displayed_lines.append(self.lines[self.current_line])
@@ -87,36 +104,29 @@ class StoryScene(BaseScene):
                     self.audio.stop_sound(setting.SoundEffect.TYPING_PATH)
 
 
+    def is_animating(self):
+        # 打完字、標題淡入完成後，只剩角色動畫會動
+        return not self.all_finished or self.title_alpha < 255
+
+    def next_wakeup_ms(self):
+        return self.animator.ms_until_next_frame()
+
     def draw(self):
-        self.screen.fill((255, 255, 255))
-        self.screen.blit(self.background, (0, 0))
+        # 標題與分隔線淡入：透明度不變時不會重新合成
+        if self.title:
+            self.backdrop.set_alpha("title", int(self.title_alpha))
+        self.backdrop.set_alpha("line", int(self.title_alpha))
+        self.backdrop.draw(self.screen)
         self.animator.draw(self.screen)
 
         # 假設左右邊距 40，上方起始高度 160
         left_margin = 100
         top_start = 230
 
-        # 畫標題（淡入）
-        if self.title:
-            title_surface = self.title_font.render(self.title, True, (50, 50, 50))
-            # 建立一個有 alpha 的 surface
-            title_alpha_surface = pygame.Surface(title_surface.get_size(), pygame.SRCALPHA)
-            title_alpha_surface.blit(title_surface, (0, 0))
-            title_alpha_surface.set_alpha(self.title_alpha)
-            title_rect = title_surface.get_rect()
-            title_rect.topleft = (left_margin-30, 120)
-            self.screen.blit(title_alpha_surface, title_rect)
-
-        # 畫分隔線（淡入）
-        line_width = self.screen.get_width() - left_margin - left_margin - 200
-        line_surface = pygame.Surface((line_width, 2), pygame.SRCALPHA)
-        pygame.draw.line(line_surface, (100, 100, 100, self.title_alpha), (0, 1), (line_width, 1), 2)
-        self.screen.blit(line_surface, (left_margin-50, 180))
-
         # 已顯示的完整行
         y = top_start
         for line in self.displayed_lines:
-            text_surface = self.font.render(line, True, (50, 50, 50))
+            text_surface = render_text(self.font, line, True, (50, 50, 50))
             self.screen.blit(text_surface, (left_margin, y))
             y += self.line_height + self.line_spacing
 
@@ -130,7 +140,7 @@ class StoryScene(BaseScene):
                 
 
     
-        tip = self.font.render("（點擊以結束）", True, (150, 150, 150))
+        tip = render_text(self.font, "（點擊以結束）", True, (150, 150, 150))
         # 水平置中，垂直位置在文字區底部+50
         self.screen.blit(tip, (self.screen.get_width() // 2 - tip.get_width() // 2, 630))
         
@@ -139,29 +149,30 @@ class StoryScene(BaseScene):
         while self.running:
             await asyncio.sleep(0)
             self.update()
+            self.profiler.mark("update")
             self.draw()
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+            self.present()
+            self.tick()
         
         if self.player.week_number == 3:
             options = ["超可愛學姐\n帥潮學長", "看起來是系邊\n有點宅宅的學長", "超搞笑的系核\n第一次見面\n就表演倒立走路", "卷哥卷姐", "被放生了"]
             lucky_scene = LuckyWheelScene(self.screen, options)
-            result = lucky_scene.run()
+            result = await lucky_scene.run()
             self.player.home =  result
 
         # 期中考
         if self.player.week_number == 8:
             taketest_scene = TakeTestScene(self.screen, self.player)
-            self.player.midterm = taketest_scene.run()
+            self.player.midterm = await taketest_scene.run()
 
 
         # 期末考
         if self.player.week_number == 16: 
             taketest_scene = TakeTestScene(self.screen, self.player)
-            self.player.final = taketest_scene.run()
+            self.player.final = await taketest_scene.run()
             options = ["幸運教授指數3", "幸運教授指數5", "幸運教授指數4"]
             lucky_scene = LuckyWheelScene(self.screen, options)
-            result = lucky_scene.run()
+            result = await lucky_scene.run()
             # 結果是分別對應 3, 5, 4
             if result == "幸運教授指數3":
                 result = 3
@@ -2,13 +2,19 @@ import pygame
 import asyncio
 from UI.components.base_scene import BaseScene
 from UI.components.character_animator import CharacterAnimator
+from UI.components.text_cache import render_text
+from UI.components.font_registry import get_font_style
 import setting
 
+# 以前兩個場景都不限速、每幀加 5，動畫速度跟著電腦快慢走；現在依經過的時間推進
+OVERLAY_FADE_PER_S = 850  # 黑色遮罩每秒增加的透明度（約 0.3 秒淡入完成）
+
+
 class TakeTestScene(BaseScene):
     def __init__(self, screen, player):
         super().__init__(screen)
-        self.titlefont = pygame.font.Font(setting.JFONT_PATH_BOLD, 54)
-        self.font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 36)
+        self.titlefont = get_font_style("title")
+        self.font = get_font_style("body")
         self.player = player
         self.audio.fade_out_bgm(1000)  # 淡出背景音樂
         self.audio.play_bgm(setting.BGM.DRUMDRUM_PATH)  # 播放考試背景音樂
@@ -17,7 +23,9 @@ class TakeTestScene(BaseScene):
         self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
         self.background = pygame.transform.scale(self.background, self.screen.get_size())
         self.background.set_alpha(100)
-        self.overlay_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        # 黑色遮罩只填一次，淡入時改 set_alpha（內容不變，內部解析度縮小時可以沿用縮小版）
+        self.overlay_surface = pygame.Surface(screen.get_size()).convert()
+        self.overlay_surface.fill((0, 0, 0))
         self.overlay_alpha = 0
 
         if player.week_number == 8:
@@ -28,14 +36,15 @@ class TakeTestScene(BaseScene):
         # 文字敘述
         self.text_lines = f"{self.player.chname} 同學，你已經準備好進行{self.test_type}試了嗎？"
         self.animator = CharacterAnimator(self.player.testing, (850, 400), (300, 300))
-        self.animator.frame_delay = 20  # 控制動畫速度
+        # 控制動畫速度；以前未限速時每 20 幀換一張（約 0.13 秒），現在依時間換圖
+        self.animator.frame_delay = 4
 
     def update(self):
         self.animator.update()
         # 透明遮罩淡入
         if self.overlay_alpha < 255:
-            self.overlay_alpha = min(255, self.overlay_alpha + 5)
-        self.overlay_surface.fill((0, 0, 0, self.overlay_alpha))
+            self.overlay_alpha = min(255, self.overlay_alpha + OVERLAY_FADE_PER_S * self.dt / 1000)
+        self.overlay_surface.set_alpha(int(self.overlay_alpha))
         self.screen.blit(self.overlay_surface, (0, 0))
 
     def draw(self, screen):
@@ -43,11 +52,11 @@ class TakeTestScene(BaseScene):
         self.animator.draw(screen)
 
         # 顯示文字
-        text_surface = self.titlefont.render(self.text_lines, True, (255, 255, 255))
+        text_surface = render_text(self.titlefont, self.text_lines, True, (255, 255, 255))
         text_rect = text_surface.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 - 50))
         screen.blit(text_surface, text_rect)
         # 顯示提示文字
-        prompt_surface = self.font.render("按下 Enter 鍵開始考試", True, (255, 255, 255))
+        prompt_surface = render_text(self.font, "按下 Enter 鍵開始考試", True, (255, 255, 255))
         prompt_rect = prompt_surface.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 50))
         screen.blit(prompt_surface, prompt_rect)
 
@@ -63,7 +72,7 @@ class TakeTestScene(BaseScene):
         self.running = True
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         self.audio.play_sound(setting.SoundEffect.DONGDONG_PATH)
@@ -73,7 +82,7 @@ class TakeTestScene(BaseScene):
                         pygame.time.delay(500)  # 模擬考試過程
                         self.running = False
                         grade_scene = GradingScene(self.screen, self.player)
-                        result = grade_scene.run()
+                        result = await grade_scene.run()
                         self.running = False  # 確保當 GradingScene 結束後，這個場景也結束
                         return result
 
@@ -81,16 +90,20 @@ class TakeTestScene(BaseScene):
                     self.running = False
 
             self.update()
+            self.profiler.mark("update")
             self.draw(self.screen)
-            pygame.display.update()
+            self.present()
+            self.tick()
 
 
 
 class GradingScene(BaseScene):
+    REVEAL_STEP_MS = 50  # 跳分動畫每隔多久加一次分數
+
     def __init__(self, screen, player):
         super().__init__(screen)
-        self.titlefont = pygame.font.Font(setting.JFONT_PATH_BOLD, 54)
-        self.font = pygame.font.Font(setting.JFONT_PATH_REGULAR, 36)
+        self.titlefont = get_font_style("title")
+        self.font = get_font_style("body")
         self.player = player
         self.audio.fade_out_bgm(5000)
         self.audio.play_sound_loop(setting.SoundEffect.SMALL_DRUM_PATH)
@@ -99,11 +112,13 @@ class GradingScene(BaseScene):
         self.background = pygame.image.load(setting.ImagePath.BACKGROUND_PATH).convert_alpha()
         self.background = pygame.transform.scale(self.background, self.screen.get_size())
         self.background.set_alpha(100)
-        self.overlay_surface = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        # 黑色遮罩只填一次，淡入時改 set_alpha（內容不變，內部解析度縮小時可以沿用縮小版）
+        self.overlay_surface = pygame.Surface(screen.get_size()).convert()
+        self.overlay_surface.fill((0, 0, 0))
         self.overlay_alpha = 0
 
         self.animator = CharacterAnimator(self.player.taketest, (850, 400), (300, 300))
-        self.animator.frame_delay = 20  # 控制動畫速度
+        self.animator.frame_delay = 4  # 控制動畫速度（同 TakeTestScene）
 
         if player.week_number == 8:
             player.get_midterm()
@@ -119,7 +134,7 @@ class GradingScene(BaseScene):
         self.displayed_score = 0
         self.reveal_speed = max(1, int(abs(self.score) // 100))  # 跳分速度
         self.show_full_score = False
-        self.frame_count = 0
+        self.reveal_elapsed = 0  # 還沒用掉的跳分時間（毫秒）
 
         self.ending_anim_switch = False  # 用於控制是否顯示結束動畫
 
@@ -127,13 +142,14 @@ class GradingScene(BaseScene):
         self.animator.update()
         # 透明遮罩淡入
         if self.overlay_alpha < 255:
-            self.overlay_alpha = min(255, self.overlay_alpha + 5)
-        self.overlay_surface.fill((0, 0, 0, self.overlay_alpha))
+            self.overlay_alpha = min(255, self.overlay_alpha + OVERLAY_FADE_PER_S * self.dt / 1000)
+        self.overlay_surface.set_alpha(int(self.overlay_alpha))
         self.screen.blit(self.overlay_surface, (0, 0))
-        # 跳分動畫
+        # 跳分動畫：每 REVEAL_STEP_MS 加一次分數，掉幀時一次補上落後的次數
         if not self.show_full_score:
-            self.frame_count += 1
-            if self.frame_count % 10 == 0:  # 每3幀才加一次分數，數字越大越慢
+            self.reveal_elapsed += self.dt
+            while not self.show_full_score and self.reveal_elapsed >= self.REVEAL_STEP_MS:
+                self.reveal_elapsed -= self.REVEAL_STEP_MS
                 if self.displayed_score < int(self.score):
                     self.displayed_score += self.reveal_speed
                     # 新增：分數大於75且還沒切換動畫時，切換到結束動畫
@@ -164,7 +180,7 @@ class GradingScene(BaseScene):
 
         # 顯示提示文字
         if self.show_full_score:
-            prompt_surface = self.font.render("點擊以退出", True, (255, 255, 255))
+            prompt_surface = render_text(self.font, "點擊以退出", True, (255, 255, 255))
             prompt_rect = prompt_surface.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2 + 350))
             screen.blit(prompt_surface, prompt_rect)
 
@@ -172,7 +188,7 @@ class GradingScene(BaseScene):
         self.running = True
         while self.running:
             await asyncio.sleep(0)
-            for event in pygame.event.get():
+            for event in self.poll_events():
                 if self.show_full_score and event.type == pygame.MOUSEBUTTONDOWN:
                     self.running = False
                     return self.score  # 返回分數以便後續使用
@@ -181,5 +197,7 @@ class GradingScene(BaseScene):
             
 
             self.update()
+            self.profiler.mark("update")
             self.draw(self.screen)
-            pygame.display.update()
\ No newline at end of file
+            self.present()
+            self.tick()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+AI 建議 API 壓力測試 - 不連網，用本機假伺服器量吞吐量與長尾延遲
+
+啟動 services/fake_chat_server.py（可設定延遲、隨機長尾與失敗率），以多個執行緒同時送出請求，
+比較兩種呼叫方式：
+  fresh   每次呼叫都 new 一個 OpenAI client、不重試（舊的寫法）
+  pooled  共用的 ApiClient：keep-alive 連線池、併發上限、逾時與指數退避重試
+
+輸出 JSON：每種方式的吞吐量、成功 / 失敗數、p50 / p95 / p99 延遲、重試次數與用到的連線數。
+
+用法：
+    python bench_advice_api.py                                   # 兩種方式都跑
+    python bench_advice_api.py --requests 500 --failure-rate 0.2 --jitter 1.0 --mode pooled
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+import setting
+from services.fake_chat_server import FakeChatServer
+from UI.components.frame_profiler import percentile
+
+BENCH_TEXT = "你是那種該衝的時候會衝、該躺的時候也不客氣的人。" * 4
+MESSAGES = [
+    {"role": "system", "content": "你是玩家的大學同學。"},
+    {"role": "user", "content": "給我一點建議"},
+]
+
+
+def call_fresh(api_key, stream):
+    """舊的寫法：每次都建立新的 client，沒有重試"""
+    from openai import OpenAI
+    client = OpenAI(api_key=api_key, max_retries=0)
+    try:
+        if stream:
+            parts = []
+            for chunk in client.chat.completions.create(
+                model="fake-model", messages=MESSAGES, timeout=setting.ADVICE_TIMEOUT_S, stream=True
+            ):
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+            return "".join(parts)
+        resp = client.chat.completions.create(model="fake-model", messages=MESSAGES, timeout=setting.ADVICE_TIMEOUT_S)
+        return resp.choices[0].message.content
+    finally:
+        client.close()
+
+
+def call_pooled(api_key, stream):
+    from services.api_client import ApiClient
+    on_delta = (lambda piece: None) if stream else None
+    return ApiClient.get_instance().chat(api_key, on_delta=on_delta, model="fake-model", messages=MESSAGES)
+
+
+def run_mode(name, call, args):
+    server = FakeChatServer(
+        BENCH_TEXT,
+        chunk_size=4,
+        first_delay_s=args.latency,
+        chunk_delay_s=args.chunk_delay,
+        latency_jitter_s=args.jitter,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    ).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    latencies = []
+    errors = {}
+
+    def one(_):
+        t0 = time.perf_counter()
+        try:
+            text = call("bench-key", args.stream)
+            if text != BENCH_TEXT:
+                raise ValueError("回應內容不符")
+            latencies.append(time.perf_counter() - t0)
+        except Exception as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+    server.stop()
+
+    result = {
+        "mode": name,
+        "requests": args.requests,
+        "ok": len(latencies),
+        "failed": sum(errors.values()),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        "server_requests": len(server.requests),
+        "server_failures": server.failures,
+        "connections": len(server.connections),
+    }
+    if name == "pooled":
+        from services.api_client import ApiClient
+        result["client"] = ApiClient.get_instance().stats()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以本機假伺服器測 AI 建議 API 的吞吐量與長尾延遲")
+    parser.add_argument("--requests", type=int, default=200, help="總請求數")
+    parser.add_argument("--concurrency", type=int, default=4, help="同時送出請求的執行緒數")
+    parser.add_argument("--max-concurrency", type=int, default=setting.ADVICE_API_MAX_CONCURRENCY,
+                        help="ApiClient 的併發上限")
+    parser.add_argument("--latency", type=float, default=0.2, help="第一段回應前的基本延遲（秒）")
+    parser.add_argument("--jitter", type=float, default=0.3, help="額外的隨機延遲上限（秒），製造長尾")
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="串流每段之間的延遲（秒）")
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="伺服器回傳 503 的機率")
+    parser.add_argument("--stream", action="store_true", help="以串流方式呼叫")
+    parser.add_argument("--mode", choices=("fresh", "pooled", "both"), default="both")
+    parser.add_argument("--seed", type=int, default=0, help="伺服器延遲與失敗的亂數種子")
+    parser.add_argument("--out", help="輸出 JSON 檔（預設印到 stdout）")
+    args = parser.parse_args()
+
+    try:
+        import openai  # noqa: F401
+    except ImportError:
+        print("需要 openai 套件：pip install openai", file=sys.stderr)
+        sys.exit(1)
+
+    setting.ADVICE_API_MAX_CONCURRENCY = args.max_concurrency
+    modes = ("fresh", "pooled") if args.mode == "both" else (args.mode,)
+    calls = {"fresh": call_fresh, "pooled": call_pooled}
+    report = {
+        "config": vars(args),
+        "results": [run_mode(mode, calls[mode], args) for mode in modes],
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
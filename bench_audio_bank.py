@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+音效第一次播放的延遲測試 - 比較當場解碼與 AudioBank 預先解碼
+
+lazy  以前的寫法：第一次播放時才 pygame.mixer.Sound(path)，在主執行緒解碼
+bank  AudioBank.preload() 在背景解碼，等 --startup-ms（模擬載入畫面到第一個場景的時間）後才開始播
+
+每個音效各播兩次，量第一次與第二次播放的呼叫時間。輸出 JSON：每個音效的第一 / 第二次播放毫秒數、
+最慢的第一次播放，以及 AudioBank.stats()（解碼時間、記憶體、當場解碼的次數）。
+
+用法：
+    python bench_audio_bank.py
+    python bench_audio_bank.py --startup-ms 0 --out audio_bank.json   # 一開場就播，看背景還沒解碼完的情況
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+import pygame
+from UI.components.audio_bank import AudioBank, sound_effect_paths
+
+
+def timed_ms(func):
+    t0 = time.perf_counter()
+    func()
+    return (time.perf_counter() - t0) * 1000
+
+
+def run_lazy(paths):
+    sounds = {}
+
+    def play(path):
+        if path not in sounds:
+            sounds[path] = pygame.mixer.Sound(path)
+        sounds[path].play()
+
+    return {os.path.basename(path): [timed_ms(lambda: play(path)) for _ in range(2)] for path in paths}
+
+
+def run_bank(paths, startup_ms):
+    bank = AudioBank.get_instance()
+    bank.preload(paths)
+    time.sleep(startup_ms / 1000)
+    return {os.path.basename(path): [timed_ms(lambda: bank.play(path)) for _ in range(2)] for path in paths}
+
+
+def summarize(timings):
+    first = {name: round(times[0], 3) for name, times in timings.items()}
+    second = {name: round(times[1], 3) for name, times in timings.items()}
+    return {
+        "first_play_ms": first,
+        "second_play_ms": second,
+        "max_first_ms": max(first.values()),
+        "max_second_ms": max(second.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音效第一次播放的延遲：當場解碼 vs AudioBank 預先解碼")
+    parser.add_argument("--mode", choices=("lazy", "bank", "both"), default="both")
+    parser.add_argument("--startup-ms", type=float, default=300, help="preload() 之後多久開始播放（毫秒）")
+    parser.add_argument("--out", help="輸出 JSON 檔（預設印到 stdout）")
+    args = parser.parse_args()
+
+    pygame.mixer.init()
+    paths = [path for path in sound_effect_paths() if os.path.exists(path)]
+    report = {"config": vars(args)}
+    if args.mode in ("lazy", "both"):
+        report["lazy"] = summarize(run_lazy(paths))
+    if args.mode in ("bank", "both"):
+        report["bank"] = summarize(run_bank(paths, args.startup_ms))
+        AudioBank.get_instance().wait()
+        report["bank"]["stats"] = AudioBank.get_instance().stats()
+    pygame.mixer.quit()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+本機建議引擎壓力測試 - 確認每次產生建議都在一毫秒內
+
+隨機產生玩家（四個角色、隨機選項與屬性、成績），對每位玩家產生第 1~16 週與結局建議，
+量每次呼叫的耗時。輸出 JSON：引擎建立（預先組句子）的時間、每週 / 結局建議的
+平均、p50、p99、最大耗時（微秒），以及表格大小。p99 超過 --limit-us 時以非零結束碼結束。
+
+用法：
+    python bench_local_advice.py
+    python bench_local_advice.py --players 5000 --limit-us 500 --out local_advice.json
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+
+from character import Bubu, Yier, Mitao, Huihui
+from services.local_advice import LocalAdviceEngine, LETTERS
+from UI.components.frame_profiler import percentile
+
+
+def make_players(n, seed):
+    rng = random.Random(seed)
+    classes = (Bubu, Yier, Mitao, Huihui)
+    players = []
+    for i in range(n):
+        player = classes[i % len(classes)]()
+        player.chosen = ["0"] + [rng.choice(LETTERS) for _ in range(16)]
+        player.mood, player.energy, player.social = (rng.randint(0, 100) for _ in range(3))
+        player.knowledge = rng.uniform(0, 100)
+        player.midterm, player.final = rng.randint(20, 100), rng.randint(20, 100)
+        player.GPA = round(rng.uniform(1.0, 4.3), 2)
+        players.append(player)
+    return players
+
+
+def summarize(samples_ns):
+    us = [ns / 1000 for ns in samples_ns]
+    return {
+        "calls": len(us),
+        "mean_us": round(sum(us) / len(us), 2),
+        "p50_us": round(percentile(us, 50), 2),
+        "p99_us": round(percentile(us, 99), 2),
+        "max_us": round(max(us), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本機建議引擎的產生時間測試")
+    parser.add_argument("--players", type=int, default=2000, help="隨機玩家數")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limit-us", type=float, default=1000, help="p99 必須低於這個值（微秒）")
+    parser.add_argument("--out", help="輸出 JSON 檔（預設印到 stdout）")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter_ns()
+    engine = LocalAdviceEngine.get_instance()
+    compile_us = (time.perf_counter_ns() - t0) / 1000
+
+    players = make_players(args.players, args.seed)
+    weekly, final = [], []
+    gc.disable()  # 量引擎本身，不把 GC 的停頓算進去
+    try:
+        for player in players:
+            for week in range(1, 17):
+                t0 = time.perf_counter_ns()
+                engine.weekly(player, week)
+                weekly.append(time.perf_counter_ns() - t0)
+            t0 = time.perf_counter_ns()
+            engine.final(player)
+            final.append(time.perf_counter_ns() - t0)
+    finally:
+        gc.enable()
+
+    report = {
+        "config": vars(args),
+        "compile_us": round(compile_us, 1),
+        "tables": {
+            "weekly": len(engine._weekly) + len(engine._exam) + len(engine._love_weekly),
+            "persona": len(engine._persona),
+            "love": len(engine._love),
+            "study": len(engine._study),
+        },
+        "weekly": summarize(weekly),
+        "final": summarize(final),
+    }
+    report["ok"] = report["weekly"]["p99_us"] < args.limit_us and report["final"]["p99_us"] < args.limit_us
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+完整遊玩壓力測試 - 以虛擬時鐘快轉，連續跑完整局遊戲
+
+透過 SceneManager.run 從開場一路玩到結局：選角、16 週的故事與事件、期中 / 期末考、
+幸運轉盤、結局、排行與結果分析，結局時按「重新開始」接著玩下一局。
+時間改由虛擬時鐘推進（clock.tick、打字機效果與 pygame.time.delay 都不等待），
+AI 建議改用固定文字，玩家的選擇由固定種子的亂數決定。
+
+最後輸出 JSON：總耗時、峰值記憶體、場景切換延遲、每局的耗時 / 記憶體 / 物件數、
+每週的平均幀時間，以及各快取的大小，用來找出記憶體洩漏與越玩越慢的問題。
+
+用法：
+    python bench_playthrough.py                          # 預設跑 10 局
+    python bench_playthrough.py --games 1000 --rank-every 0 --out playthrough.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from bench_scenes import VirtualMouse, apply_action
+
+import pygame
+import setting
+from UI.components.frame_profiler import percentile
+from UI.components.render_target import RenderTarget
+
+STUB_ADVICE = "（壓力測試用的固定建議）\n保持規律作息，讀書和休息都要顧到。"
+
+
+class VirtualClock:
+    """取代 pygame.time：tick / delay 不等待，只推進虛擬時間；get_ticks 回傳虛擬時間"""
+
+    UNTHROTTLED_MS = 1000 / 60  # tick(0)（不限速）時一幀算多久
+
+    def __init__(self):
+        self.now = 0.0
+        self._originals = None
+
+    def install(self):
+        virtual = self
+        self._originals = (pygame.time.Clock, pygame.time.get_ticks, pygame.time.delay, pygame.time.wait)
+
+        class Clock:
+            def __init__(self):
+                self._last = 0
+
+            def tick(self, fps=0):
+                self._last = int(1000 / fps) if fps else int(virtual.UNTHROTTLED_MS)
+                virtual.now += self._last
+                return self._last
+
+            def get_time(self):
+                return self._last
+
+            def get_fps(self):
+                return 1000 / self._last if self._last else 0.0
+
+        def delay(ms):
+            virtual.now += ms
+            return int(ms)
+
+        pygame.time.Clock = Clock
+        pygame.time.get_ticks = lambda: int(virtual.now)
+        pygame.time.delay = delay
+        pygame.time.wait = delay
+
+    def uninstall(self):
+        if self._originals is not None:
+            pygame.time.Clock, pygame.time.get_ticks, pygame.time.delay, pygame.time.wait = self._originals
+            self._originals = None
+
+
+class Pilot:
+    """掛在 BaseScene.poll_events 前面：每當場景要取事件時，依場景種類送出下一個操作"""
+
+    MAX_SCENE_FRAMES = 3000  # 同一個場景停留超過這麼多幀就視為卡住
+    RETRY_FRAMES = 10  # 操作送出後場景沒反應，隔幾幀再送一次
+
+    def __init__(self, mouse, games, rank_every, diary_week, seed):
+        self.mouse = mouse
+        self.games = games
+        self.rank_every = rank_every
+        self.diary_week = diary_week
+        self.rng = random.Random(seed)
+        self.manager = None
+
+        self.scene = None
+        self.scene_frames = 0
+        self.game = 0
+        self.game_started = None
+        self.diary_visited = False
+        self.end_plan = []
+        self.finished_games = []
+
+        # 量測：場景切換延遲與每週幀時間
+        self.last_present_scene = None
+        self.last_present_time = None
+        self.transitions = {}
+        self.week_frames = {}
+
+    # ---------------- 掛勾 ----------------
+    def install(self):
+        from UI.components.base_scene import BaseScene
+        pilot = self
+        self._base_scene = BaseScene
+        self._originals = (BaseScene.poll_events, BaseScene.present)
+        poll_events, present = self._originals
+
+        def piloted_poll_events(scene):
+            pilot.before_poll(scene)
+            return poll_events(scene)
+
+        def measured_present(scene):
+            present(scene)
+            pilot.after_present(scene)
+
+        BaseScene.poll_events = piloted_poll_events
+        BaseScene.present = measured_present
+
+    def uninstall(self):
+        self._base_scene.poll_events, self._base_scene.present = self._originals
+
+    def after_present(self, scene):
+        now = time.perf_counter()
+        if self.last_present_time is not None:
+            elapsed = (now - self.last_present_time) * 1000
+            if scene is not self.last_present_scene:
+                key = f"{type(self.last_present_scene).__name__}->{type(scene).__name__}"
+                self.transitions.setdefault(key, []).append(elapsed)
+            else:
+                player = self.manager.player if self.manager else None
+                week = player.week_number if player is not None else 0
+                total, count = self.week_frames.get(week, (0.0, 0))
+                self.week_frames[week] = (total + elapsed, count + 1)
+        self.last_present_scene = scene
+        self.last_present_time = now
+
+    # ---------------- 操作 ----------------
+    def before_poll(self, scene):
+        self.mouse.pressed = (False, False, False)
+        if scene is not self.scene:
+            self.scene = scene
+            self.scene_frames = 0
+            self.on_enter(scene)
+        self.scene_frames += 1
+        if self.scene_frames > self.MAX_SCENE_FRAMES:
+            raise RuntimeError(f"第 {self.game} 局卡在 {type(scene).__name__}（{self.scene_frames} 幀沒有離開）")
+        if self.scene_frames < 2:
+            return  # 先讓場景完整畫出一幀，切換延遲才量得到新場景的第一個畫面
+        if (self.scene_frames - 2) % self.RETRY_FRAMES == 0 or type(scene).__name__ in ("StoryScene", "GradingScene", "LuckyWheelScene"):
+            self.act(scene)
+
+    def on_enter(self, scene):
+        name = type(scene).__name__
+        if name == "CharacterSelectScene":
+            self.game += 1
+            self.game_started = time.perf_counter()
+            self.diary_visited = False
+            self.end_plan = []
+            if self.rank_every and self.game % self.rank_every == 0:
+                self.end_plan.append("SHOW_RANK")
+            self.end_plan.append("ADVICE")
+            self.end_plan.append("QUIT" if self.game >= self.games else "RESTART")
+
+    def click(self, pos):
+        apply_action(self.mouse, "click", pos)
+
+    def key(self, key):
+        apply_action(self.mouse, "key", key)
+
+    def act(self, scene):
+        name = type(scene).__name__
+        if name == "StartScene":
+            self.click(next(btn["rect"].center for btn in scene.buttons if btn["action"] == "START"))
+        elif name == "CharacterSelectScene":
+            self.click(scene.characters[(self.game - 1) % len(scene.characters)]["box"].center)
+        elif name == "MainScene":
+            if not self.diary_visited and scene.player.week_number >= self.diary_week:
+                self.diary_visited = True
+                self.click(scene.diary_rect.center)
+            else:
+                self.click(scene.next_week_button.rect.center)
+        elif name == "DiaryScene":
+            self.click(scene.btn_back.rect.center)
+        elif name == "StoryScene":
+            self.key(pygame.K_SPACE)  # 第一次顯示全部文字，第二次離開
+        elif name == "EventScene":
+            button, _ = self.rng.choice(scene.buttons)
+            self.click(button.rect.center)
+        elif name == "LuckyWheelScene":
+            if scene.result_text:
+                self.key(pygame.K_SPACE)
+            elif not scene.has_spinned:
+                self.click(scene.center)
+        elif name == "TakeTestScene":
+            self.key(pygame.K_RETURN)
+        elif name == "GradingScene":
+            if scene.show_full_score:
+                self.click((600, 400))
+            else:
+                scene.displayed_score = int(scene.score)  # 跳過跳分動畫
+        elif name == "EndScene":
+            if self.scene_frames != 2:
+                return  # 結局每次進場只按一個按鈕
+            action = self.end_plan.pop(0)
+            if action in ("RESTART", "QUIT"):
+                self.finish_game()
+            self.click(next(btn["rect"].center for btn in scene.buttons if btn["action"] == action))
+        elif name == "RankScene":
+            self.key(pygame.K_ESCAPE)
+        elif name == "AdviceScene":
+            if not scene.is_loading:
+                self.key(pygame.K_RETURN)  # 等建議產生完再離開
+        else:
+            self.key(pygame.K_ESCAPE)
+
+    def finish_game(self):
+        gc.collect()
+        self.finished_games.append({
+            "game": self.game,
+            "character": self.manager.player.name if self.manager and self.manager.player else None,
+            "wall_s": round(time.perf_counter() - self.game_started, 3),
+            "rss_mb": current_rss_mb(),
+            "gc_objects": len(gc.get_objects()),
+        })
+
+
+def _proc_status_mb(field):
+    """從 /proc/self/status 讀記憶體欄位（MB）；非 Linux 讀不到時回傳 None
+    （專案根目錄的 resource 資料夾會蓋掉標準函式庫的 resource 模組，所以不用 getrusage）"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def current_rss_mb():
+    return _proc_status_mb("VmRSS")
+
+
+def peak_rss_mb():
+    return _proc_status_mb("VmHWM")
+
+
+def stub_advice():
+    """AI 建議改回傳固定文字，不連網也不受 API 延遲影響"""
+    import services.feedback_generator as feedback_generator
+    feedback_generator.generate_final_advice = lambda player, on_delta=None, **kwargs: STUB_ADVICE
+    feedback_generator.generate_weekly_advice = lambda player, week, on_delta=None, **kwargs: STUB_ADVICE
+
+
+def cache_stats():
+    from UI.components.text_cache import TextCache
+    from UI.components.transform_cache import TransformCache
+    from UI.components.font_registry import FontRegistry
+    from UI.components.character_animator import CharacterAnimator
+    from UI.components.surface_memory import SurfaceMemory
+    return {
+        "text_cache": TextCache.get_instance().stats(),
+        "transform_cache": TransformCache.get_instance().stats(),
+        "font_registry": FontRegistry.get_instance().stats(),
+        "character_animator": {
+            "cached_animations": len(CharacterAnimator._frame_cache),
+            "frame_loads": CharacterAnimator.frame_loads,
+        },
+        "surface_memory": dict(SurfaceMemory.get_instance().stats(), top_owners=SurfaceMemory.get_instance().by_owner()),
+    }
+
+
+def summarize_ms(values):
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "max_ms": round(max(values), 3),
+    }
+
+
+def trend(games, key):
+    """前 1/4 與後 1/4 局數的平均值，用來看是否越玩越慢或記憶體一路上升"""
+    values = [g[key] for g in games if g[key] is not None]
+    if len(values) < 4:
+        return None
+    quarter = len(values) // 4
+    return {
+        "first_quarter": round(sum(values[:quarter]) / quarter, 3),
+        "last_quarter": round(sum(values[-quarter:]) / quarter, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="以虛擬時鐘快轉的完整遊玩壓力測試")
+    parser.add_argument("--games", type=int, default=10, help="連續玩幾局")
+    parser.add_argument("--rank-every", type=int, default=10, help="每幾局看一次排行（會重跑模擬，較慢；0 表示不看）")
+    parser.add_argument("--diary-week", type=int, default=5, help="每局在第幾週打開一次日記")
+    parser.add_argument("--seed", type=int, default=0, help="事件選項的亂數種子")
+    parser.add_argument("--out", help="輸出 JSON 檔（預設印到 stdout）")
+    parser.add_argument("--verbose", action="store_true", help="保留遊戲本身的 print 輸出")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    pygame.display.init()
+    pygame.font.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass  # 沒有音效裝置時照樣可以跑，只是沒有聲音
+    screen = RenderTarget.get_instance().create_display()
+
+    # 排行場景的模擬圖表寫到暫存目錄（必須在 import AI.simulation 之前設定）
+    setting.SIMULATION_PLOTS_DIR = tempfile.mkdtemp(prefix="playthrough_plots_")
+    # 虛擬時鐘不會真的等待，閒置降速也要關掉（閒置 CPU 由 bench_scenes.py --idle-seconds 量）
+    setting.IDLE_THROTTLE = False
+    stub_advice()
+
+    clock = VirtualClock()
+    clock.install()
+    mouse = VirtualMouse()
+    mouse.install()
+    pilot = Pilot(mouse, args.games, args.rank_every, args.diary_week, args.seed)
+    pilot.install()
+
+    from scene_manager import SceneManager
+    manager = SceneManager(screen)
+    pilot.manager = manager
+    # FirstScene 不是 BaseScene，先放一個按鍵讓它直接進入開始畫面
+    apply_action(mouse, "key", pygame.K_SPACE)
+
+    start = time.perf_counter()
+    try:
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+                asyncio.run(manager.run())
+    finally:
+        pilot.uninstall()
+        mouse.uninstall()
+        clock.uninstall()
+    total_s = time.perf_counter() - start
+
+    games = pilot.finished_games
+    report = {
+        "games": len(games),
+        "total_wall_s": round(total_s, 3),
+        "virtual_time_s": round(clock.now / 1000, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "final_rss_mb": current_rss_mb(),
+        "trend": {
+            "wall_s": trend(games, "wall_s"),
+            "rss_mb": trend(games, "rss_mb"),
+            "gc_objects": trend(games, "gc_objects"),
+        },
+        "transitions": {key: summarize_ms(values) for key, values in sorted(pilot.transitions.items())},
+        "week_frame_avg_ms": {week: round(total / count, 3) for week, (total, count) in sorted(pilot.week_frames.items())},
+        "scene_manager": manager.transition_stats(),
+        "caches": cache_stats(),
+        "per_game": games,
+    }
+    print(f"✅ {len(games)} 局，{total_s:.1f} 秒，峰值記憶體 {report['peak_rss_mb']} MB", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+場景效能基準測試 - 不需要螢幕與真人操作
+
+在 SDL dummy driver 下逐一啟動各場景，依照腳本送出滑鼠移動、點擊與按鍵事件，
+關掉 clock.tick 的等待後跑固定幀數，最後以 JSON 輸出每個場景的幀時間分佈。
+
+--idle-seconds 另外以真的時鐘讓靜態場景（打完字的故事、日記、設定、回饋）閒置，
+比較固定幀率與閒置降速（UI/components/frame_scheduler.py）時的 CPU 使用率與實際幀率。
+（dummy driver 沒有真正的等待事件，SDL 會每毫秒輪詢一次，閒置時的 CPU 比實際視窗高一些）
+
+--render-scale 以較低的內部解析度跑（UI/components/render_target.py）：draw 階段畫在縮小的畫布上，
+flip 階段包含把畫布放大到視窗的時間。
+
+用法：
+    python bench_scenes.py                       # 跑全部場景，結果印到 stdout
+    python bench_scenes.py main wheel --frames 600 --out bench.json
+    python bench_scenes.py story diary set feedback --idle-seconds 5
+    python bench_scenes.py --render-scale 0.5 --out bench_half.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# 添加專案根目錄到路徑
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR)
+
+import pygame
+import setting
+from UI.components.frame_profiler import FrameProfiler, percentile
+from UI.components.frame_scheduler import FrameScheduler
+from UI.components.render_target import RenderTarget
+
+
+class NoWaitClock:
+    """取代場景的 pygame.time.Clock：tick 不等待，回傳一幀應有的毫秒數"""
+
+    def __init__(self):
+        self._last = 0
+
+    def tick(self, fps=0):
+        self._last = int(1000 / fps) if fps else 0
+        return self._last
+
+    def get_time(self):
+        return self._last
+
+    def get_fps(self):
+        return 1000 / self._last if self._last else 0.0
+
+
+class VirtualMouse:
+    """dummy driver 下無法移動真正的滑鼠，改由腳本控制 get_pos / get_pressed 的結果"""
+
+    def __init__(self):
+        self.pos = (0, 0)
+        self.pressed = (False, False, False)
+        self._originals = None
+
+    def install(self):
+        self._originals = (pygame.mouse.get_pos, pygame.mouse.get_pressed)
+        pygame.mouse.get_pos = lambda: self.pos
+        pygame.mouse.get_pressed = lambda num_buttons=3: self.pressed
+
+    def uninstall(self):
+        if self._originals is not None:
+            pygame.mouse.get_pos, pygame.mouse.get_pressed = self._originals
+            self._originals = None
+
+
+def apply_action(mouse, action, arg):
+    """把一個腳本動作轉成 pygame 事件；click 只在這一幀按住左鍵"""
+    if action == "move":
+        mouse.pos = arg
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=arg, rel=(0, 0), buttons=(0, 0, 0)))
+    elif action == "click":
+        mouse.pos = arg
+        mouse.pressed = (True, False, False)
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=arg, button=1))
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=arg, button=1))
+    elif action == "key":
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=arg, mod=0, unicode="", scancode=0))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=arg, mod=0, unicode="", scancode=0))
+
+
+def make_player():
+    """合成一個玩到第 3 週、已有期中與期末成績的角色，讓每個場景都有資料可以畫"""
+    from character import Bubu
+    player = Bubu()
+    player.week_number = 3
+    player.week_data = player.all_weeks_data[f"week_{player.week_number}"]
+    player.event_history = {
+        1: {"event_text": "第一週的事件", "option_text": "去上課", "changes": {"mood": 3, "energy": -5, "social": 0, "knowledge": 6}},
+        2: {"event_text": "第二週的事件", "option_text": "跟朋友出去玩", "changes": {"mood": 8, "energy": -10, "social": 5, "knowledge": 0}},
+    }
+    player.last_week_change = [8, -10, 5, 0]
+    player.midterm = 72
+    player.final = 65
+    player.calculate_GPA()
+    return player
+
+
+def build_scenes(screen, player):
+    """場景名稱 -> (建立場景的函式, 事件腳本 [(幀數, 動作, 參數)])"""
+    from UI.start_scene import StartScene
+    from UI.character_select import CharacterSelectScene
+    from UI.main_scene import MainScene
+    from UI.story_scene import StoryScene
+    from UI.event_scene import EventScene
+    from UI.rank_scene import RankScene
+    from UI.lucky_wheel_scene import LuckyWheelScene
+    from UI.diary_scene import DiaryScene
+    from UI.end_scene import EndScene
+    from UI.advice_scene import AdviceScene
+    from UI.taketest_scene import TakeTestScene, GradingScene
+    from UI.set_scene import SetScene
+    from UI.feedback_scene import FeedbackScene
+
+    wheel_options = ["超可愛學姐\n帥潮學長", "看起來是系邊\n有點宅宅的學長", "超搞笑的系核\n第一次見面\n就表演倒立走路", "卷哥卷姐", "被放生了"]
+    return {
+        "start": (lambda: StartScene(screen), [
+            (10, "move", (750, 480)), (40, "move", (750, 580)), (70, "move", (100, 100)),
+        ]),
+        "select": (lambda: CharacterSelectScene(screen), [
+            (10, "move", (200, 400)), (40, "move", (500, 400)), (70, "move", (800, 400)), (100, "move", (1100, 400)),
+        ]),
+        "main": (lambda: MainScene(screen, player), [
+            (10, "move", (75, 725)), (12, "click", (75, 725)), (30, "move", (400, 400)),
+            (50, "click", (400, 400)), (80, "move", (1100, 730)), (110, "click", (550, 650)),
+            (140, "move", (600, 100)),
+        ]),
+        "story": (lambda: StoryScene(screen, player), [
+            (90, "key", pygame.K_SPACE),
+        ]),
+        "event": (lambda: EventScene(screen, player), [
+            (30, "move", (600, 500)), (60, "move", (600, 600)), (90, "move", (600, 700)),
+        ]),
+        "rank": (lambda: RankScene(screen, player), [
+            (30, "key", pygame.K_DOWN), (90, "key", pygame.K_2), (150, "key", pygame.K_UP), (210, "key", pygame.K_1),
+        ]),
+        "wheel": (lambda: LuckyWheelScene(screen, wheel_options), [
+            (5, "click", (600, 400)),
+        ]),
+        "diary": (lambda: DiaryScene(screen, player), [
+            (10, "move", (140, 740)), (20, "click", (140, 740)), (60, "move", (1020, 740)),
+            (70, "click", (1020, 740)), (100, "move", (600, 400)),
+        ]),
+        "end": (lambda: EndScene(screen, player), [
+            (10, "move", (850, 360)), (40, "move", (850, 460)), (60, "click", (75, 725)), (90, "move", (100, 100)),
+        ]),
+        "advice": (lambda: AdviceScene(screen, player), [
+            (30, "move", (600, 400)),
+        ]),
+        "taketest": (lambda: TakeTestScene(screen, player), []),
+        "grading": (lambda: GradingScene(screen, player), []),
+        "set": (lambda: SetScene(screen, screen.copy(), player), [
+            (10, "move", (600, 320)), (40, "move", (240, 200)), (70, "move", (100, 700)),
+        ]),
+        "feedback": (lambda: FeedbackScene(screen, player), []),
+    }
+
+
+# 閒置 CPU 測試的場景與開頭的輸入（故事先按一次鍵把字打完）
+IDLE_SCRIPTS = {
+    "story": [(1, "key", pygame.K_SPACE)],
+    "diary": [],
+    "set": [],
+    "feedback": [],
+}
+
+
+def run_scene(scene, script, frames, mouse):
+    """逐幀推進場景的 run() coroutine，回傳每幀耗時（毫秒）與場景的回傳值"""
+    scene.clock = NoWaitClock()
+    actions = {}
+    for frame, action, arg in script:
+        actions.setdefault(frame, []).append((action, arg))
+
+    coro = scene.run()
+    times = []
+    result = None
+    try:
+        for i in range(frames):
+            mouse.pressed = (False, False, False)
+            for action, arg in actions.get(i, ()):
+                apply_action(mouse, action, arg)
+            start = time.perf_counter()
+            try:
+                coro.send(None)
+            except StopIteration as stop:
+                result = stop.value
+                times.append((time.perf_counter() - start) * 1000)
+                break
+            times.append((time.perf_counter() - start) * 1000)
+    finally:
+        coro.close()
+    return times, result
+
+
+def run_idle(scene, script, seconds, mouse):
+    """用真的時鐘跑場景：先送完腳本並等過 IDLE_GRACE_MS，再量 seconds 秒的 CPU 使用率與實際幀率"""
+    actions = {}
+    for frame, action, arg in script:
+        actions.setdefault(frame, []).append((action, arg))
+
+    coro = scene.run()
+    settle_until = time.perf_counter() + setting.IDLE_GRACE_MS / 1000 + 0.5
+    frames = 0
+    measured = 0
+    wall_start = cpu_start = None
+    try:
+        while True:
+            now = time.perf_counter()
+            if wall_start is None and now >= settle_until:
+                wall_start, cpu_start, measured = now, time.process_time(), 0
+            elif wall_start is not None and now - wall_start >= seconds:
+                break
+            mouse.pressed = (False, False, False)
+            for action, arg in actions.get(frames, ()):
+                apply_action(mouse, action, arg)
+            try:
+                coro.send(None)
+            except StopIteration:
+                break
+            frames += 1
+            measured += 1
+    finally:
+        coro.close()
+    if wall_start is None:
+        return {"seconds": 0}
+    wall = time.perf_counter() - wall_start
+    return {
+        "seconds": round(wall, 2),
+        "fps": round(measured / wall, 1),
+        "cpu_percent": round((time.process_time() - cpu_start) / wall * 100, 1),
+    }
+
+
+def summarize(times, budget_ms):
+    if not times:
+        return {"frames": 0}
+    return {
+        "frames": len(times),
+        "mean_ms": round(sum(times) / len(times), 3),
+        "p50_ms": round(percentile(times, 50), 3),
+        "p90_ms": round(percentile(times, 90), 3),
+        "p95_ms": round(percentile(times, 95), 3),
+        "p99_ms": round(percentile(times, 99), 3),
+        "max_ms": round(max(times), 3),
+        "over_budget": sum(1 for t in times if t > budget_ms),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="無頭場景效能基準測試")
+    parser.add_argument("scenes", nargs="*", help="只跑指定的場景（預設全部）")
+    parser.add_argument("--frames", type=int, default=300, help="每個場景最多跑幾幀")
+    parser.add_argument("--idle-seconds", type=float, default=0,
+                        help="靜態場景閒置幾秒來量 CPU 使用率（0 表示不量）")
+    parser.add_argument("--render-scale", type=float, help="內部解析度相對 1200×800 的比例（預設用 setting.RENDER_SCALE）")
+    parser.add_argument("--out", help="輸出 JSON 檔（預設印到 stdout）")
+    args = parser.parse_args()
+    if args.render_scale is not None:
+        setting.RENDER_SCALE = args.render_scale
+
+    pygame.display.init()
+    pygame.font.init()
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pass  # 沒有音效裝置時照樣可以跑，只是沒有聲音
+    render_target = RenderTarget.get_instance()
+    screen = render_target.create_display()
+
+    profiler = FrameProfiler.get_instance()
+    scheduler = FrameScheduler.get_instance()
+
+    # RankScene 會重跑模擬並輸出圖表；改寫到暫存目錄，不要蓋掉專案裡的 simulation_plots
+    # （必須在 import AI.simulation 之前設定，它的預設輸出目錄是在 import 時決定的）
+    setting.SIMULATION_PLOTS_DIR = tempfile.mkdtemp(prefix="bench_plots_")
+
+    scenes = build_scenes(screen, make_player())
+    names = args.scenes or list(scenes)
+    unknown = [name for name in names if name not in scenes]
+    if unknown:
+        parser.error(f"未知場景：{', '.join(unknown)}（可用：{', '.join(scenes)}）")
+
+    mouse = VirtualMouse()
+    mouse.install()
+    report = {
+        "frames_per_scene": args.frames,
+        "budget_ms": round(profiler.FRAME_BUDGET_MS, 3),
+        "scenes": {},
+    }
+    try:
+        scheduler.enabled = False  # NoWaitClock 量的是每幀的工作時間，不能閒置等待
+        for name in names:
+            factory, script = scenes[name]
+            start = time.perf_counter()
+            scene = factory()
+            load_ms = (time.perf_counter() - start) * 1000
+            times, result = run_scene(scene, script, args.frames, mouse)
+            entry = summarize(times, profiler.FRAME_BUDGET_MS)
+            entry["load_ms"] = round(load_ms, 3)
+            entry["result"] = result if isinstance(result, (str, int, float, type(None))) else repr(result)
+            phases = profiler.summary().get(type(scene).__name__)
+            if phases is not None:
+                entry["phases_p95_ms"] = {phase: values["p95"] for phase, values in phases["phases"].items()}
+            report["scenes"][name] = entry
+            print(f"✅ {name:10s} {entry['frames']:4d} 幀  p50 {entry.get('p50_ms', 0):7.3f} ms  p99 {entry.get('p99_ms', 0):7.3f} ms", file=sys.stderr)
+
+        if args.idle_seconds > 0:
+            report["idle"] = {}
+            for name in (name for name in names if name in IDLE_SCRIPTS):
+                entry = {}
+                for mode, enabled in (("fixed", False), ("adaptive", True)):
+                    scheduler.enabled = enabled
+                    entry[mode] = run_idle(scenes[name][0](), IDLE_SCRIPTS[name], args.idle_seconds, mouse)
+                report["idle"][name] = entry
+                print(f"💤 {name:10s} CPU {entry['fixed'].get('cpu_percent')}% → {entry['adaptive'].get('cpu_percent')}%  "
+                      f"{entry['fixed'].get('fps')} → {entry['adaptive'].get('fps')} FPS", file=sys.stderr)
+            report["idle_scheduler"] = scheduler.stats()
+        report["render_target"] = render_target.stats()
+    finally:
+        mouse.uninstall()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
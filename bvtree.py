@@ -1,5 +1,6 @@
 import random
 import copy
+import weakref
 
 
 class ConservativePolicy:
@@ -53,8 +54,9 @@ class AggressivePolicy:
         self.epsilon = epsilon
         # 全域預設（僅在沒有 per-player 設定時使用）
         self.focus_action = focus_action
-        # 針對每位玩家的偏好極端行為：{ id(player): action }
-        self._focus_for_player: dict[int, str] = {}
+        # 針對每位玩家的偏好極端行為：{ player: action }
+        # 用弱參照：玩家物件被回收後自動移除，不會無限成長，也不會因 id() 重複而沿用舊玩家的偏好
+        self._focus_for_player: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
     
     def choose(self, player, actions: list[str], week_index: int) -> str:
         """
@@ -66,7 +68,7 @@ class AggressivePolicy:
         # 本模式不做隨機探索：持續執行偏好極端行為直到需要修正
 
         # 依玩家設定或初始化偏好極端行為（首次隨機選一個）
-        pid = id(player)
+        pid = player
         if pid not in self._focus_for_player or self._focus_for_player[pid] not in actions:
             # 若有外部指定的偏好，優先使用；否則隨機選一個
             self._focus_for_player[pid] = self.focus_action if (self.focus_action in actions) else random.choice(actions)
@@ -2,27 +2,47 @@ import pygame
 from scene_manager import SceneManager
 import setting
 import asyncio
+from UI.components.font_registry import get_font, FontRegistry
+from UI.components.frame_profiler import FrameProfiler
+from UI.components.surface_memory import SurfaceMemory
+from UI.components.audio_manager import AudioManager
+from UI.components.audio_bank import AudioBank
+from UI.components.frame_scheduler import FrameScheduler
+from UI.components.render_target import RenderTarget
 
 async def main():
     await asyncio.sleep(0)
     pygame.display.init()
     pygame.font.init()
     
-    screen = pygame.display.set_mode((setting.SCREEN_WIDTH, setting.SCREEN_HEIGHT))
+    # RENDER_SCALE < 1 時 screen 是縮小的畫布（ScaledCanvas），送出時才放大到視窗
+    render_target = RenderTarget.get_instance()
+    screen = render_target.create_display()
     pygame.display.set_caption("Lazy Me Today Too")
     # 預防黑屏：顯示簡單載入畫面
     try:
         screen.fill((20, 20, 24))
-        font = pygame.font.SysFont(None, 36)
+        font = get_font(None, 36)
         text = font.render("Loading... 點一下開始", True, (230, 230, 230))
         rect = text.get_rect(center=(setting.SCREEN_WIDTH//2, setting.SCREEN_HEIGHT//2))
         screen.blit(text, rect)
-        pygame.display.flip()
+        render_target.flip()
     except Exception as _:
         pass
+    # 趁載入畫面在背景解碼音效
+    AudioManager.get_instance()
     
     manager = SceneManager(screen)
     if await manager.run() == "QUIT":
+        print(f"[FontRegistry] {FontRegistry.get_instance().stats()}")
+        print(f"[SceneManager] {manager.transition_stats()}")
+        print(f"[SurfaceMemory] {SurfaceMemory.get_instance().stats()}")
+        print(f"[AudioBank] {AudioBank.get_instance().stats()}")
+        print(f"[FrameScheduler] {FrameScheduler.get_instance().stats()}")
+        print(f"[RenderTarget] {render_target.stats()}")
+        profiler = FrameProfiler.get_instance()
+        if profiler.dump_on_exit:
+            print(f"[FrameProfiler] 幀時間統計已寫入 {profiler.dump()}")
         pygame.quit()
         
 
@@ -0,0 +1,145 @@
+# build_glyph_atlas.py
+# 這個程式會收集遊戲中用到的所有文字（events.json、SpeechBubble 語錄、各場景字串），
+# 依照每一組 (字型, 字級) 預先點陣化成字形圖集，存到 resource/font/atlas/。
+
+import ast
+import json
+import os
+import re
+import string
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+sys.path.insert(0, ROOT_DIR)
+import setting
+
+ATLAS_WIDTH = 1024
+PADDING = 1
+
+# 只處理中文手寫字型，英文字型本身點陣化成本不高
+ATLAS_FONTS = {
+    "JFONT_PATH_BOLD": setting.JFONT_PATH_BOLD,
+    "JFONT_PATH_REGULAR": setting.JFONT_PATH_REGULAR,
+    "JFONT_PATH_Light": setting.JFONT_PATH_Light,
+    "HFONT_PATH": setting.HFONT_PATH,
+    "CFONT_PATH": setting.CFONT_PATH,
+}
+
+FONT_CALL = re.compile(r"get_font\(\s*setting\.(\w+)\s*,\s*(\d+)\s*\)")
+
+
+def source_files():
+    for folder, _, files in os.walk(ROOT_DIR):
+        if "__pycache__" in folder or os.sep + "." in folder:
+            continue
+        for name in files:
+            if name.endswith(".py"):
+                yield os.path.join(folder, name)
+
+
+def collect_strings(value, out):
+    if isinstance(value, str):
+        out.append(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            collect_strings(v, out)
+    elif isinstance(value, list):
+        for v in value:
+            collect_strings(v, out)
+
+
+def collect_chars():
+    """events.json 的所有字串 + 程式碼中的字串常值（含 SpeechBubble 語錄與場景文字）"""
+    texts = []
+    with open(os.path.join(ROOT_DIR, "event", "events.json"), encoding="utf-8") as f:
+        collect_strings(json.load(f), texts)
+
+    for path in source_files():
+        with open(path, encoding="utf-8") as f:
+            try:
+                tree = ast.parse(f.read())
+            except SyntaxError:
+                continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                texts.append(node.value)
+
+    chars = set(string.printable) | set("".join(texts))
+    return sorted(ch for ch in chars if ch.isprintable())
+
+
+def collect_targets():
+    """從程式碼中找出所有 get_font(setting.XXX, size) 的組合"""
+    targets = set()
+    for path in source_files():
+        with open(path, encoding="utf-8") as f:
+            for name, size in FONT_CALL.findall(f.read()):
+                if name in ATLAS_FONTS:
+                    targets.add((ATLAS_FONTS[name], int(size)))
+    return sorted(targets)
+
+
+def atlas_name(font_path, size):
+    return f"{os.path.splitext(os.path.basename(font_path))[0]}_{size}"
+
+
+def build_atlas(font_path, size, chars, out_dir):
+    font = pygame.font.Font(font_path, size)
+    height = font.get_height()
+
+    # 白色字形，執行時再用 BLEND_RGBA_MULT 上色
+    glyphs = []
+    for ch in chars:
+        try:
+            surf = font.render(ch, True, (255, 255, 255))
+        except pygame.error:
+            continue  # 零寬度字元（如變體選擇符）不放進圖集
+        glyphs.append((ch, surf))
+
+    glyph_info = {}
+    x = y = 0
+    for ch, surf in glyphs:
+        w = surf.get_width()
+        if x + w > ATLAS_WIDTH:
+            x = 0
+            y += height + PADDING
+        glyph_info[ch] = [x, y, w, height]
+        x += w + PADDING
+
+    atlas = pygame.Surface((ATLAS_WIDTH, y + height), pygame.SRCALPHA)
+    atlas.fill((255, 255, 255, 0))
+    for ch, surf in glyphs:
+        gx, gy, _, _ = glyph_info[ch]
+        atlas.blit(surf, (gx, gy))
+
+    name = atlas_name(font_path, size)
+    pygame.image.save(atlas, os.path.join(out_dir, name + ".png"))
+    with open(os.path.join(out_dir, name + ".json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "font": os.path.basename(font_path),
+            "size": size,
+            "height": height,
+            "glyphs": glyph_info,
+        }, f, ensure_ascii=False)
+    return len(glyph_info), atlas.get_height()
+
+
+if __name__ == "__main__":
+    pygame.init()
+    out_dir = setting.GLYPH_ATLAS_DIR
+    os.makedirs(out_dir, exist_ok=True)
+
+    chars = collect_chars()
+    targets = collect_targets()
+    print(f"🔍 共收集到 {len(chars)} 個字元、{len(targets)} 組字型與字級，開始處理...")
+    for font_path, size in targets:
+        if not os.path.exists(font_path):
+            print(f"😥 找不到字型檔：{font_path}，略過")
+            continue
+        count, h = build_atlas(font_path, size, chars, out_dir)
+        print(f"✅ {atlas_name(font_path, size)}：{count} 個字形，圖集大小 {ATLAS_WIDTH}x{h}")
+    print("🎉 所有字形圖集都處理完成啦！")
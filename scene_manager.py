@@ -15,6 +15,8 @@ from UI.end_scene import EndScene
 from UI.feedback_scene import FeedbackScene
 from UI.advice_scene import AdviceScene
 import asyncio
+import time
+from tracer import span
 
 # scene_manager.py
 class SceneManager:
@@ -39,6 +41,38 @@ class SceneManager:
             "QUIT": self.quit_game,
             "DIARY": self.diary_scene
         }
+        # 重複使用的場景：素材只在第一次建立時載入，之後透過 reset() / enter() 重新進場
+        self.scene_pool = {}
+        self.transition_times = []  # [(場景類別名稱, 建立或重設所花的毫秒數)]
+
+    def acquire_scene(self, scene_cls, *args):
+        """取得場景實例：第一次建立並放進 pool，之後以 reset(*args) 重複使用"""
+        start = time.perf_counter()
+        scene = self.scene_pool.get(scene_cls)
+        if scene is None:
+            with span(f"create {scene_cls.__name__}", "scene"):
+                scene = scene_cls(self.screen, *args)
+            self.scene_pool[scene_cls] = scene
+        else:
+            with span(f"reset {scene_cls.__name__}", "scene"):
+                scene.reset(*args)
+        scene.enter()
+        self.transition_times.append((scene_cls.__name__, (time.perf_counter() - start) * 1000))
+        return scene
+
+    def transition_stats(self):
+        """各場景切換延遲（毫秒）：第一次建立與之後重複使用分開統計"""
+        times_by_scene = {}
+        for name, ms in self.transition_times:
+            times_by_scene.setdefault(name, []).append(ms)
+        return {
+            name: {
+                "first_ms": round(times[0], 2),
+                "reuses": len(times) - 1,
+                "reuse_avg_ms": round(sum(times[1:]) / (len(times) - 1), 2) if len(times) > 1 else None,
+            }
+            for name, times in times_by_scene.items()
+        }
 
     async def run(self):
         # print("SceneManager 開始跑了")
@@ -48,10 +82,13 @@ class SceneManager:
             # print(f"[SceneManager] 下一個場景是：{next_scene}") 
             handler = self.scene_map.get(next_scene)
             if handler:
-                next_scene = await handler()
+                # 一個 span 涵蓋這個流程節點的進場到離場（包含其中建立的子場景）
+                with span(next_scene, "scene"):
+                    next_scene = await handler()
             else:
                 print(f"未知場景：{next_scene}")
                 self.running = False
+        return next_scene
 
     # --- 各個場景 ---
     async def first_scene(self):
@@ -102,7 +139,7 @@ class SceneManager:
         if self.player.week_number >= 16:
             return "END"
 
-        scene = MainScene(self.screen, self.player)
+        scene = self.acquire_scene(MainScene, self.player)
         result = await scene.run()
 
         return {
@@ -123,7 +160,7 @@ class SceneManager:
     async def setting_scene(self):
         from UI.components.blur import fast_blur
         blurred = fast_blur(self.screen.copy())
-        set_scene = SetScene(self.screen, blurred, self.player)
+        set_scene = self.acquire_scene(SetScene, blurred, self.player)
         result = await set_scene.run()
         # print(f"[SceneManager] SetScene 回傳：{result}") 
         return {
@@ -136,7 +173,7 @@ class SceneManager:
     
     async def diary_scene(self):
         # print("進入日記場景")
-        scene = DiaryScene(self.screen, self.player)
+        scene = self.acquire_scene(DiaryScene, self.player)
         result = await scene.run()
         #return "MAIN" if result == "BACK" else result
         if  self.player.week_number < 16:
@@ -154,7 +191,7 @@ class SceneManager:
         if not self.player.GPA:
             self.player.calculate_GPA()
 
-        scene = EndScene(self.screen, self.player)
+        scene = self.acquire_scene(EndScene, self.player)
         result = await scene.run()
         return {
             "DIARY": "DIARY",
@@ -0,0 +1,166 @@
+"""
+AI 建議的磁碟快取（SQLite）
+
+同樣的情境（角色、週數、選項、屬性區間）在不同玩家之間一直重複出現，
+把 API 回覆以「正規化後的 prompt 輸入」的雜湊為 key 存起來，下次直接回傳，不用再等 API、也不用再付費。
+
+- 有效期限（TTL）過了就視為沒有快取
+- 超過 max_entries 時淘汰最久沒用到的
+- WAL 模式 + 一把鎖：遊戲的背景執行緒與同時開著的多個遊戲都能安全存取
+- 記錄命中率
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import setting
+
+try:
+    import sqlite3
+except ImportError:  # 部分網頁環境沒有 sqlite3，就不使用快取
+    sqlite3 = None
+
+
+def stat_bucket(value, size=10):
+    """把屬性值歸到區間（預設 10 分一格），讓相近的狀態共用同一份建議"""
+    try:
+        return int(value // size * size)
+    except TypeError:
+        return None
+
+
+def make_key(kind, inputs):
+    """把 prompt 的輸入正規化（排序 key、去掉字串前後空白）後取 SHA-256"""
+    def normalize(value):
+        if isinstance(value, str):
+            return value.strip()
+        if isinstance(value, float):
+            return round(value, 2)
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+
+    payload = json.dumps({"kind": kind, "inputs": normalize(inputs)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AdviceCache:
+    _instance = None  # 單例
+
+    def __init__(self, path=None, ttl_s=None, max_entries=None):
+        if AdviceCache._instance is not None:
+            raise Exception("AdviceCache 是單例，請使用 get_instance() 取得")
+        self.path = path or setting.ADVICE_CACHE_PATH
+        self.ttl_s = ttl_s or setting.ADVICE_CACHE_TTL_S
+        self.max_entries = max_entries or setting.ADVICE_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = self._open()
+        AdviceCache._instance = self
+
+    @staticmethod
+    def get_instance():
+        if AdviceCache._instance is None:
+            AdviceCache()
+        return AdviceCache._instance
+
+    def _open(self):
+        if sqlite3 is None or not self.path:
+            return None
+        try:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS advice ("
+                " key TEXT PRIMARY KEY,"
+                " kind TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " created REAL NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " hits INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS advice_last_used ON advice(last_used)")
+            conn.execute("DELETE FROM advice WHERE created < ?", (time.time() - self.ttl_s,))
+            return conn
+        except (sqlite3.Error, OSError) as e:
+            print(f"警告：無法開啟建議快取 {self.path}，本次不使用快取（{e}）")
+            return None
+
+    @property
+    def enabled(self):
+        return self._conn is not None
+
+    def get(self, key):
+        """回傳快取的建議；沒有或已過期時回傳 None"""
+        if self._conn is None:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT text FROM advice WHERE key = ? AND created >= ?", (key, now - self.ttl_s)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("UPDATE advice SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key, kind, text):
+        if self._conn is None or not text:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO advice (key, kind, text, created, last_used, hits) VALUES (?, ?, ?, ?, ?, 0)",
+                    (key, kind, text, now, now),
+                )
+                count = self._conn.execute("SELECT COUNT(*) FROM advice").fetchone()[0]
+                if count > self.max_entries:
+                    overflow = count - self.max_entries
+                    self._conn.execute(
+                        "DELETE FROM advice WHERE key IN (SELECT key FROM advice ORDER BY last_used LIMIT ?)",
+                        (overflow,),
+                    )
+                    self.evictions += overflow
+        except sqlite3.Error as e:
+            print(f"警告：寫入建議快取失敗（{e}）")
+
+    def clear(self):
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM advice")
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        entries = 0
+        if self._conn is not None:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM advice").fetchone()[0]
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate(), 4),
+        }
@@ -0,0 +1,142 @@
+"""
+每週建議的預先產生
+
+玩家在 EventScene 做完選擇的當下，這週建議需要的資料就都齊了；
+在背景先把建議產生好存進 player.weekly_advice，之後打開日記就能直接看到，不用再等 API。
+
+- 同一位玩家同一週只會有一個請求（日記按 A 時也會共用進行中的請求）
+- 預先產生用自己的執行緒池，同時進行的數量有上限，其餘排隊；
+  日記按 A 這類玩家正在等的請求直接送到 advice_tasks 的執行緒池，不會排在預先產生後面
+  （還在排隊的預先產生被玩家要了，也會移到那邊立刻開始）
+- 網頁版沒有執行緒，不做預先產生（否則會在選完選項後卡住畫面）
+"""
+
+import collections
+import concurrent.futures
+import functools
+import threading
+import weakref
+import setting
+from services.advice_tasks import _generate, _submit, advice_mode
+
+
+class AdviceScheduler:
+    _instance = None  # 單例
+
+    def __init__(self, max_in_flight=None):
+        if AdviceScheduler._instance is not None:
+            raise Exception("AdviceScheduler 是單例，請使用 get_instance() 取得")
+        self.max_in_flight = max_in_flight or setting.ADVICE_PREFETCH_MAX_IN_FLIGHT
+        self._lock = threading.Lock()
+        # player -> {week: Future}（排隊中或進行中）；用弱參照當 key，重生後的新玩家不會因為 id() 重複而拿到舊玩家的請求
+        self._futures = weakref.WeakKeyDictionary()
+        self._queue = collections.deque()  # 等待送出的預先產生 (future, player, week)
+        self._executor = None  # 預先產生專用的執行緒池
+        self._running = 0  # 進行中的預先產生
+        self.scheduled = 0
+        self.deduplicated = 0
+        self.promoted = 0
+        self.completed = 0
+        AdviceScheduler._instance = self
+
+    @staticmethod
+    def get_instance():
+        if AdviceScheduler._instance is None:
+            AdviceScheduler()
+        return AdviceScheduler._instance
+
+    def submit_weekly(self, player, week, prefetch=False):
+        """取得這位玩家這週建議的 Future；已經在排隊或進行中就共用同一個。
+        prefetch=False 表示玩家正在等：不受預先產生的上限限制，馬上開始"""
+        with self._lock:
+            weeks = self._futures.setdefault(player, {})
+            future = weeks.get(week)
+            if future is not None:
+                self.deduplicated += 1
+                job = next((job for job in self._queue if job[0] is future), None)
+                if prefetch or job is None:
+                    return future
+                self._queue.remove(job)  # 還在排隊的預先產生：改成立刻開始
+                self.promoted += 1
+            else:
+                future = concurrent.futures.Future()
+                # 串流中已收到的文字片段，日記可以邊收邊顯示
+                future.stream = [] if setting.ADVICE_STREAM else None
+                weeks[week] = future
+                self.scheduled += 1
+                if prefetch:
+                    self._queue.append((future, player, week))
+        if prefetch:
+            self._pump()
+        else:
+            self._start(future, player, week, prefetch=False)
+        return future
+
+    def prefetch_weekly(self, player, week):
+        """EventScene 記錄完選擇後呼叫：會用到 API 且還沒有這週建議時，先在背景產生"""
+        if advice_mode() == "local":
+            return None
+        if week in getattr(player, "weekly_advice", {}):
+            return None
+        return self.submit_weekly(player, week, prefetch=True)
+
+    def pending(self, player, week):
+        """這週建議是否正在排隊或產生中"""
+        with self._lock:
+            return week in self._futures.get(player, ())
+
+    def _pump(self):
+        """在併發上限內，把排隊中的請求送到背景執行緒"""
+        while True:
+            with self._lock:
+                if self._running >= self.max_in_flight or not self._queue:
+                    return
+                future, player, week = self._queue.popleft()
+                self._running += 1
+            self._start(future, player, week, prefetch=True)
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_in_flight, thread_name_prefix="advice-prefetch")
+        return self._executor
+
+    def _start(self, future, player, week, prefetch):
+        executor = self._get_executor() if prefetch else None
+        # generate_weekly_advice 成功時會自己把結果存進 player.weekly_advice；
+        # budget 模式失敗時丟出錯誤，由 AdviceRequest 退回本機建議，不把錯誤訊息存進去。
+        # feedback_generator（連同 openai）在背景執行緒才 import，選完選項的那一幀不會卡住
+        generate = functools.partial(_generate, "generate_weekly_advice",
+                                     fallback_on_error=advice_mode() != "budget")
+        if future.stream is not None:
+            worker = _submit(generate, player, week, future.stream.append, executor=executor)
+        else:
+            worker = _submit(generate, player, week, executor=executor)
+        worker.add_done_callback(lambda done: self._finish(player, week, future, done, prefetch))
+
+    def _finish(self, player, week, future, done, prefetch):
+        with self._lock:
+            if prefetch:
+                self._running -= 1
+            weeks = self._futures.get(player)
+            if weeks is not None:
+                weeks.pop(week, None)
+                if not weeks:
+                    del self._futures[player]
+            self.completed += 1
+        try:
+            future.set_result(done.result())
+        except Exception as e:
+            future.set_exception(e)
+        self._pump()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "scheduled": self.scheduled,
+                "deduplicated": self.deduplicated,
+                "promoted": self.promoted,
+                "completed": self.completed,
+                "in_flight": self._running,
+                "queued": len(self._queue),
+            }
@@ -0,0 +1,207 @@
+"""
+不阻塞畫面的 AI 建議產生
+
+feedback_generator 的函式會等 API 回應（可能好幾秒），直接在場景裡呼叫會讓整個畫面卡住。
+這裡把它們丟到背景執行緒：
+  - submit_weekly_advice / submit_final_advice 回傳 AdviceRequest，場景每幀 poll() 一次，
+    逾時就改顯示失敗文字，離開場景時 cancel()；串流時 partial 是目前已收到的文字
+  - generate_weekly_advice_async / generate_final_advice_async 給可以 await 的呼叫端使用
+
+ADVICE_MODE 為 budget（預設）時，submit_* 一開始就有本機建議（services/local_advice.py）可以顯示，
+AI 在 ADVICE_UPGRADE_BUDGET_S 秒內完成或開始串流才換成 AI 的文字。
+
+網頁版（pygbag / emscripten）沒有執行緒：submit_* 只使用本機建議，不會等網路；其他呼叫退回同步執行。
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import sys
+import time
+import setting
+from services.api_key import api_configured
+
+THREADS_AVAILABLE = sys.platform != "emscripten"
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="advice")
+    return _executor
+
+
+def _generate(name, *args, fallback_on_error=True):
+    """在背景執行緒呼叫 feedback_generator.<name>；import 也在這裡做，
+    主執行緒才不會因為第一次載入 openai（將近一秒）而卡住畫面"""
+    from services import feedback_generator
+    return getattr(feedback_generator, name)(*args, fallback_on_error=fallback_on_error)
+
+
+def _submit(func, *args, executor=None):
+    """在背景執行緒執行 func（預設用這裡的執行緒池）；沒有執行緒時直接執行，回傳已完成的 Future"""
+    if THREADS_AVAILABLE:
+        return (executor or _get_executor()).submit(func, *args)
+    future = concurrent.futures.Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class AdviceRequest:
+    """一個產生中的建議：poll() 在完成前回傳 None，完成、失敗或逾時後回傳要顯示的文字
+
+    有 local_text（budget 模式）時，partial 一開始就是本機建議；AI 在 budget 秒內完成
+    或開始串流才換成 AI 的文字，否則以本機建議作為結果，失敗或逾時也退回本機建議。
+    """
+
+    def __init__(self, future, timeout, error_text, timeout_text, shared=False, local_text=None, budget=None):
+        self.future = future
+        self.shared = shared  # 和其他呼叫端共用的 Future 不能取消，只是不再等它
+        # 背景執行緒把串流收到的片段 append 進這個 list
+        self.stream = getattr(future, "stream", None)
+        self.local_text = local_text
+        self.partial = local_text or ""
+        self.upgraded = False  # 已經換成 AI 的文字
+        self._stream_count = 0
+        self.timeout = timeout
+        self.deadline = time.monotonic() + (budget if local_text is not None and budget is not None else timeout)
+        self.error_text = error_text
+        self.timeout_text = timeout_text
+        self.result = None
+        self.failed = False
+        self.cancelled = False
+
+    def poll(self):
+        if self.result is not None or self.cancelled:
+            return self.result
+        if self.future.done():
+            try:
+                self.result = self.future.result()
+                self.upgraded = self.local_text is not None and self.result != self.local_text
+            except Exception as e:
+                self._give_up(self.error_text.format(error=e))
+            return self.result
+        if self.stream is not None and len(self.stream) != self._stream_count:
+            # 還在收文字就不算逾時：逾時是指多久沒有新內容，而不是整段要多久
+            self._stream_count = len(self.stream)
+            self.partial = "".join(self.stream[:self._stream_count])
+            self.upgraded = self.local_text is not None
+            self.deadline = time.monotonic() + self.timeout
+        elif time.monotonic() >= self.deadline:
+            # 執行緒沒辦法強制中止，只是不再等它；API 呼叫本身也有同樣的逾時
+            if not self.shared:
+                self.future.cancel()
+            self._give_up(self.timeout_text)
+        return self.result
+
+    def _give_up(self, message):
+        """不再等 AI：有本機建議就用它，沒有才顯示錯誤訊息"""
+        if self.local_text is not None:
+            self.result = self.local_text
+            self.upgraded = False
+        else:
+            self.result = message
+            self.failed = True
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def cancel(self):
+        """玩家離開場景：還沒開始就取消，已經在跑的結果直接丟掉"""
+        if self.result is None:
+            if not self.shared:
+                self.future.cancel()
+            self.cancelled = True
+
+
+def _completed(text):
+    future = concurrent.futures.Future()
+    future.set_result(text)
+    return future
+
+
+def advice_mode():
+    """這次要用哪種方式產生建議："local"、"budget" 或 "api"
+
+    沒有 API、設定成 local、或是沒有執行緒的網頁版（呼叫 API 會卡住整個畫面）都只用本機建議。
+    只看套件與 API Key 在不在，不 import openai，場景可以在事件處理中直接呼叫。
+    """
+    if setting.ADVICE_MODE == "local" or not THREADS_AVAILABLE or not api_configured():
+        return "local"
+    return setting.ADVICE_MODE
+
+
+def submit_weekly_advice(player, week, timeout=None):
+    from services.local_advice import local_weekly_advice
+    mode = advice_mode()
+    local_text = local_weekly_advice(player, week) if mode != "api" else None
+    if mode == "local":
+        player.weekly_advice[week] = local_text
+        future, shared = _completed(local_text), False
+    else:
+        # 經過 AdviceScheduler：如果選完選項後已經在預先產生，就直接共用那個請求
+        from services.advice_scheduler import AdviceScheduler
+        future, shared = AdviceScheduler.get_instance().submit_weekly(player, week), True
+    return AdviceRequest(
+        future,
+        timeout or setting.ADVICE_TIMEOUT_S,
+        "(產生建議失敗，請稍後再試或檢查網路/API 設定)",
+        "(產生建議逾時，請稍後再試或檢查網路/API 設定)",
+        shared=shared,
+        local_text=local_text,
+        budget=setting.ADVICE_UPGRADE_BUDGET_S,
+    )
+
+
+def submit_final_advice(player, timeout=None):
+    from services.local_advice import local_final_advice
+    mode = advice_mode()
+    local_text = local_final_advice(player) if mode != "api" else None
+    # budget 模式 API 失敗時要丟出錯誤，AdviceRequest 才會退回已經顯示的本機建議
+    generate = functools.partial(_generate, "generate_final_advice", fallback_on_error=mode != "budget")
+    if mode == "local":
+        future = _completed(local_text)
+    elif setting.ADVICE_STREAM:
+        stream = []
+        future = _submit(generate, player, stream.append)
+        future.stream = stream
+    else:
+        future = _submit(generate, player)
+    return AdviceRequest(
+        future,
+        timeout or setting.ADVICE_TIMEOUT_S,
+        "(產生建議失敗)\n\n{error}",
+        "(產生建議逾時)\n\n請稍後再試或檢查網路/API 設定",
+        local_text=local_text,
+        budget=setting.ADVICE_UPGRADE_BUDGET_S,
+    )
+
+
+async def _await_future(future, timeout):
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def generate_weekly_advice_async(player, week, timeout=None):
+    """可 await 的 generate_weekly_advice；逾時丟出 asyncio.TimeoutError，被取消時不再等待結果"""
+    return await _await_future(
+        _submit(_generate, "generate_weekly_advice", player, week),
+        timeout or setting.ADVICE_TIMEOUT_S,
+    )
+
+
+async def generate_final_advice_async(player, timeout=None):
+    """可 await 的 generate_final_advice；逾時丟出 asyncio.TimeoutError，被取消時不再等待結果"""
+    return await _await_future(
+        _submit(_generate, "generate_final_advice", player),
+        timeout or setting.ADVICE_TIMEOUT_S,
+    )
@@ -0,0 +1,215 @@
+"""
+共用的 Chat Completions 連線
+
+以前每次產生建議都 new 一個 OpenAI client，連線池與 TLS 連線都用不到。這裡改成：
+- 整個遊戲共用一個 client（keep-alive 連線池），API Key 或 base_url 改了才重建
+- 同時進行的請求數有上限，依先來後到取得名額（退避等待時會先讓出名額）
+- 每次嘗試各自有逾時，全部重試加起來不超過 ADVICE_TIMEOUT_S
+- 連線失敗、逾時、429 與 5xx 以「指數退避 + 隨機抖動」重試；其他錯誤（例如 401）直接丟出
+- 串流已經送出文字後就不重試，避免畫面上的文字重複
+
+所有重試都失敗時丟出最後一個錯誤，由 feedback_generator 退回本機建議。
+"""
+
+import collections
+import os
+import random
+import threading
+import time
+import setting
+
+try:
+    import openai
+    from openai import OpenAI
+except Exception:  # pragma: no cover
+    openai = None
+    OpenAI = None
+
+RETRY_STATUS = {408, 409, 429}
+LATENCY_WINDOW = 1000  # stats() 只看最近這麼多次成功呼叫
+
+
+def is_retryable(error):
+    """連線問題、逾時、429 與 5xx 才值得重試"""
+    if openai is None:
+        return False
+    if isinstance(error, openai.APIConnectionError):  # 包含 APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRY_STATUS or error.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt, base=None, cap=None, rng=random):
+    """第 attempt 次重試前要等多久（full jitter：0 ~ min(cap, base * 2^attempt) 之間隨機）"""
+    base = setting.ADVICE_API_BACKOFF_BASE_S if base is None else base
+    cap = setting.ADVICE_API_BACKOFF_MAX_S if cap is None else cap
+    return rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class _FairSlots:
+    """先來後到的併發名額：剛用完的執行緒不能插隊搶回名額，排隊的請求才不會一直等不到"""
+
+    def __init__(self, count):
+        self._lock = threading.Lock()
+        self._free = count
+        self._waiters = collections.deque()
+
+    def acquire(self, timeout):
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return True
+            granted = threading.Event()
+            self._waiters.append(granted)
+        if granted.wait(timeout):
+            return True
+        with self._lock:
+            if granted in self._waiters:
+                self._waiters.remove(granted)
+                return False
+        return True  # 剛好在逾時的同時拿到名額
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()  # 名額直接交給排最前面的
+            else:
+                self._free += 1
+
+
+class ApiClient:
+    _instance = None  # 單例
+
+    def __init__(self, max_concurrency=None, max_retries=None):
+        if ApiClient._instance is not None:
+            raise Exception("ApiClient 是單例，請使用 get_instance() 取得")
+        self.max_concurrency = max_concurrency or setting.ADVICE_API_MAX_CONCURRENCY
+        self.max_retries = setting.ADVICE_API_MAX_RETRIES if max_retries is None else max_retries
+        self._slots = _FairSlots(self.max_concurrency)
+        self._lock = threading.Lock()
+        self._client = None
+        self._client_key = None
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)  # 最近成功呼叫的耗時（秒），含重試與排隊
+        ApiClient._instance = self
+
+    @staticmethod
+    def get_instance():
+        if ApiClient._instance is None:
+            ApiClient()
+        return ApiClient._instance
+
+    def client(self, api_key, base_url=None):
+        """取得共用的 OpenAI client；key 或 base_url 改了才重建"""
+        base_url = base_url or os.environ.get("OPENAI_BASE_URL") or None
+        key = (api_key, base_url)
+        with self._lock:
+            if self._client is None or self._client_key != key:
+                # 舊的 client 不在這裡 close：別的執行緒可能還在用它串流，沒人引用後由 GC 回收
+                # 用 SDK 自己的 HTTP client 類別與 Limits 型別，不必另外依賴特定版本的 httpx
+                limits = type(openai.DEFAULT_CONNECTION_LIMITS)(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=60,
+                )
+                # 重試由這裡自己處理，SDK 內建的重試關掉
+                self._client = OpenAI(
+                    api_key=api_key,
+                    base_url=base_url,
+                    max_retries=0,
+                    http_client=openai.DefaultHttpxClient(limits=limits),
+                )
+                self._client_key = key
+            return self._client
+
+    def chat(self, api_key, on_delta=None, timeout=None, base_url=None, **params):
+        """呼叫 chat.completions.create；有 on_delta 時以串流逐段交給它。回傳完整文字"""
+        client = self.client(api_key, base_url)
+        timeout = timeout or setting.ADVICE_TIMEOUT_S
+        start = time.monotonic()
+        deadline = start + timeout
+        attempt = 0
+        delivered = [False]
+        with self._lock:
+            self.calls += 1
+
+        def deliver(piece):
+            delivered[0] = True
+            on_delta(piece)
+
+        while True:
+            try:
+                text = self._attempt(client, params, deadline, deliver if on_delta else None)
+                with self._lock:
+                    self.latencies.append(time.monotonic() - start)
+                return text
+            except Exception as e:
+                delay = backoff_delay(attempt)
+                if (
+                    attempt >= self.max_retries
+                    or delivered[0]
+                    or not is_retryable(e)
+                    or time.monotonic() + delay >= deadline
+                ):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+                with self._lock:
+                    self.retries += 1
+                attempt += 1
+                time.sleep(delay)
+
+    def _attempt(self, client, params, deadline, on_delta):
+        """取得名額後送出一次請求；逾時不超過剩下的總時間"""
+        if not self._slots.acquire(timeout=max(0, deadline - time.monotonic())):
+            raise TimeoutError("等待 API 連線名額逾時")
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("API 請求逾時")
+            return self._request(client, params, min(remaining, setting.ADVICE_API_ATTEMPT_TIMEOUT_S), on_delta)
+        finally:
+            self._slots.release()
+
+    def _request(self, client, params, timeout, on_delta):
+        if on_delta is None:
+            resp = client.chat.completions.create(timeout=timeout, **params)
+            return resp.choices[0].message.content or ""
+        stream = client.chat.completions.create(timeout=timeout, stream=True, **params)
+        parts = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content
+            if piece:
+                parts.append(piece)
+                on_delta(piece)
+        return "".join(parts)
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+                self._client_key = None
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self.latencies)
+
+        def pct(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 1)
+
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+        }
@@ -0,0 +1,41 @@
+"""
+OpenAI API Key 的來源：環境變數 OPENAI_API_KEY、.env 檔，或下面的 DEFAULT_OPENAI_API_KEY
+
+這個模組不 import openai（第一次 import 要將近一秒），畫面所在的主執行緒可以用 api_configured()
+決定要不要走 API；真正呼叫 API 的 feedback_generator / api_client 只在背景執行緒載入。
+"""
+
+import importlib.util
+import os
+
+# ==========================================
+# Lazy option: embed your OpenAI API Key
+# ==========================================
+# Replace the empty string with your OpenAI API Key, e.g.:
+# DEFAULT_OPENAI_API_KEY = "sk-proj-xxxxxxxxxxxxxxxx"
+# Note: do NOT commit a real key to git or share builds with it embedded.
+DEFAULT_OPENAI_API_KEY = ""
+# ==========================================
+# 嘗試載入 .env 檔案（如果存在）
+try:
+    if os.path.exists('.env'):
+        with open('.env', 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    os.environ[key.strip()] = value.strip()
+except Exception:
+    pass
+
+# 只找套件在不在，不執行它的 import
+OPENAI_INSTALLED = importlib.util.find_spec("openai") is not None
+
+
+def openai_api_key() -> str:
+    return os.environ.get("OPENAI_API_KEY", "") or DEFAULT_OPENAI_API_KEY
+
+
+def api_configured() -> bool:
+    """True when the OpenAI SDK is installed and an API key is set (without importing the SDK)."""
+    return bool(OPENAI_INSTALLED and openai_api_key())
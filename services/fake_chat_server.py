@@ -0,0 +1,170 @@
+"""
+本機假的 Chat Completions 伺服器（測試用）
+
+實作 OpenAI 的 POST /v1/chat/completions，回傳固定文字：
+  - stream=true 時以 SSE 分段送出，可設定第一段前的延遲與每段之間的延遲
+  - 否則等整段「產生完」才一次回傳
+  - latency_jitter_s：第一段前的延遲再加上 0 ~ latency_jitter_s 的隨機時間（模擬長尾延遲）
+  - failure_rate / fail_first：隨機或前幾個請求直接回傳 failure_status（預設 503）
+  - break_stream_after：串流送出這麼多段後直接斷線（模擬串流到一半連線中斷）
+
+用法：
+    with FakeChatServer(text, first_delay_s=0.2, chunk_delay_s=0.02) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        ...
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeChatServer:
+    def __init__(self, text, chunk_size=4, first_delay_s=0.0, chunk_delay_s=0.0, model="fake-model",
+                 latency_jitter_s=0.0, failure_rate=0.0, fail_first=0, failure_status=503, seed=None,
+                 break_stream_after=None):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.first_delay_s = first_delay_s
+        self.chunk_delay_s = chunk_delay_s
+        self.model = model
+        self.latency_jitter_s = latency_jitter_s
+        self.failure_rate = failure_rate
+        self.fail_first = fail_first
+        self.failure_status = failure_status
+        self.break_stream_after = break_stream_after
+        self.requests = []  # 收到的請求內容（dict）
+        self.failures = 0   # 故意回傳錯誤的次數
+        self.connections = set()  # 用過的客戶端連線（host, port），可以看出 keep-alive 有沒有生效
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _next_request(self, body):
+        """記錄請求，並決定這次要不要失敗、第一段前要等多久"""
+        with self._lock:
+            self.requests.append(body)
+            fail = len(self.requests) <= self.fail_first or self._rng.random() < self.failure_rate
+            if fail:
+                self.failures += 1
+            latency = self.first_delay_s + self._rng.uniform(0, self.latency_jitter_s)
+        return fail, latency
+
+    def chunks(self):
+        return [self.text[i:i + self.chunk_size] for i in range(0, len(self.text), self.chunk_size)]
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # 支援 keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    server.connections.add(self.client_address)
+                fail, latency = server._next_request(body)
+                if fail:
+                    self._fail(latency)
+                elif body.get("stream"):
+                    self._stream(latency)
+                else:
+                    self._complete(latency)
+
+            def _send_json(self, status, data):
+                payload = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _fail(self, latency):
+                time.sleep(latency)
+                self._send_json(server.failure_status, {
+                    "error": {"message": "fake server failure", "type": "server_error", "code": None},
+                })
+
+            def _complete(self, latency):
+                # 非串流：等所有片段都「產生完」才回傳
+                time.sleep(latency + server.chunk_delay_s * max(0, len(server.chunks()) - 1))
+                self._send_json(200, {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": server.model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": server.text},
+                        "finish_reason": "stop",
+                    }],
+                })
+
+            def _stream(self, latency):
+                # 串流長度事先不知道，用 chunked 編碼，連線才能繼續給下一個請求用
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                time.sleep(latency)
+                for i, piece in enumerate(server.chunks()):
+                    if i:
+                        time.sleep(server.chunk_delay_s)
+                    if i == server.break_stream_after:
+                        self.close_connection = True  # 不送結尾就斷線
+                        return
+                    self._event({"index": 0, "delta": {"content": piece}, "finish_reason": None})
+                self._event({"index": 0, "delta": {}, "finish_reason": "stop"})
+                # [DONE] 與 chunked 的結尾一起送出
+                self._write_chunk(b"data: [DONE]\n\n", last=True)
+
+            def _write_chunk(self, data, last=False):
+                payload = f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n"
+                if last:
+                    payload += b"0\r\n\r\n"
+                self.wfile.write(payload)
+                self.wfile.flush()
+
+            def _event(self, choice):
+                chunk = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": server.model,
+                    "choices": [choice],
+                }
+                self._write_chunk(b"data: " + json.dumps(chunk).encode("utf-8") + b"\n\n")
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-chat", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
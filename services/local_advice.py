@@ -0,0 +1,360 @@
+"""
+本機建議引擎：不連網、一毫秒內產生每週與結局建議
+
+所有句子在建立引擎時就組好，依照下列條件建成查表：
+  - 每週建議：(到這週為止最常做的行動, 這週選項的行動, 目前最需要注意的屬性)
+              期中 / 期末週改用 (考試週, 分數區間)，第 5、11 週的愛情事件用 (週數, 選項)
+  - 結局建議：人格分析 (各行動次數區間, 心情 / 體力 / 社交區間)、
+              愛情分析 (第 5 週選項, 第 11 週選項)、學習建議 (GPA 區間, 需要提醒的屬性)
+產生建議時只需要算出 key、查表，再把角色名字填進去。
+
+feedback_generator 在沒有 API 或 API 失敗時使用；advice_tasks 的 budget 模式會先顯示這裡的建議，
+AI 的回覆在時限內開始出現才換成 AI 版本。
+"""
+
+import itertools
+import json
+import setting
+
+ACTIONS = ("study", "social", "play_game", "rest")
+LETTERS = ("A", "B", "C", "D")
+LOW = 40   # 低於這個值要提醒
+HIGH = 80  # 高於這個值算狀態很好
+EXAM_WEEKS = (8, 16)
+
+_events = None
+
+
+def _events_data(player):
+    """每週事件資料（player 沒有帶的話從 events.json 讀一次）"""
+    global _events
+    data = getattr(player, "all_weeks_data", None)
+    if data:
+        return data
+    if _events is None:
+        with open(setting.EVENTS_JSON_PATH, "r", encoding="utf-8") as f:
+            _events = json.load(f)
+    return _events
+
+
+def choice_letter(player, week):
+    """第 week 週選了哪個選項（A~D）；沒有選擇時回傳 None"""
+    chosen = getattr(player, "chosen", None)
+    if chosen is not None and week < len(chosen) and chosen[week] in LETTERS:
+        return chosen[week]
+    # 沒有 chosen 紀錄時，用日記裡的選項文字找回是哪一個
+    option_text = getattr(player, "event_history", {}).get(week, {}).get("option_text")
+    if option_text:
+        options = _events_data(player).get(f"week_{week}", {}).get("events", {}).get("options", {})
+        for letter, option in options.items():
+            if option.get("text") == option_text:
+                return letter
+    return None
+
+
+def choice_attribute(player, week):
+    letter = choice_letter(player, week)
+    if letter is None:
+        return None
+    options = _events_data(player).get(f"week_{week}", {}).get("events", {}).get("options", {})
+    return options.get(letter, {}).get("attribute")
+
+
+def action_counts(player, until_week=None):
+    """到第 until_week 週（含）為止，每種行動各選了幾次"""
+    last = until_week if until_week is not None else 16
+    counts = dict.fromkeys(ACTIONS, 0)
+    for week in range(1, last + 1):
+        attribute = choice_attribute(player, week)
+        if attribute in counts:
+            counts[attribute] += 1
+    return counts
+
+
+def dominant_action(counts, min_count=3):
+    """最常做的行動；次數少於 min_count 或並列第一時回傳 "balanced" """
+    best = max(counts.values())
+    leaders = [action for action, n in counts.items() if n == best]
+    return leaders[0] if best >= min_count and len(leaders) == 1 else "balanced"
+
+
+def stat_flag(player):
+    """目前最需要注意的屬性"""
+    if player.energy < LOW:
+        return "tired"
+    if player.mood < LOW:
+        return "down"
+    if player.social < 30:
+        return "lonely"
+    if player.mood >= HIGH and player.energy >= HIGH:
+        return "great"
+    return "ok"
+
+
+def score_band(score):
+    if score < 60:
+        return "fail"
+    if score < 75:
+        return "pass"
+    if score < 90:
+        return "good"
+    return "great"
+
+
+def _count_band(n, high, mid=None, low=None):
+    if n >= high:
+        return "high"
+    if mid is not None and n >= mid:
+        return "mid"
+    if low is not None and n <= low:
+        return "low"
+    return "normal"
+
+
+# ---------- 每週建議的句子 ----------
+
+# 這週的選擇 -> 第一行（個性）
+_CHOICE_PERSONA = {
+    "study": "{chname}你可能是默默偷卷的類型",
+    "social": "{chname}你可能是天生的社交咖",
+    "play_game": "{chname}你可能是享樂派的玩家",
+    "rest": "{chname}你可能很懂得照顧自己",
+    None: "{chname}你可能還在找自己的節奏",
+}
+# 連續都做同一件事 -> 第一行（個性）
+_STREAK_PERSONA = {
+    "study": "{chname}你可能已經把讀書當信仰了",
+    "social": "{chname}你可能一天不約人就會渾身不對勁",
+    "play_game": "{chname}你可能把宿舍當成電競館了",
+    "rest": "{chname}你可能是床的最佳代言人",
+}
+# 需要注意的屬性 -> 第二行（回覆）
+_FLAG_REPLY = {
+    "tired": "體力快見底了，今晚先睡飽再說吧",
+    "down": "心情有點低落欸，找點開心的事做吧",
+    "lonely": "好久沒跟人講話了吧？出門透透氣",
+    "great": "狀態超好，這種週多來幾次吧",
+}
+# 狀態正常時依這週的選擇回覆
+_CHOICE_REPLY = {
+    "study": "書是讀了，記得也要抬頭看看天空",
+    "social": "朋友多是好事，期末考可不會放水",
+    "play_game": "玩得開心嗎？小心作業在背後看你",
+    "rest": "休息是為了走更長的路，但別躺太久",
+    None: "這週平平安安，也是一種收穫",
+}
+# 愛情事件（第 5、11 週）的回覆
+_LOVE_REPLY = {
+    (5, "A"): "直接要 IG，行動派的勇氣我給滿分",
+    (5, "B"): "拔刀速度是保住了，心動就先放一邊？",
+    (5, "C"): "手遊老婆不會陪你吃飯啦",
+    (5, "D"): "心裡暈完了，下次記得開口說句話",
+    (11, "A"): "恭喜脫單！哥布林也有春天",
+    (11, "B"): "這麼矜持，小心對方真的走掉喔",
+    (11, "C"): "還在釣？信任也是感情的一部分啦",
+    (11, "D"): "這自信我喜歡，祝你們幸福",
+}
+# 考試週：(週數, 分數區間) -> (第一行, 第二行)
+_EXAM_LINES = {
+    "fail": ("{chname}你可能把考試當成驚喜包了", "{exam}沒過也別太難過，下次提早準備就好"),
+    "pass": ("{chname}你可能是低空飛過的特技演員", "{exam}過關了！下次多留點時間複習"),
+    "good": ("{chname}你可能是穩紮穩打的實力派", "{exam}表現不錯，保持這個節奏"),
+    "great": ("{chname}你可能是傳說中的學霸", "{exam}考這麼高，是不是偷偷開外掛？"),
+}
+
+
+# ---------- 結局建議的段落（沿用原本本機建議的內容） ----------
+
+_PERSONA_STUDY = {
+    "high": "你根本是卷王本王吧！整個學期狂讀書，是來學校修仙的嗎？不過認真說，你這種目標導向的個性真的很適合需要長期投入的事情。",
+    "mid": "你是那種該衝的時候會衝、該躺的時候也不客氣的人。有點務實，但也懂得平衡，算是比較穩健的類型。",
+    "low": "欸...你該不會以為大學就是來玩的吧？讀書次數少到我都替你捏把冷汗了。不過也許你就是那種臨時抱佛腳也能過的天才型？",
+    "normal": "",
+}
+_PERSONA_SOCIAL = {
+    "high": "社交小能手啊！你的人脈應該比我的存款還豐富吧。不過要小心別把太多時間花在聊天吃飯上，畢竟期末考不會因為你朋友多就放水。",
+    "low": "有點邊緣人的感覺喔...不是說不好啦，但偶爾也該出來透透氣吧？宿舍不會長出新朋友的。",
+    "normal": "",
+}
+_PERSONA_GAME = "遊戲打這麼多，你是職業選手嗎？放鬆是好事，但別讓遊戲變成逃避現實的工具啊。"
+_PERSONA_REST = "休息大師認證！你真的很懂得照顧自己，不過有時候該動的時候還是要動一下啦，不然會生鏽的。"
+_PERSONA_MOOD = {
+    "low": "看你最後心情這麼低，這學期過得挺辛苦的吧？記得要找到讓自己開心的事情，不然會撐不下去的。",
+    "high": "你心情一直保持得不錯誒！這種正能量很珍貴，繼續保持這種態度吧。",
+    "mid": "",
+}
+_PERSONA_TIRED = "體力條已經見底了...你該不會每天熬夜吧？好好睡覺真的很重要，不是在開玩笑。"
+_PERSONA_HERMIT = "社交分數和社交次數雙低，你是隱士嗎？偶爾跟人聊聊天也不錯啦。"
+_PERSONA_DEFAULT = "你是那種什麼都願意試一點的人，沒有特別偏向哪一邊，保持彈性也是一種本事。"
+
+_LOVE_NONE = "你這學期完全沒碰愛情線啊...是太專注學業還是根本沒遇到心動的對象？不過也沒關係啦，感情這種事強求不來。但如果你只是害羞，記得有時候要主動一點喔！"
+_LOVE_WEEK5 = {
+    "A": "第5週看到crush就直接要IG，你是行動派啊！這種積極的態度我喜歡，至少不會留遺憾。",
+    "B": "遇到心動的對象居然選擇去讀書？你是理智型的，把學業看得比感情重。雖然很理性，但偶爾也可以放縱一下吧？",
+    "C": "寧願選手遊也不要戀愛...你是真愛遊戲啊！不過說真的，二次元老婆不會陪你吃飯啦。",
+    "D": "只敢暗戀不敢行動？你是慢熱型的，喜歡在心裡幻想但不敢踏出第一步。有時候勇敢一點也不錯喔！",
+    None: "",
+}
+_LOVE_WEEK11 = {
+    "A": " 而且第11週人家告白你就答應了，看來你也渴望被愛嘛！祝你們幸福啦哈哈。",
+    "B": " 第11週居然拒絕告白？你是傲嬌嗎？還是真的不喜歡對方？小心錯過就沒了喔。",
+    "C": " 第11週還在懷疑對方是海王，你也太小心了吧！信任也是感情的一部分啦。",
+    "D": " 第11週超有自信的說「我就知道」，你是自戀型的嗎？不過有自信也不錯啦！",
+    None: "",
+}
+
+_STUDY_GPA = {
+    "low": "欸你的成績真的需要加油了！下學期記得：1) 每週至少認真讀書3-4次，2) 考前兩週開始複習不要拖，3) 找個讀書夥伴互相督促。",
+    "mid": "成績還可以，但還有進步空間。建議你：1) 把讀書和娛樂時間分配得更明確一點，2) 考試前做一些考古題，3) 保持規律作息，累了就好好休息。",
+    "high": "你成績很棒誒！繼續保持這個節奏就好。不過也別太拼，記得：1) 適度放鬆也是學習的一部分，2) 多跟朋友交流可以學到不同觀點，3) 保持好奇心繼續探索。",
+}
+_STUDY_TIPS = ("你體力太差了，多睡覺少熬夜！", "心情不好記得找人聊聊或做點開心的事", "偶爾約朋友出去走走吧，別當獨行俠")
+
+
+def _gpa_band(gpa):
+    if gpa < 2.5:
+        return "low"
+    if gpa < 3.5:
+        return "mid"
+    return "high"
+
+
+class LocalAdviceEngine:
+    _instance = None  # 單例
+
+    def __init__(self):
+        if LocalAdviceEngine._instance is not None:
+            raise Exception("LocalAdviceEngine 是單例，請使用 get_instance() 取得")
+        self._weekly = self._compile_weekly()
+        self._exam = self._compile_exam()
+        self._love_weekly = self._compile_love_weekly()
+        self._persona = self._compile_persona()
+        self._love = self._compile_love()
+        self._study = self._compile_study()
+        LocalAdviceEngine._instance = self
+
+    @staticmethod
+    def get_instance():
+        if LocalAdviceEngine._instance is None:
+            LocalAdviceEngine()
+        return LocalAdviceEngine._instance
+
+    # ---------- 預先組好所有句子 ----------
+
+    @staticmethod
+    def _compile_weekly():
+        table = {}
+        for profile, choice, flag in itertools.product(
+            ACTIONS + ("balanced",), ACTIONS + (None,), ("tired", "down", "lonely", "great", "ok")
+        ):
+            first = _STREAK_PERSONA[choice] if choice == profile else _CHOICE_PERSONA[choice]
+            second = _FLAG_REPLY.get(flag) or _CHOICE_REPLY[choice]
+            table[(profile, choice, flag)] = first + "\n" + second
+        return table
+
+    @staticmethod
+    def _compile_exam():
+        table = {}
+        for week, exam in zip(EXAM_WEEKS, ("期中考", "期末考")):
+            for band, (first, second) in _EXAM_LINES.items():
+                table[(week, band)] = first + "\n" + second.format(exam=exam)
+        return table
+
+    @staticmethod
+    def _compile_love_weekly():
+        table = {}
+        for (week, letter), reply in _LOVE_REPLY.items():
+            for choice in ACTIONS + (None,):
+                table[(week, letter, choice)] = _CHOICE_PERSONA[choice] + "\n" + reply
+        return table
+
+    @staticmethod
+    def _compile_persona():
+        table = {}
+        for study, social, game, rest, mood, tired, hermit in itertools.product(
+            ("high", "mid", "low", "normal"), ("high", "low", "normal"),
+            (False, True), (False, True), ("low", "mid", "high"), (False, True), (False, True),
+        ):
+            parts = [_PERSONA_STUDY[study], _PERSONA_SOCIAL[social]]
+            if game:
+                parts.append(_PERSONA_GAME)
+            if rest:
+                parts.append(_PERSONA_REST)
+            parts.append(_PERSONA_MOOD[mood])
+            if tired:
+                parts.append(_PERSONA_TIRED)
+            if hermit:
+                parts.append(_PERSONA_HERMIT)
+            text = " ".join(part for part in parts if part) or _PERSONA_DEFAULT
+            table[(study, social, game, rest, mood, tired, hermit)] = "人格分析\n" + text
+        return table
+
+    @staticmethod
+    def _compile_love():
+        table = {}
+        for week5, week11 in itertools.product(LETTERS + (None,), repeat=2):
+            if week5 is None and week11 is None:
+                text = _LOVE_NONE
+            else:
+                text = (_LOVE_WEEK5[week5] + _LOVE_WEEK11[week11]).strip()
+            table[(week5, week11)] = "愛情分析\n" + text
+        return table
+
+    @staticmethod
+    def _compile_study():
+        table = {}
+        for gpa, tired, down, lonely in itertools.product(("low", "mid", "high"), *([(False, True)] * 3)):
+            text = _STUDY_GPA[gpa]
+            tips = [tip for tip, on in zip(_STUDY_TIPS, (tired, down, lonely)) if on]
+            if tips:
+                text += " 還有：" + "、".join(tips) + "。"
+            table[(gpa, tired, down, lonely)] = "學習建議\n" + text
+        return table
+
+    # ---------- 產生建議：算 key、查表 ----------
+
+    def weekly_key(self, player, week):
+        if week in EXAM_WEEKS:
+            return ("exam", week, score_band(player.midterm if week == 8 else player.final))
+        letter = choice_letter(player, week)
+        if (week, letter) in _LOVE_REPLY:
+            return ("love", week, letter, choice_attribute(player, week))
+        counts = action_counts(player, until_week=week)
+        return ("week", dominant_action(counts), choice_attribute(player, week), stat_flag(player))
+
+    def weekly(self, player, week):
+        key = self.weekly_key(player, week)
+        if key[0] == "exam":
+            text = self._exam[key[1:]]
+        elif key[0] == "love":
+            text = self._love_weekly[key[1:]]
+        else:
+            text = self._weekly[key[1:]]
+        return text.format(chname=getattr(player, "chname", ""))
+
+    def final_key(self, player):
+        counts = action_counts(player)
+        persona = (
+            _count_band(counts["study"], 8, mid=5, low=2),
+            _count_band(counts["social"], 6, low=2),
+            counts["play_game"] >= 6,
+            counts["rest"] >= 6,
+            "low" if player.mood < LOW else ("high" if player.mood >= HIGH else "mid"),
+            player.energy < LOW,
+            player.social < 30 and counts["social"] < 3,
+        )
+        love = (choice_letter(player, 5), choice_letter(player, 11))
+        study = (_gpa_band(player.GPA), player.energy < 50, player.mood < 50, player.social < LOW)
+        return persona, love, study
+
+    def final(self, player):
+        persona, love, study = self.final_key(player)
+        return "\n\n".join((self._persona[persona], self._love[love], self._study[study]))
+
+
+def local_weekly_advice(player, week):
+    return LocalAdviceEngine.get_instance().weekly(player, week)
+
+
+def local_final_advice(player):
+    return LocalAdviceEngine.get_instance().final(player)
@@ -24,6 +24,8 @@ JFONT_PATH_Light = os.path.join(FONT_DIR, 'JasonHandwriting3-Light.ttf')
 HFONT_PATH = os.path.join(FONT_DIR, 'hanyizhuziguozhiruantang.ttf')
 CFONT_PATH = os.path.join(FONT_DIR, 'ChenYuluoyan-Thin-Monospaced.ttf')
 MFONT_PATH = os.path.join(FONT_DIR, 'MoreSugar-Regular.ttf')
+# 預先點陣化的字形圖集（由 resource/font/build_glyph_atlas.py 產生）
+GLYPH_ATLAS_DIR = os.path.join(FONT_DIR, 'atlas')
 
 # 背景音樂路徑
 
@@ -45,8 +47,8 @@ class SoundEffect:
     LUCKYWHEEL_PATH = os.path.join(SOUND_PATH, 'luckywheel.ogg')
     MENU_HOVER_PATH = os.path.join(SOUND_PATH, 'menu_hover.ogg')
     NEXT_PAGE_PATH = os.path.join(SOUND_PATH, 'next_page.ogg')
-    SHOU_PATH = os.path.join(SOUND_PATH, 'shou.ogg')
-    SHOU2_PATH = os.path.join(SOUND_PATH, 'shou2.ogg')
+    SHOU_PATH = os.path.join(SOUND_PATH, 'menu_shou.ogg')
+    SHOU2_PATH = os.path.join(SOUND_PATH, 'menu_shou2.ogg')
     SMALL_DRUM_PATH = os.path.join(SOUND_PATH, 'small_drum.ogg')
     TYPING_PATH = os.path.join(SOUND_PATH, 'typing.ogg')
 
@@ -108,6 +110,58 @@ class ImagePath:
 
 # 重要檔案路徑
 SIMULATION_PLOTS_DIR = os.path.join(BASE_DIR, 'simulation_plots')
+# 幀時間統計輸出（FRAME_PROFILE=1 時於結束遊戲寫入）
+FRAME_PROFILE_DIR = os.path.join(BASE_DIR, 'frame_profile')
+# span 追蹤輸出（TRACE=1 時於結束時寫入 Chrome trace JSON）
+TRACE_DIR = os.path.join(BASE_DIR, 'trace')
+# AI 建議最多等幾秒，超過就顯示逾時訊息（API 請求本身也用同樣的逾時）
+ADVICE_TIMEOUT_S = 20
+# AI 建議 API：同時請求數上限、重試次數、退避時間，以及單次嘗試的逾時（重試加總仍以 ADVICE_TIMEOUT_S 為上限）
+ADVICE_API_MAX_CONCURRENCY = 4
+ADVICE_API_MAX_RETRIES = 3
+ADVICE_API_BACKOFF_BASE_S = 0.5
+ADVICE_API_BACKOFF_MAX_S = 8
+ADVICE_API_ATTEMPT_TIMEOUT_S = 10
+# AI 建議的產生方式：
+#   "budget"：先顯示本機建議，AI 在 ADVICE_UPGRADE_BUDGET_S 秒內完成或開始串流才換成 AI 的文字
+#   "api"：等 AI 回覆（失敗或逾時才顯示錯誤訊息）
+#   "local"：只用本機建議，完全不連網
+ADVICE_MODE = os.environ.get("ADVICE_MODE", "budget")
+ADVICE_UPGRADE_BUDGET_S = 5
+# AI 建議以串流方式逐字顯示（關掉則整段產生完才顯示）
+ADVICE_STREAM = True
+# AI 建議的磁碟快取（SQLite）：相同情境直接回傳，不再呼叫 API
+ADVICE_CACHE_PATH = os.path.join(BASE_DIR, 'cache', 'advice_cache.sqlite3')
+ADVICE_CACHE_TTL_S = 30 * 24 * 3600
+ADVICE_CACHE_MAX_ENTRIES = 5000
+# 選完每週事件後在背景預先產生建議，同時最多幾個請求
+ADVICE_PREFETCH_MAX_IN_FLIGHT = 2
+# surface 記憶體預算（MB），超過時印出警告；網頁版（pygbag）與低記憶體電腦請調低
+SURFACE_MEMORY_BUDGET_MB = int(os.environ.get("SURFACE_MEMORY_BUDGET_MB", 384))
+# 音效庫（UI/components/audio_bank.py）：開場時在背景解碼所有音效，第一次播放就不用等解碼
+AUDIO_NUM_CHANNELS = 8
+# 循環音效（打字、小鼓）各自固定一個保留聲道，不會和 UI 音效互搶
+AUDIO_LOOP_SOUNDS = (SoundEffect.TYPING_PATH, SoundEffect.SMALL_DRUM_PATH)
+# 短的 UI 音效（hover、翻頁、按鈕）輪流使用這幾個保留聲道；其他音效用剩下的聲道
+AUDIO_UI_SOUNDS = (
+    SoundEffect.MENU_HOVER_PATH,
+    SoundEffect.NEXT_PAGE_PATH,
+    SoundEffect.BO_PATH,
+    SoundEffect.DONG_PATH,
+    SoundEffect.DONGDONG_PATH,
+)
+AUDIO_UI_CHANNELS = 2
+# 閒置降速（UI/components/frame_scheduler.py）：畫面靜止且沒有輸入時改成等事件，不再固定每秒重畫 30 次
+IDLE_THROTTLE = os.environ.get("IDLE_THROTTLE", "1") != "0"
+IDLE_GRACE_MS = 1000    # 有輸入後維持全速多久（hover 效果、連續操作）
+IDLE_MAX_WAIT_MS = 500  # 靜止時最久多久醒來重畫一次
+IDLE_WEB_FPS = 5        # 網頁版不能阻塞等事件，靜止時改用這個幀率
+# 動畫依經過的時間推進（BaseScene.dt）；一幀最多推進這麼多毫秒，載入或卡頓之後不會一次跳太遠
+MAX_FRAME_DT_MS = 250
+# 內部解析度（UI/components/render_target.py）：小於 1 時（例如 0.5、0.75）場景畫在 1200×800 × RENDER_SCALE 的畫布上，
+# 每幀放大一次到 1200×800 的視窗，給低階電腦與網頁版用
+RENDER_SCALE = float(os.environ.get("RENDER_SCALE", 1.0))
+RENDER_SMOOTH = os.environ.get("RENDER_SMOOTH", "0") == "1"  # 平滑放大：比較不會有鋸齒，但每幀多花幾毫秒
 
 # Result 
 GPA_HIGHLIGHT_PATH = os.path.join(SIMULATION_PLOTS_DIR, 'gpa_highlight.png')
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+測試共用 API 連線的重試與併發名額
+用本機假的 Chat Completions 伺服器（services/fake_chat_server.py）取代 OpenAI：
+- 429 與 5xx 會重試，最後拿到正確的文字
+- 400 這類用戶端錯誤不重試，直接丟出
+- 串流已經送出文字後連線中斷，不重試（畫面上的文字才不會重複）
+- _FairSlots 依先來後到交出名額，等不到名額會逾時
+
+需要安裝 openai 套件；不需要網路與 API Key。
+執行完會還原 setting 的 ADVICE_API_* 設定。
+
+用法：
+    python test_api_client.py
+"""
+
+import os
+import sys
+import threading
+import time
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import setting
+from services import api_client
+from services.api_client import ApiClient, _FairSlots
+from services.fake_chat_server import FakeChatServer
+
+REPLY_TEXT = "今天也要記得喝水，讀書累了就起來走一走。" * 3
+MESSAGES = [{"role": "user", "content": "給我一點建議"}]
+SETTING_NAMES = ("ADVICE_API_BACKOFF_BASE_S", "ADVICE_API_BACKOFF_MAX_S")
+
+
+def chat(server, on_delta=None):
+    """送一次請求，回傳 (文字, 錯誤, 伺服器收到幾個請求, 這次多了幾次重試)"""
+    client = ApiClient.get_instance()
+    retries = client.retries
+    text, error = None, None
+    try:
+        text = client.chat("test-key", on_delta=on_delta, timeout=10, base_url=server.base_url,
+                           model="fake-model", messages=MESSAGES)
+    except Exception as e:
+        error = e
+    return text, error, len(server.requests), client.retries - retries
+
+
+def check_retry_on_status(status):
+    """第一次回傳 status，第二次成功"""
+    print(f"\n📊 {status} 會重試")
+    with FakeChatServer(REPLY_TEXT, fail_first=1, failure_status=status) as server:
+        text, error, requests, retries = chat(server)
+    print(f"   伺服器收到 {requests} 個請求，重試 {retries} 次")
+    ok = text == REPLY_TEXT and error is None and requests == 2 and retries == 1
+    print(f"✅ {status} 重試後成功" if ok else f"❌ {status} 沒有正確重試（錯誤：{error!r}）")
+    return ok
+
+
+def check_no_retry_on_client_error():
+    print("\n📊 400 不重試")
+    with FakeChatServer(REPLY_TEXT, fail_first=1, failure_status=400) as server:
+        text, error, requests, retries = chat(server)
+    ok = (
+        text is None
+        and isinstance(error, api_client.openai.BadRequestError)
+        and requests == 1
+        and retries == 0
+    )
+    print("✅ 400 直接丟出錯誤" if ok else f"❌ 400 被重試或沒有丟出錯誤（{requests} 個請求）")
+    return ok
+
+
+def check_no_retry_after_partial_stream():
+    print("\n📊 串流到一半斷線不重試")
+    pieces = []
+    with FakeChatServer(REPLY_TEXT, chunk_size=4, break_stream_after=3) as server:
+        text, error, requests, retries = chat(server, on_delta=pieces.append)
+    # 斷線本身是可以重試的錯誤，不重試是因為已經有文字送出去了
+    ok = (
+        text is None
+        and api_client.is_retryable(error)
+        and len(pieces) == 3
+        and requests == 1
+        and retries == 0
+    )
+    print(f"   收到 {len(pieces)} 段後斷線，伺服器收到 {requests} 個請求")
+    print("✅ 已送出文字後不重試" if ok else f"❌ 串流中斷後的處理不符（錯誤：{error!r}）")
+    return ok
+
+
+def check_fair_slots():
+    """一個名額：持有者釋放後，依排隊順序交給等待的執行緒；等太久回傳 False"""
+    print("\n📊 _FairSlots")
+    slots = _FairSlots(1)
+    slots.acquire(timeout=1)
+    order = []
+
+    def waiter(name):
+        if slots.acquire(timeout=5):
+            order.append(name)
+            time.sleep(0.05)
+            slots.release()
+
+    threads = []
+    for name in ("first", "second", "third"):
+        thread = threading.Thread(target=waiter, args=(name,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)  # 確定照順序排進隊伍
+    timed_out = not slots.acquire(timeout=0.05)
+    slots.release()
+    for thread in threads:
+        thread.join()
+    ok = order == ["first", "second", "third"] and timed_out and slots.acquire(timeout=0)
+    print(f"   取得名額的順序：{order}")
+    print("✅ 名額依先來後到交出，等不到會逾時" if ok else "❌ 名額的順序或逾時不符")
+    return ok
+
+
+def main():
+    if api_client.OpenAI is None:
+        print("❌ 需要 openai 套件：pip install openai")
+        return 1
+    saved_setting = {name: getattr(setting, name) for name in SETTING_NAMES}
+    # 退避時間縮短，測試不必等好幾秒
+    setting.ADVICE_API_BACKOFF_BASE_S = 0.05
+    setting.ADVICE_API_BACKOFF_MAX_S = 0.2
+
+    print("=" * 50)
+    print("🧪 API 連線重試測試（本機假伺服器）")
+    print("=" * 50)
+    try:
+        results = [
+            check_retry_on_status(429),
+            check_retry_on_status(503),
+            check_no_retry_on_client_error(),
+            check_no_retry_after_partial_stream(),
+            check_fair_slots(),
+        ]
+    finally:
+        for name, value in saved_setting.items():
+            setattr(setting, name, value)
+
+    print("\n" + "=" * 50)
+    if all(results):
+        print("🎉 所有測試通過！")
+        return 0
+    print("❌ 部分測試失敗。")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
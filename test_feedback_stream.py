@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+測試 AI 建議的串流顯示
+用本機假的 Chat Completions 伺服器（services/fake_chat_server.py）取代 OpenAI：
+- 串流與一次回傳的結果要完全相同
+- 串流的第一段文字要比整段回傳早很多出現
+- IncrementalLayout 每收到一段的斷行結果都要與整段重排相同
+- AdviceRequest.partial 在完成前就能拿到已收到的文字
+- budget 模式：一開始就顯示本機建議，AI 在時限內開始回覆才換成 AI 的文字
+- budget 模式 API 失敗：維持本機建議，不把錯誤訊息存進 player.weekly_advice
+
+需要安裝 openai 套件；不需要網路與 API Key。
+執行完會還原 OPENAI_* 環境變數與 setting 的 ADVICE_* 設定。
+
+用法：
+    python test_feedback_stream.py
+"""
+
+import os
+import sys
+import time
+
+# 添加專案根目錄到路徑
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pygame
+import setting
+from services import feedback_generator
+from services.advice_cache import AdviceCache
+from services.advice_tasks import submit_final_advice, submit_weekly_advice
+from services.local_advice import local_final_advice, local_weekly_advice
+from services.fake_chat_server import FakeChatServer
+from UI.components.text_layout import TextLayout, IncrementalLayout
+
+ADVICE_TEXT = (
+    "1. 人格分析\n"
+    + "你是那種該衝的時候會衝、該躺的時候也不客氣的人。有點務實，但也懂得平衡，算是比較穩健的類型。" * 3
+    + "\n\n2. 愛情分析\n"
+    + "第5週你選擇了默默觀察，第11週又把告白吞回去，感情路上你是穩健派還是膽小鬼？" * 2
+    + "\n\n3. 學習建議\n"
+    + "- 每天固定三十分鐘專注讀書\n- 考前一週開始整理筆記\n- 找同學互相出題"
+)
+
+# 測試期間會改掉、結束時要還原的環境變數與設定
+ENV_NAMES = ("OPENAI_API_KEY", "OPENAI_BASE_URL")
+SETTING_NAMES = ("ADVICE_CACHE_PATH", "ADVICE_STREAM", "ADVICE_MODE", "ADVICE_UPGRADE_BUDGET_S")
+
+
+def restore(saved_env, saved_setting):
+    for name, value in saved_env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    for name, value in saved_setting.items():
+        setattr(setting, name, value)
+
+
+class FakePlayer:
+    """只有產生建議用得到的屬性；AdviceScheduler 用弱參照記住玩家，所以不用 SimpleNamespace"""
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+def make_player():
+    return FakePlayer(
+        name="bubu", chname="布布",
+        GPA=3.2, midterm=72, final=65, total_score=137,
+        mood=60, energy=45, social=70, knowledge=55.0,
+        event_history={
+            5: {"event_text": "遇見命中注定", "option_text": "默默觀察"},
+            11: {"event_text": "告白時刻", "option_text": "還是算了"},
+        },
+        weekly_advice={},
+    )
+
+
+def check_stream_matches_complete(server):
+    """串流與一次回傳的內容相同，且第一段文字提早出現"""
+    print("\n📊 串流 vs 一次回傳")
+    player = make_player()
+
+    AdviceCache.get_instance().clear()
+    t0 = time.perf_counter()
+    full = feedback_generator.generate_final_advice(player)
+    complete_s = time.perf_counter() - t0
+
+    AdviceCache.get_instance().clear()
+    first = []
+    pieces = []
+
+    def on_delta(piece):
+        if not first:
+            first.append(time.perf_counter() - t0)
+        pieces.append(piece)
+
+    t0 = time.perf_counter()
+    streamed = feedback_generator.generate_final_advice(player, on_delta=on_delta)
+    stream_s = time.perf_counter() - t0
+
+    print(f"   一次回傳：{complete_s * 1000:.0f} ms 後才有文字")
+    print(f"   串流：第一段 {first[0] * 1000:.0f} ms，全部 {stream_s * 1000:.0f} ms，共 {len(pieces)} 段")
+    ok = (
+        full == ADVICE_TEXT
+        and streamed == ADVICE_TEXT
+        and "".join(pieces) == ADVICE_TEXT
+        and first[0] < complete_s / 3
+        and server.requests[-1].get("stream") is True
+    )
+    print("✅ 串流結果正確且首段提早出現" if ok else "❌ 串流結果或首段時間不符")
+    return ok
+
+
+def check_incremental_layout():
+    """每收到一段就更新一次，斷行結果要和整段重排一致"""
+    print("\n📊 IncrementalLayout")
+    font = pygame.font.Font(None, 28)
+    width = 500
+    layout = IncrementalLayout(font, width)
+    text = ""
+    for i in range(0, len(ADVICE_TEXT), 3):
+        text = ADVICE_TEXT[:i + 3]
+        if layout.set_text(text) != list(TextLayout.get_instance().wrap(text, font, width)):
+            print(f"❌ 第 {i} 字時斷行不一致")
+            return False
+    # 文字被整段換掉（例如改成錯誤訊息）時要重新排版
+    replaced = "(產生建議失敗)\n\n連線中斷"
+    if layout.set_text(replaced, final=True) != list(TextLayout.get_instance().wrap(replaced, font, width)):
+        print("❌ 換成不同文字後斷行不一致")
+        return False
+    print("✅ 逐段斷行與整段重排一致")
+    return True
+
+
+def check_request_partial():
+    """AdviceRequest 在完成前就能拿到部分文字"""
+    print("\n📊 AdviceRequest.partial")
+    AdviceCache.get_instance().clear()
+    request = submit_final_advice(make_player())
+    seen = []
+    t0 = time.perf_counter()
+    while request.poll() is None and time.perf_counter() - t0 < 30:
+        if request.partial and (not seen or seen[-1] != request.partial):
+            seen.append(request.partial)
+        time.sleep(0.01)
+    ok = (
+        request.result == ADVICE_TEXT
+        and not request.failed
+        and len(seen) > 1
+        and all(ADVICE_TEXT.startswith(part) for part in seen)
+    )
+    print(f"   完成前看到 {len(seen)} 次不同的部分文字")
+    print("✅ 部分文字逐步增加" if ok else "❌ 沒有取得逐步增加的部分文字")
+    return ok
+
+
+def _wait(request, limit_s=30):
+    t0 = time.perf_counter()
+    while request.poll() is None and time.perf_counter() - t0 < limit_s:
+        time.sleep(0.01)
+    return request
+
+
+def check_budget_mode(server):
+    """budget 模式：本機建議立刻可用；AI 趕上時限就升級，趕不上就維持本機建議"""
+    print("\n📊 budget 模式")
+    player = make_player()
+    local = local_final_advice(player)
+    setting.ADVICE_MODE = "budget"
+    setting.ADVICE_UPGRADE_BUDGET_S = 1.0
+    try:
+        AdviceCache.get_instance().clear()
+        request = submit_final_advice(player)
+        instant = request.partial == local
+        _wait(request)
+        upgraded = request.result == ADVICE_TEXT and request.upgraded
+
+        # 第一段要等 1.5 秒，超過 1 秒的時限
+        server.first_delay_s = 1.5
+        AdviceCache.get_instance().clear()
+        t0 = time.perf_counter()
+        request = _wait(submit_final_advice(player))
+        kept_local = request.result == local and not request.upgraded and not request.failed
+        waited = time.perf_counter() - t0
+    finally:
+        server.first_delay_s = 0.2
+        setting.ADVICE_MODE = "api"  # 回到前三項的設定；整體的還原在 main() 裡
+    print(f"   趕不上時限時在 {waited * 1000:.0f} ms 後定案為本機建議")
+    ok = instant and upgraded and kept_local and waited < 1.4
+    print("✅ 本機建議立即顯示，並在時限內升級" if ok else "❌ budget 模式的結果不符")
+    return ok
+
+
+def check_budget_api_failure(server):
+    """budget 模式下 API 回傳錯誤：結果是乾淨的本機建議，不算升級也不算失敗"""
+    print("\n📊 budget 模式 API 失敗")
+    player = make_player()
+    week = 5
+    setting.ADVICE_MODE = "budget"
+    server.failure_rate, server.failure_status = 1.0, 400  # 400 不重試，馬上失敗
+    try:
+        AdviceCache.get_instance().clear()
+        final = _wait(submit_final_advice(player))
+        weekly = _wait(submit_weekly_advice(player, week))
+    finally:
+        server.failure_rate, server.failure_status = 0.0, 503
+        setting.ADVICE_MODE = "api"
+    ok = (
+        final.result == local_final_advice(player)
+        and weekly.result == local_weekly_advice(player, week)
+        and not (final.upgraded or weekly.upgraded or final.failed or weekly.failed)
+        and week not in player.weekly_advice
+    )
+    print("✅ API 失敗時維持本機建議" if ok else "❌ API 失敗時換成了錯誤訊息或存進了 weekly_advice")
+    return ok
+
+
+def main():
+    if feedback_generator.OpenAI is None:
+        print("❌ 需要 openai 套件：pip install openai")
+        return 1
+    pygame.font.init()
+    saved_env = {name: os.environ.get(name) for name in ENV_NAMES}
+    saved_setting = {name: getattr(setting, name) for name in SETTING_NAMES}
+    setting.ADVICE_CACHE_PATH = ":memory:"  # 不讀寫玩家的快取檔
+    setting.ADVICE_STREAM = True
+    setting.ADVICE_MODE = "api"  # 前三項測的是 AI 本身的串流
+
+    print("=" * 50)
+    print("🧪 AI 建議串流測試（本機假伺服器）")
+    print("=" * 50)
+    try:
+        with FakeChatServer(ADVICE_TEXT, chunk_size=4, first_delay_s=0.2, chunk_delay_s=0.02) as server:
+            os.environ["OPENAI_API_KEY"] = "test-key"
+            os.environ["OPENAI_BASE_URL"] = server.base_url
+            results = [
+                check_stream_matches_complete(server),
+                check_incremental_layout(),
+                check_request_partial(),
+                check_budget_mode(server),
+                check_budget_api_failure(server),
+            ]
+    finally:
+        AdviceCache._instance = None  # 之後再取得時依還原的 ADVICE_CACHE_PATH 重新開啟
+        restore(saved_env, saved_setting)
+
+    print("\n" + "=" * 50)
+    if all(results):
+        print("🎉 所有測試通過！")
+        return 0
+    print("❌ 部分測試失敗。")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+輕量的 span 追蹤器 - 輸出 Chrome trace event JSON
+
+設定環境變數 TRACE=1 啟動遊戲（或模擬、基準測試腳本）即會記錄，結束時寫到 setting.TRACE_DIR，
+可以用 https://ui.perfetto.dev 或 chrome://tracing 開啟。
+記錄的內容：場景進出、素材載入、每幀的各個階段、Simulation.run 的各階段、AI 建議的呼叫。
+
+沒有啟動時 span() 直接回傳共用的空 context manager，traced() 包裝的函式只多一次旗標檢查。
+
+用法：
+    from tracer import span, traced
+
+    with span("load_frames", "asset", {"folder": path}):
+        ...
+
+    @traced("advice")
+    def generate_final_advice(player): ...
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+import setting
+
+
+class _NullSpan:
+    """追蹤關閉時使用：什麼都不做"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.cat, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class Tracer:
+    _instance = None  # 單例
+    MAX_EVENTS = 1_000_000  # 超過就不再記錄，避免長時間執行把記憶體吃光
+
+    def __init__(self):
+        if Tracer._instance is not None:
+            raise Exception("Tracer 是單例，請使用 get_instance() 取得")
+        self.enabled = False
+        self.events = []
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._thread_ids = {}  # threading.get_ident() -> 從 1 開始的小整數，trace 檢視器比較好讀
+        self._lock = threading.Lock()
+        self._dump_registered = False
+        Tracer._instance = self
+        if os.environ.get("TRACE"):
+            self.enable()
+
+    @staticmethod
+    def get_instance():
+        if Tracer._instance is None:
+            Tracer()
+        return Tracer._instance
+
+    def enable(self, dump_on_exit=True):
+        self.enabled = True
+        if dump_on_exit and not self._dump_registered:
+            atexit.register(self._dump_at_exit)
+            self._dump_registered = True
+
+    def disable(self):
+        self.enabled = False
+
+    # ---------- 記錄 ----------
+    def _tid(self):
+        ident = threading.get_ident()
+        tid = self._thread_ids.get(ident)
+        if tid is None:
+            with self._lock:
+                tid = self._thread_ids.setdefault(ident, len(self._thread_ids) + 1)
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                })
+        return tid
+
+    def _add(self, event):
+        if len(self.events) >= self.MAX_EVENTS:
+            self.dropped += 1
+            return
+        self.events.append(event)  # list.append 在 CPython 是執行緒安全的
+
+    def _us(self, t):
+        return round((t - self._origin) * 1_000_000, 1)
+
+    def complete(self, name, cat, start, end, args=None):
+        """記錄一段已結束的區間；start / end 是 time.perf_counter() 的秒數"""
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": cat, "ph": "X", "ts": self._us(start),
+                 "dur": round((end - start) * 1_000_000, 1), "pid": self._pid, "tid": self._tid()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def instant(self, name, cat, args=None):
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self._us(time.perf_counter()),
+                 "pid": self._pid, "tid": self._tid()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def counter(self, name, values):
+        """數值隨時間變化的曲線，例如記憶體用量；values 是 {系列名稱: 數值}"""
+        if not self.enabled:
+            return
+        self._add({"name": name, "ph": "C", "ts": self._us(time.perf_counter()),
+                   "pid": self._pid, "tid": self._tid(), "args": values})
+
+    def span(self, name, cat="game", args=None):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    # ---------- 輸出 ----------
+    def dump(self, path=None):
+        """寫出 Chrome trace JSON，回傳檔案路徑"""
+        if path is None:
+            os.makedirs(setting.TRACE_DIR, exist_ok=True)
+            path = os.path.join(setting.TRACE_DIR, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{self._pid}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": self.events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped},
+            }, f, ensure_ascii=False)
+        return path
+
+    def _dump_at_exit(self):
+        if self.events:
+            print(f"[Tracer] trace 已寫入 {self.dump()}")
+
+
+def span(name, cat="game", args=None):
+    """追蹤一段程式碼：with span("名稱", "類別"): ..."""
+    return Tracer.get_instance().span(name, cat, args)
+
+
+def traced(cat, name=None):
+    """裝飾器：把每次呼叫記成一個 span（名稱預設為函式名稱）"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = Tracer.get_instance()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.complete(label, cat, start, time.perf_counter())
+        return wrapper
+    return decorator